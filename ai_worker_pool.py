@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Bounded worker pool for machine decisions.
+
+Keeps the AI work (make_decision, which may rewrite q_table.json) off the
+HTTP request thread. Jobs submitted for the same table run strictly in
+submission order; different tables run in parallel up to ``max_workers``.
+
+``max_queue_wait`` bounds only the time a job waits in its table's queue:
+a job that starts in time runs to the end however long it takes. Bound the
+decision itself in the decision code (e.g. POKER_RIVER_SOLVER_MS for the
+river solver).
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when the pool already holds ``max_pending`` jobs."""
+
+
+class DecisionWorkerPool:
+    def __init__(self, max_workers=4, max_pending=256, max_queue_wait=2.0):
+        self.max_pending = max_pending
+        self.max_queue_wait = max_queue_wait  # seconds a job may wait to start before falling back
+        self.expired = 0  # jobs that ran their fallback instead
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="ai-decision")
+        self._lock = threading.Lock()
+        self._queues = {}  # table_id -> deque of pending jobs
+        self._pending = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs submitted and not yet finished"""
+        with self._lock:
+            return self._pending
+
+    def submit(self, table_id, fn, fallback=None) -> Future:
+        """
+        Queue ``fn`` for ``table_id``.
+
+        If the job is still waiting to start after ``max_queue_wait`` seconds,
+        ``fallback`` runs instead of ``fn`` (when given), so a backed-up table
+        answers quickly. A job that already started is never cut short.
+        """
+        future = Future()
+        job = (fn, fallback, time.monotonic() + self.max_queue_wait, future)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PoolSaturatedError(f"{self._pending} AI decisions already pending")
+            self._pending += 1
+            queue = self._queues.get(table_id)
+            idle = queue is None
+            if idle:
+                self._queues[table_id] = deque([job])
+            else:
+                queue.append(job)
+
+        # Only an idle table gets a new runner; a busy one picks the job up
+        # when its current job finishes, which keeps per-table ordering.
+        if idle:
+            self._executor.submit(self._run_next, table_id)
+        return future
+
+    def _run_next(self, table_id):
+        with self._lock:
+            fn, fallback, start_by, future = self._queues[table_id].popleft()
+
+        if future.set_running_or_notify_cancel():
+            try:
+                if fallback is not None and time.monotonic() > start_by:
+                    with self._lock:
+                        self.expired += 1
+                    result = fallback()
+                else:
+                    result = fn()
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+        with self._lock:
+            self._pending -= 1
+            more = bool(self._queues[table_id])
+            if not more:
+                del self._queues[table_id]
+
+        if more:
+            self._executor.submit(self._run_next, table_id)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
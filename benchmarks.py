@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmarks dos caminhos quentes do motor.
+
+Cada benchmark roda ``--warmup`` chamadas de aquecimento, calibra quantas
+chamadas cabem em ``--min-time`` segundos e repete a medição ``--repeat``
+vezes com o coletor de lixo desligado; a mediana por chamada é o número
+comparado. Com --save grava uma baseline em JSON; com --compare termina
+com código 1 se algum benchmark ficar mais de --threshold mais lento que
+a baseline, para uso em testes de regressão.
+
+Os jogadores dos benchmarks não gravam q_table.json (sem I/O no tempo).
+
+Uso:
+    python benchmarks.py                              # roda tudo
+    python benchmarks.py --save bench_baseline.json --pin-cpu 2
+    python benchmarks.py --compare bench_baseline.json --threshold 0.25
+    python benchmarks.py -k update_q_value --repeat 9
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from card import Card
+from deck import Deck
+from game import Game
+from player import Player
+from poker_game import PokerGame
+
+# Mão (2 cartas) e mesa (5 cartas) de cada categoria de get_hand_value
+HAND_CATEGORIES = {
+    'carta_alta': ("A-Hearts 9-Clubs", "2-Spades 5-Diamonds 7-Hearts J-Clubs K-Diamonds"),
+    'par': ("A-Hearts A-Clubs", "2-Spades 5-Diamonds 7-Hearts J-Clubs K-Diamonds"),
+    'dois_pares': ("A-Hearts K-Clubs", "A-Spades K-Diamonds 7-Hearts 2-Clubs 4-Diamonds"),
+    'trinca': ("7-Hearts 7-Clubs", "7-Spades K-Diamonds 2-Hearts J-Clubs 4-Diamonds"),
+    'sequencia': ("8-Hearts 9-Clubs", "10-Spades J-Diamonds Q-Hearts 2-Clubs 4-Diamonds"),
+    'flush': ("2-Hearts 9-Hearts", "J-Hearts K-Hearts 4-Hearts 5-Clubs 7-Diamonds"),
+    'full_house': ("Q-Hearts Q-Clubs", "Q-Spades 4-Diamonds 4-Hearts 9-Clubs 2-Diamonds"),
+    'quadra': ("9-Hearts 9-Clubs", "9-Spades 9-Diamonds 4-Hearts J-Clubs 2-Diamonds"),
+    'straight_flush': ("5-Spades 6-Spades", "7-Spades 8-Spades 9-Spades K-Hearts 2-Clubs"),
+    'royal_flush': ("A-Diamonds K-Diamonds", "Q-Diamonds J-Diamonds 10-Diamonds 3-Hearts 2-Clubs"),
+}
+Q_TABLE_SIZES = (100, 1000, 10000)
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Registra ``setup``, que prepara o estado e devolve a função medida"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def cards(text: str) -> List[Card]:
+    return [Card(*token.split('-')) for token in text.split()]
+
+
+def bench_player(hand: str = "A-Hearts K-Hearts", is_machine: bool = True) -> Player:
+    player = Player("Benchmark", is_machine=is_machine)
+    player.save_q_table = lambda: None
+    player.q_table = {}
+    player.hand = cards(hand)
+    player.position = "late"
+    return player
+
+
+def _register_hand_values():
+    for category, (hand, board) in HAND_CATEGORIES.items():
+        def setup(hand=hand, board=board):
+            player = bench_player(hand)
+            community = cards(board)
+            return lambda: player.get_hand_value(community)
+        benchmark(f"get_hand_value.{category}")(setup)
+
+
+_register_hand_values()
+
+
+@benchmark("evaluate_hand_strength.flop")
+def _hand_strength():
+    player = bench_player()
+    community = cards("Q-Hearts 7-Hearts 2-Clubs")
+    return lambda: player.evaluate_hand_strength(community)
+
+
+@benchmark("get_state.turn")
+def _get_state():
+    player = bench_player()
+    community = cards("Q-Hearts 7-Hearts 2-Clubs 9-Diamonds")
+    return lambda: player.get_state(community, 100)
+
+
+def _register_update_q_value():
+    for size in Q_TABLE_SIZES:
+        def setup(size=size):
+            player = bench_player()
+            player.q_table = {f"flop_dry_late_{i}": {'fold': 0.0, 'call': 0.1, 'raise': 0.2}
+                              for i in range(size)}
+            states = list(player.q_table)
+            rng = random.Random(0)
+            return lambda: player.update_q_value(rng.choice(states), 'call', 0.5, rng.choice(states))
+        benchmark(f"update_q_value.{size}")(setup)
+
+
+_register_update_q_value()
+
+
+@benchmark("calculate_raise_size.flop")
+def _raise_size():
+    player = bench_player()
+    community = cards("Q-Hearts 7-Hearts 2-Clubs")
+    return lambda: player.calculate_raise_size(community, 40, 20, 120)
+
+
+@benchmark("make_decision.flop")
+def _make_decision():
+    player = bench_player()
+    community = cards("Q-Hearts 7-Hearts 2-Clubs")
+
+    def decide():
+        player.folded = False
+        return player.make_decision(community, 40, 20, 120)
+    return decide
+
+
+@benchmark("deck.new")
+def _deck():
+    return Deck
+
+
+@benchmark("heads_up_hand")
+def _heads_up_hand():
+    players = [bench_player(), bench_player()]
+    players[1].name = "Benchmark 2"
+    poker_game = PokerGame(players)
+    game = Game()
+
+    def play_hand():
+        # Como em Game.play_machine_vs_machine: start_hand/end_hand limitam as ações
+        # guardadas e fecham a mão nos modelos dos oponentes
+        for player, opponent, position in zip(players, reversed(players), ("early", "late")):
+            player.start_hand(opponent=opponent.name)
+            player.chips = 1000
+            player.position = position
+        game.pot, game.community_cards = 0, []
+        poker_game.deal_cards()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game._betting_round(players)
+            for count in (3, 1, 1):
+                if any(p.folded for p in players):
+                    break
+                poker_game.deal_community_cards(count)
+                game.community_cards = poker_game.community_cards
+                game._betting_round(players)
+            showdown = not any(p.folded for p in players)
+            game._showdown(players)
+        for player in players:
+            player.end_hand(showdown)
+    return play_hand
+
+
+def measure(fn: Callable[[], object], warmup: int = 50, repeat: int = 7,
+            min_time: float = 0.05) -> Dict[str, float]:
+    """Tempo por chamada (µs): mínimo, mediana, média e desvio das repetições"""
+    for _ in range(warmup):
+        fn()
+
+    number = 1
+    while True:  # calibra como timeit.autorange
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time or number >= 1_000_000:
+            break
+        number *= 2
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min_us': min(samples),
+        'median_us': statistics.median(samples),
+        'mean_us': statistics.mean(samples),
+        'stdev_us': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run_suite(names: Optional[List[str]] = None, warmup: int = 50, repeat: int = 7,
+              min_time: float = 0.05, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in names or list(BENCHMARKS):
+        random.seed(seed)
+        results[name] = measure(BENCHMARKS[name](), warmup, repeat, min_time)
+    return results
+
+
+def pin_cpu(cpu: int) -> bool:
+    """Fixa o processo em um núcleo (só Linux); retorna False se não der"""
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError:
+        return False
+    return True
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Benchmarks cuja mediana passou de baseline * (1 + threshold)"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        ratio = result['median_us'] / before['median_us']
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {before['median_us']:.2f}µs -> "
+                               f"{result['median_us']:.2f}µs (+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_report(results: Dict, baseline: Optional[Dict] = None):
+    print("=" * 78)
+    print("⏱️  BENCHMARKS (µs por chamada)")
+    print("=" * 78)
+    print(f"{'benchmark':<34}{'mediana':>10}{'mínimo':>10}{'desvio':>9}{'baseline':>11}")
+    for name, result in results.items():
+        before = (baseline or {}).get(name)
+        reference = f"{before['median_us']:11.2f}" if before else f"{'-':>11}"
+        print(f"{name:<34}{result['median_us']:10.2f}{result['min_us']:10.2f}"
+              f"{result['stdev_us']:9.2f}{reference}")
+    print("=" * 78)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes do poker")
+    parser.add_argument("-k", dest="filter", help="só benchmarks cujo nome contém este texto")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="segundos por repetição")
+    parser.add_argument("--pin-cpu", type=int, default=None, help="fixa o processo neste núcleo")
+    parser.add_argument("--save", help="grava os resultados como baseline JSON")
+    parser.add_argument("--compare", help="baseline JSON para comparar")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="regressão tolerada (0.2 = 20%% mais lento)")
+    args = parser.parse_args(argv)
+
+    if args.pin_cpu is not None and not pin_cpu(args.pin_cpu):
+        print(f"⚠️  não foi possível fixar o processo no núcleo {args.pin_cpu}")
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    results = run_suite(names, args.warmup, args.repeat, args.min_time)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)['results']
+    print_report(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'pinned_cpu': args.pin_cpu,
+                'results': results,
+            }, f, indent=4)
+
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+    for regression in regressions:
+        print(f"❌ {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
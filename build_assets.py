@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Build dos arquivos estáticos da interface web.
+
+Copia static/js/*.js e static/css/*.css para static/dist com o hash do
+conteúdo no nome (ex.: js/game.3f2a1b9c04.js), gera versões .gz e .br
+(brotli, se o módulo estiver instalado) de cada arquivo e reescreve o
+index.html para apontar para os nomes com hash. O poker_web.py serve
+/assets/* com cache imutável e escolhe a variante comprimida pelo
+Accept-Encoding.
+
+Uso:
+    python build_assets.py
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict
+
+try:
+    import brotli
+except ImportError:  # opcional: sem ele só geramos .gz
+    brotli = None
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+ASSET_PATTERNS = ["js/*.js", "css/*.css"]
+MANIFEST_NAME = "manifest.json"
+
+
+def content_hash(data: bytes, length: int = 10) -> str:
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def write_compressed(path: str, data: bytes):
+    """Grava path, path.gz e (se possível) path.br"""
+    with open(path, "wb") as f:
+        f.write(data)
+    # mtime=0 deixa o .gz reprodutível entre builds
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def build(static_dir: str = STATIC_DIR, dist_dir: str = DIST_DIR) -> Dict[str, str]:
+    """
+    Gera dist_dir e retorna o manifesto {caminho original: caminho com hash},
+    ambos relativos a static_dir / dist_dir.
+    """
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir)
+
+    manifest = {}
+    for pattern in ASSET_PATTERNS:
+        for source in sorted(glob.glob(os.path.join(static_dir, pattern))):
+            rel_path = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                data = f.read()
+            base, ext = os.path.splitext(rel_path)
+            hashed = f"{base}.{content_hash(data)}{ext}"
+            os.makedirs(os.path.dirname(os.path.join(dist_dir, hashed)), exist_ok=True)
+            write_compressed(os.path.join(dist_dir, hashed), data)
+            manifest[rel_path] = hashed
+
+    # index.html não leva hash (é revalidado sempre), só aponta para os assets
+    with open(os.path.join(static_dir, "index.html"), "r", encoding="utf-8") as f:
+        html = f.read()
+    for original, hashed in manifest.items():
+        html = html.replace(f"/static/{original}", f"/assets/{hashed}")
+    write_compressed(os.path.join(dist_dir, "index.html"), html.encode("utf-8"))
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def _size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+if __name__ == "__main__":
+    manifest = build()
+    print(f"✓ {len(manifest)} arquivos em {DIST_DIR}")
+    for original, hashed in manifest.items():
+        path = os.path.join(DIST_DIR, hashed)
+        sizes = f"{_size(path)} B, gzip {_size(path + '.gz')} B"
+        if brotli is not None:
+            sizes += f", br {_size(path + '.br')} B"
+        print(f"   {original} -> {hashed} ({sizes})")
+    if brotli is None:
+        print("ℹ️  Módulo brotli não instalado: apenas .gz foi gerado (pip install brotli)")
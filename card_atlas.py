@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Atlas de sprites das cartas, compartilhado pela GUI Tk e pelo cliente web.
+
+O build renderiza as 52 faces e o verso uma única vez (com o mesmo desenho
+do CardGraphics) em um PNG por escala de DPI, mais um índice JSON com a
+posição de cada carta na grade e uma folha CSS de sprites para o navegador.
+Em tempo de execução o CardGraphics só recorta a carta do atlas.
+
+Uso:
+    python card_atlas.py            # gera static/cards/ e static/css/cards-sprite.css
+"""
+
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+from card import Card
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ATLAS_DIR = os.path.join(BASE_DIR, "static", "cards")
+SPRITE_CSS_PATH = os.path.join(BASE_DIR, "static", "css", "cards-sprite.css")
+ATLAS_URL = "/static/cards"
+INDEX_NAME = "atlas.json"
+SCALES = (1, 1.5, 2)
+
+COLUMNS = len(Card.ranks)
+ROWS = len(Card.suits) + 1  # última linha guarda o verso
+
+
+def scale_label(scale) -> str:
+    return f"{scale:g}"
+
+
+def grid_positions() -> Dict[str, Tuple[int, int]]:
+    """Posição (coluna, linha) de cada carta: linha = naipe, coluna = valor"""
+    positions = {}
+    for row, suit in enumerate(Card.suits):
+        for col, rank in enumerate(Card.ranks):
+            positions[f"{rank}_{suit}"] = (col, row)
+    positions["back"] = (0, len(Card.suits))
+    return positions
+
+
+class CardAtlas:
+    def __init__(self, image, card_width: int, card_height: int, cards: Dict[str, Tuple[int, int]]):
+        self.image = image
+        self.card_width = card_width
+        self.card_height = card_height
+        self.cards = cards
+
+    def crop(self, key: str):
+        """Recorta uma carta ("A_Spades" ou "back") como imagem PIL"""
+        col, row = self.cards[key]
+        left, top = col * self.card_width, row * self.card_height
+        return self.image.crop((left, top, left + self.card_width, top + self.card_height))
+
+
+# Atlas já abertos, compartilhados por todas as instâncias de CardGraphics
+_loaded: Dict[Tuple[str, str], Optional[CardAtlas]] = {}
+
+
+def load_atlas(scale=1.0, atlas_dir: str = ATLAS_DIR) -> Optional[CardAtlas]:
+    """Abre o atlas da escala pedida, ou None se ele ainda não foi gerado"""
+    key = (atlas_dir, scale_label(scale))
+    if key in _loaded:
+        return _loaded[key]
+
+    atlas = None
+    try:
+        with open(os.path.join(atlas_dir, INDEX_NAME), "r") as f:
+            index = json.load(f)
+        entry = index["scales"].get(scale_label(scale))
+        if entry:
+            # PIL só é carregado quando há atlas para abrir
+            from PIL import Image
+            image = Image.open(os.path.join(atlas_dir, entry["image"]))
+            image.load()
+            cards = {name: tuple(pos) for name, pos in index["cards"].items()}
+            atlas = CardAtlas(image.convert("RGB"), entry["card_width"], entry["card_height"], cards)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, OSError):
+        atlas = None
+
+    _loaded[key] = atlas
+    return atlas
+
+
+def sprite_css(index: Dict) -> str:
+    """Folha CSS que mostra cada carta como recorte do atlas"""
+    images = [(label, f"{ATLAS_URL}/{entry['image']}") for label, entry in index["scales"].items()]
+    base_url = dict(images).get("1", images[0][1])
+    image_set = ", ".join(f"url('{url}') {label}x" for label, url in images)
+    first = next(iter(index["scales"].values()))
+
+    lines = [
+        "/* Gerado por card_atlas.py - não editar */",
+        ":root { --card-sprites: 1; }",
+        "",
+        ".card.card-sprite {",
+        f"    background-image: url('{base_url}');",
+        f"    background-image: -webkit-image-set({image_set});",
+        f"    background-image: image-set({image_set});",
+        f"    background-size: {COLUMNS * 100}% {ROWS * 100}%;",
+        "    background-repeat: no-repeat;",
+        f"    aspect-ratio: {first['card_width']} / {first['card_height']};",
+        "}",
+        "",
+    ]
+    for name, (col, row) in index["cards"].items():
+        css_class = "card-sprite-back" if name == "back" else f"card-sprite-{name.replace('_', '-')}"
+        x = col * 100 / (COLUMNS - 1)
+        y = row * 100 / (ROWS - 1)
+        lines.append(f".card-sprite.{css_class} {{ background-position: {x:g}% {y:g}%; }}")
+    return "\n".join(lines) + "\n"
+
+
+def build_atlas(scales=SCALES, atlas_dir: str = ATLAS_DIR, css_path: str = SPRITE_CSS_PATH) -> Dict:
+    """Renderiza todas as cartas em cada escala e grava PNGs, índice e CSS"""
+    from PIL import Image
+    from card_graphics import CardGraphics
+
+    os.makedirs(atlas_dir, exist_ok=True)
+    positions = grid_positions()
+    index = {
+        "columns": COLUMNS,
+        "rows": ROWS,
+        "cards": {name: list(pos) for name, pos in positions.items()},
+        "scales": {},
+    }
+
+    for scale in scales:
+        graphics = CardGraphics(scale=scale, use_atlas=False)
+        width, height = graphics.card_width, graphics.card_height
+        sheet = Image.new("RGB", (COLUMNS * width, ROWS * height), graphics.white)
+        for name, (col, row) in positions.items():
+            if name == "back":
+                image = graphics.render_card_back()
+            else:
+                rank, suit = name.split("_")
+                image = graphics.render_card(rank, suit)
+            sheet.paste(image, (col * width, row * height))
+
+        image_name = f"cards_atlas@{scale_label(scale)}x.png"
+        sheet.save(os.path.join(atlas_dir, image_name), optimize=True)
+        index["scales"][scale_label(scale)] = {
+            "image": image_name,
+            "card_width": width,
+            "card_height": height,
+        }
+
+    with open(os.path.join(atlas_dir, INDEX_NAME), "w") as f:
+        json.dump(index, f, indent=4)
+    if css_path:
+        with open(css_path, "w") as f:
+            f.write(sprite_css(index))
+
+    # Instâncias criadas depois do build devem ver o atlas novo
+    for key in [k for k in _loaded if k[0] == atlas_dir]:
+        del _loaded[key]
+    return index
+
+
+if __name__ == "__main__":
+    index = build_atlas()
+    for label, entry in index["scales"].items():
+        print(f"✓ {entry['image']}: {len(index['cards'])} cartas de "
+              f"{entry['card_width']}x{entry['card_height']} px (escala {label}x)")
+    print(f"✓ Índice em {os.path.join(ATLAS_DIR, INDEX_NAME)}")
+    print(f"✓ Sprites CSS em {SPRITE_CSS_PATH}")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Cache em disco das cartas renderizadas.
+
+Cada carta é gravada como pixels RGBA crus, em um arquivo cujo nome inclui
+um digest de tudo que muda o desenho: tamanho, escala (DPI), cores do tema,
+arquivos das fontes carregadas e a versão do código de desenho. Assim outro processo da
+GUI, ou a próxima sessão, lê os bytes direto e só renderiza com PIL no
+primeiro uso de cada combinação.
+
+O diretório padrão é ~/.cache/poker-o3/cards (ou $XDG_CACHE_HOME); use
+POKER_CARD_CACHE_DIR para trocá-lo e POKER_CARD_CACHE=0 para desligar.
+"""
+
+import hashlib
+import os
+from typing import Iterable, Optional
+
+# Aumente ao mudar o desenho em CardGraphics.render_card/render_card_back
+RENDER_VERSION = 1
+
+
+def default_cache_dir() -> Optional[str]:
+    if os.environ.get("POKER_CARD_CACHE", "1") == "0":
+        return None
+    if os.environ.get("POKER_CARD_CACHE_DIR"):
+        return os.environ["POKER_CARD_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "poker-o3", "cards")
+
+
+def file_fingerprint(paths: Iterable[str]) -> str:
+    """Identifica arquivos de fonte por caminho, tamanho e mtime (sem abri-los)"""
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(path)
+    return "|".join(parts)
+
+
+
+def font_fingerprint(fonts: Iterable) -> str:
+    """Identifica as fontes que o PIL carregou de fato (``FreeTypeFont.path``);
+    a fonte embutida do PIL não tem arquivo e entra pelo nome da classe"""
+    parts = []
+    for font in fonts:
+        path = getattr(font, "path", None)
+        if isinstance(path, (str, bytes, os.PathLike)):
+            parts.append(file_fingerprint([os.fsdecode(path)]))
+        else:
+            parts.append(type(font).__name__)
+    return "|".join(parts)
+
+class CardImageCache:
+    def __init__(self, cache_dir: str, width: int, height: int, scale, theme: str, fonts: str):
+        self.cache_dir = cache_dir
+        self.width = width
+        self.height = height
+        variant = f"{RENDER_VERSION}|{width}x{height}|{scale:g}|{theme}|{fonts}"
+        self.variant = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:16]
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}-{self.variant}.rgba")
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Bytes RGBA da carta, ou None se ainda não estiver no cache"""
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            data = None
+        if data is None or len(data) != self.width * self.height * 4:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def store(self, key: str, data: bytes):
+        """Grava os bytes RGBA; falhas de disco só deixam de cachear"""
+        path = self._path(key)
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -1,17 +1,27 @@
 import tkinter as tk
 from PIL import Image, ImageDraw, ImageTk, ImageFont
 import os
+from card_atlas import load_atlas
+from card_cache import CardImageCache, default_cache_dir, font_fingerprint
+
+DEJAVU_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
 
 class CardGraphics:
-    def __init__(self):
+    def __init__(self, scale=1.0, use_atlas=True, use_disk_cache=True):
+        # scale > 1 renderiza em mais pixels para telas de alta densidade (DPI)
+        self.scale = scale
         # Tamanho maior para melhor visibilidade
-        self.card_width = 140  # Era 80, agora 140 (75% maior)
-        self.card_height = 196  # Era 112, agora 196 (75% maior)
-        self.corner_radius = 12
-        self.margin = 12
+        self.card_width = self._px(140)  # Era 80, agora 140 (75% maior)
+        self.card_height = self._px(196)  # Era 112, agora 196 (75% maior)
+        self.corner_radius = self._px(12)
+        self.margin = self._px(12)
         self.cards = {}
         self._card_back = None  # Lazy load card back
 
+        # Atlas pré-renderizado (card_atlas.py), compartilhado entre instâncias
+        self.atlas = load_atlas(scale) if use_atlas else None
+
         # Colors - cores mais vibrantes
         self.red = '#DC143C'  # Crimson vermelho mais forte
         self.black = '#000000'
@@ -26,31 +36,42 @@ class CardGraphics:
             'Spades': '♠'
         }
 
-        # Tentar carregar fontes melhores
+        # Tentar carregar fontes melhores (só quando alguma carta for desenhada)
         self.rank_font_large = None
         self.rank_font_small = None
         self.suit_font_large = None
         self.suit_font_small = None
+        self._fonts_loaded = False
 
-        self._load_fonts()
+        # Cache em disco dos pixels já renderizados (por tamanho/DPI/tema/fonte).
+        # Criado no primeiro uso, quando já se sabe quais fontes carregaram
+        self._cache_dir = default_cache_dir() if use_disk_cache else None
+        self.disk_cache = None
 
         # Don't pre-generate all cards - create on demand to save memory
 
+    def _px(self, value):
+        """Converte uma medida em pixels da escala 1x para a escala atual"""
+        return int(round(value * self.scale))
+
     def _load_fonts(self):
         """Carregar fontes com fallback para fonte padrão"""
+        if self._fonts_loaded:
+            return
+        self._fonts_loaded = True
         try:
             # Tentar fontes do sistema
-            self.rank_font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 36)
-            self.rank_font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 28)
-            self.suit_font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 60)
-            self.suit_font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 32)
+            self.rank_font_large = ImageFont.truetype(DEJAVU_BOLD, self._px(36))
+            self.rank_font_small = ImageFont.truetype(DEJAVU_BOLD, self._px(28))
+            self.suit_font_large = ImageFont.truetype(DEJAVU, self._px(60))
+            self.suit_font_small = ImageFont.truetype(DEJAVU, self._px(32))
         except:
             try:
                 # Fallback para Arial (Windows/WSL)
-                self.rank_font_large = ImageFont.truetype("arial.ttf", 36)
-                self.rank_font_small = ImageFont.truetype("arial.ttf", 28)
-                self.suit_font_large = ImageFont.truetype("arial.ttf", 60)
-                self.suit_font_small = ImageFont.truetype("arial.ttf", 32)
+                self.rank_font_large = ImageFont.truetype("arial.ttf", self._px(36))
+                self.rank_font_small = ImageFont.truetype("arial.ttf", self._px(28))
+                self.suit_font_large = ImageFont.truetype("arial.ttf", self._px(60))
+                self.suit_font_small = ImageFont.truetype("arial.ttf", self._px(32))
             except:
                 # Usar fonte padrão se nenhuma estiver disponível
                 self.rank_font_large = ImageFont.load_default()
@@ -59,6 +80,35 @@ class CardGraphics:
                 self.suit_font_small = ImageFont.load_default()
 
     def create_card_image(self, rank, suit):
+        """Renderiza a carta e converte para PhotoImage"""
+        return ImageTk.PhotoImage(self._cached_render(f"{rank}_{suit}", lambda: self.render_card(rank, suit)))
+
+    def _open_disk_cache(self):
+        """Cria o cache em disco com a impressão digital das fontes realmente carregadas"""
+        if self._cache_dir and self.disk_cache is None:
+            self._load_fonts()
+            theme = "|".join([self.red, self.black, self.white, self.card_bg])
+            fonts = font_fingerprint([self.rank_font_large, self.rank_font_small,
+                                      self.suit_font_large, self.suit_font_small])
+            self.disk_cache = CardImageCache(self._cache_dir, self.card_width, self.card_height,
+                                             self.scale, theme, fonts)
+        return self.disk_cache
+
+    def _cached_render(self, key, render):
+        """Lê os pixels do cache em disco; só renderiza (e grava) em caso de falta"""
+        self._open_disk_cache()
+        if self.disk_cache is not None:
+            data = self.disk_cache.load(key)
+            if data is not None:
+                return Image.frombytes('RGBA', (self.card_width, self.card_height), data)
+        image = render().convert('RGBA')
+        if self.disk_cache is not None:
+            self.disk_cache.store(key, image.tobytes())
+        return image
+
+    def render_card(self, rank, suit):
+        """Desenha a face da carta como imagem PIL (sem depender do Tk)"""
+        self._load_fonts()
         # Criar carta com alta resolução e contraste
         image = Image.new('RGB', (self.card_width, self.card_height), self.card_bg)
         draw = ImageDraw.Draw(image)
@@ -84,7 +134,7 @@ class CardGraphics:
             [0, 0, self.card_width-1, self.card_height-1],
             radius=self.corner_radius,
             outline=self.black,
-            width=3
+            width=self._px(3)
         )
 
         # Determinar cor baseado no naipe
@@ -98,7 +148,7 @@ class CardGraphics:
             font=self.rank_font_small
         )
         draw.text(
-            (self.margin, self.margin + 35),
+            (self.margin, self.margin + self._px(35)),
             self.suit_symbols[suit],
             fill=color,
             font=self.suit_font_small
@@ -130,98 +180,109 @@ class CardGraphics:
         suit_width = bbox_suit[2] - bbox_suit[0]
 
         # Criar imagem temporária para o canto invertido
-        corner_img = Image.new('RGBA', (50, 80), (0, 0, 0, 0))
+        corner_w, corner_h = self._px(50), self._px(80)
+        corner_img = Image.new('RGBA', (corner_w, corner_h), (0, 0, 0, 0))
         corner_draw = ImageDraw.Draw(corner_img)
-        corner_draw.text((5, 5), rank, fill=color, font=self.rank_font_small)
-        corner_draw.text((5, 40), self.suit_symbols[suit], fill=color, font=self.suit_font_small)
+        corner_draw.text((self._px(5), self._px(5)), rank, fill=color, font=self.rank_font_small)
+        corner_draw.text((self._px(5), self._px(40)), self.suit_symbols[suit], fill=color, font=self.suit_font_small)
 
         # Rotacionar 180 graus
         corner_img = corner_img.rotate(180)
 
         # Colar no canto inferior direito
-        image.paste(corner_img, (self.card_width - 50, self.card_height - 80), corner_img)
+        image.paste(corner_img, (self.card_width - corner_w, self.card_height - corner_h), corner_img)
 
-        # Convert to PhotoImage for tkinter
-        photo = ImageTk.PhotoImage(image)
-        return photo
+        return image
     
     def get_card_image(self, rank, suit):
         """Lazy load cards - only create when needed"""
         key = f"{rank}_{suit}"
         if key not in self.cards:
-            self.cards[key] = self.create_card_image(rank, suit)
+            if self.atlas is not None and key in self.atlas.cards:
+                # Recorta do atlas em vez de desenhar com PIL
+                self.cards[key] = ImageTk.PhotoImage(self.atlas.crop(key))
+            else:
+                self.cards[key] = self.create_card_image(rank, suit)
         return self.cards[key]
     
     def get_card_back(self):
         """Lazy load card back - only create once when needed"""
         if self._card_back is None:
-            # Criar verso da carta com padrão elegante
-            base_color = '#1E3A8A'  # Azul escuro
-            pattern_color = '#3B82F6'  # Azul médio
-            border_color = '#FBBF24'  # Dourado
-
-            image = Image.new('RGB', (self.card_width, self.card_height), base_color)
-            draw = ImageDraw.Draw(image)
-
-            # Criar máscara para cantos arredondados
-            mask = Image.new('L', (self.card_width, self.card_height), 0)
-            mask_draw = ImageDraw.Draw(mask)
-            mask_draw.rounded_rectangle(
-                [0, 0, self.card_width, self.card_height],
-                radius=self.corner_radius,
-                fill=255
-            )
+            if self.atlas is not None and "back" in self.atlas.cards:
+                self._card_back = ImageTk.PhotoImage(self.atlas.crop("back"))
+            else:
+                self._card_back = ImageTk.PhotoImage(self._cached_render("back", self.render_card_back))
 
-            # Aplicar máscara
-            rounded_back = Image.new('RGB', (self.card_width, self.card_height), base_color)
-            rounded_back.paste(image, (0, 0), mask)
-            image = rounded_back
-            draw = ImageDraw.Draw(image)
+        return self._card_back
 
-            # Borda dourada grossa
-            draw.rounded_rectangle(
-                [0, 0, self.card_width-1, self.card_height-1],
-                radius=self.corner_radius,
-                outline=border_color,
-                width=4
-            )
+    def render_card_back(self):
+        """Desenha o verso da carta como imagem PIL"""
+        self._load_fonts()
+        # Criar verso da carta com padrão elegante
+        base_color = '#1E3A8A'  # Azul escuro
+        pattern_color = '#3B82F6'  # Azul médio
+        border_color = '#FBBF24'  # Dourado
 
-            # Padrão de linhas diagonais mais denso
-            for i in range(0, self.card_width + self.card_height, 12):
-                draw.line([(i, 0), (0, i)], fill=pattern_color, width=2)
-                draw.line([(self.card_width, i), (i, self.card_height)], fill=pattern_color, width=2)
-
-            # Adicionar um retângulo interno decorativo
-            margin_inner = 15
-            draw.rounded_rectangle(
-                [margin_inner, margin_inner,
-                 self.card_width - margin_inner, self.card_height - margin_inner],
-                radius=8,
-                outline=border_color,
-                width=2
-            )
+        image = Image.new('RGB', (self.card_width, self.card_height), base_color)
+        draw = ImageDraw.Draw(image)
 
-            # Desenhar símbolo de cartas no centro (opcional)
-            center_x = self.card_width // 2
-            center_y = self.card_height // 2
+        # Criar máscara para cantos arredondados
+        mask = Image.new('L', (self.card_width, self.card_height), 0)
+        mask_draw = ImageDraw.Draw(mask)
+        mask_draw.rounded_rectangle(
+            [0, 0, self.card_width, self.card_height],
+            radius=self.corner_radius,
+            fill=255
+        )
 
-            # Desenhar símbolo de naipe no centro
-            try:
-                draw.text(
-                    (center_x - 15, center_y - 20),
-                    "🃏",
-                    fill='#FBBF24',
-                    font=self.suit_font_large
-                )
-            except:
-                # Se a fonte não suportar emoji, desenhar um padrão simples
-                draw.ellipse(
-                    [center_x - 20, center_y - 20, center_x + 20, center_y + 20],
-                    fill=pattern_color,
-                    outline=border_color,
-                    width=2
-                )
+        # Aplicar máscara
+        rounded_back = Image.new('RGB', (self.card_width, self.card_height), base_color)
+        rounded_back.paste(image, (0, 0), mask)
+        image = rounded_back
+        draw = ImageDraw.Draw(image)
 
-            self._card_back = ImageTk.PhotoImage(image)
+        # Borda dourada grossa
+        draw.rounded_rectangle(
+            [0, 0, self.card_width-1, self.card_height-1],
+            radius=self.corner_radius,
+            outline=border_color,
+            width=self._px(4)
+        )
 
-        return self._card_back
+        # Padrão de linhas diagonais mais denso
+        for i in range(0, self.card_width + self.card_height, self._px(12)):
+            draw.line([(i, 0), (0, i)], fill=pattern_color, width=self._px(2))
+            draw.line([(self.card_width, i), (i, self.card_height)], fill=pattern_color, width=self._px(2))
+
+        # Adicionar um retângulo interno decorativo
+        margin_inner = self._px(15)
+        draw.rounded_rectangle(
+            [margin_inner, margin_inner,
+             self.card_width - margin_inner, self.card_height - margin_inner],
+            radius=self._px(8),
+            outline=border_color,
+            width=self._px(2)
+        )
+
+        # Desenhar símbolo de cartas no centro (opcional)
+        center_x = self.card_width // 2
+        center_y = self.card_height // 2
+
+        # Desenhar símbolo de naipe no centro
+        try:
+            draw.text(
+                (center_x - self._px(15), center_y - self._px(20)),
+                "🃏",
+                fill='#FBBF24',
+                font=self.suit_font_large
+            )
+        except:
+            # Se a fonte não suportar emoji, desenhar um padrão simples
+            draw.ellipse(
+                [center_x - self._px(20), center_y - self._px(20), center_x + self._px(20), center_y + self._px(20)],
+                fill=pattern_color,
+                outline=border_color,
+                width=self._px(2)
+            )
+
+        return image
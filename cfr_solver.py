@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Heads-up no-limit solver: Monte Carlo CFR over an abstracted game.
+
+The machine's Q-learner plus make_decision's hand-written rules has no
+notion of balance. This module solves a small abstraction of heads-up
+no-limit hold'em with external-sampling MCCFR and regret matching+
+(CFR+ style regret flooring and linear averaging), then exports a policy
+the machine plays from.
+
+Abstraction:
+    cards    equity vs a random hand, split into ``EquityBuckets.buckets``
+             equal bins per street, or the equity-distribution clusters
+             of hand_buckets.py (imperfect recall: only the current
+             street's bucket is part of the information set)
+    betting  fold, call/check, a small and a large pot-fraction raise and
+             all-in, at most ``MAX_RAISES`` raises per street (the same cap
+             make_decision puts on consecutive raises)
+
+Raise sizes come from ``Player.calculate_raise_size``: the small size is
+the middle of its weak/medium tiers (25-50% of the pot), the large one the
+middle of its strong/premium tiers (50-100%), each times that street's
+phase multiplier, and a raise is ``to_call + max(min_raise, pot * size)``.
+Player 0 ("early") posts the small blind and acts first on every street,
+as in ``Game.play_machine_vs_machine``.
+
+Regrets and strategy sums are NumPy arrays indexed by (tree node, bucket,
+action). Iterations run in batches on a process pool: every worker starts
+from the current regrets and returns its deltas, which are summed.
+
+The exported ``SolverPolicy`` aggregates the average strategy by (street,
+position, size of the bet faced, bucket), which is what a player can see
+at decision time, and has the same ``decide`` contract as
+``policy_table.CompiledPolicy``: pass it to Player as ``compiled_policy``
+or set POKER_CFR_POLICY for the web server.
+
+Uso:
+    python cfr_solver.py --iterations 20000 --workers 4 --out cfr_policy.npz
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from card import Card
+from player import Player
+
+ACTIONS = ('fold', 'call', 'raise_small', 'raise_large', 'allin')
+FOLD, CALL, RAISE_SMALL, RAISE_LARGE, ALLIN = range(len(ACTIONS))
+NUM_ACTIONS = len(ACTIONS)
+VERSION = 1
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+BOARD_SIZES = (0, 3, 4, 5)
+POSITIONS = ('early', 'late')
+MAX_RAISES = 2
+
+# calculate_raise_size: pot-fraction tiers by hand strength, times a phase
+# multiplier (the river's 0.8 bluff / 1.2 value sizes average to 1.0)
+WEAK_TIERS = (0.25, 0.5)
+STRONG_TIERS = (0.5, 1.0)
+PHASE_MULTIPLIERS = (1.3, 1.0, 1.1, 1.0)
+RAISE_SIZES = tuple((sum(WEAK_TIERS) / 2 * m, sum(STRONG_TIERS) / 2 * m) for m in PHASE_MULTIPLIERS)
+
+# Bet faced / pot: no bet, up to half pot, up to pot, overbet
+FACING_EDGES = (0.0, 0.5, 1.0)
+
+DECK = [Card(rank, suit) for suit in Card.suits for rank in Card.ranks]
+CARD_INDEX = {(card.rank, card.suit): i for i, card in enumerate(DECK)}
+
+
+def raise_amount(street: int, size: int, pot: int, to_call: int, min_raise: int) -> int:
+    """Chips put in by a raise: the call plus a pot-fraction increment"""
+    return to_call + max(min_raise, int((pot + to_call) * RAISE_SIZES[street][size]))
+
+
+def facing_class(to_call: int, pot: int) -> int:
+    ratio = to_call / pot if pot > 0 else (1.0 if to_call else 0.0)
+    return sum(1 for edge in FACING_EDGES if ratio > edge)
+
+
+def hand_value(hole: Sequence[Card], board: Sequence[Card]) -> Tuple[int, ...]:
+    # get_hand_value só lê ``self.hand``
+    return Player.get_hand_value(SimpleNamespace(hand=list(hole)), list(board))[1]
+
+
+class EquityBuckets:
+    """
+    Card abstraction: Monte Carlo equity against a random hand, cut into
+    ``buckets`` equal bins. Pre-flop equities are computed once per starting
+    hand class with a fixed seed, so every process agrees on them.
+    """
+
+    def __init__(self, buckets: int = 8, samples: int = 64):
+        self.buckets = buckets
+        self.samples = samples
+        self._preflop: Dict[Tuple[int, int, bool], float] = {}
+
+    @property
+    def size(self) -> int:
+        return self.buckets
+
+    def params(self) -> Dict:
+        return {'kind': 'equity', 'buckets': self.buckets, 'samples': self.samples}
+
+    def equity(self, hole: Sequence[Card], board: Sequence[Card], rng=random) -> float:
+        if not board:
+            high, low = sorted((hole[0].value, hole[1].value), reverse=True)
+            key = (high, low, hole[0].suit == hole[1].suit)
+            if key not in self._preflop:
+                self._preflop[key] = self._rollout(hole, board, self.samples * 4, random.Random(str(key)))
+            return self._preflop[key]
+        return self._rollout(hole, board, self.samples, rng)
+
+    def _rollout(self, hole, board, samples: int, rng) -> float:
+        used = {CARD_INDEX[(c.rank, c.suit)] for c in list(hole) + list(board)}
+        remaining = [card for i, card in enumerate(DECK) if i not in used]
+        missing = 5 - len(board)
+        mine = hand_value(hole, board) if not missing else None
+        score = 0.0
+        for _ in range(samples):
+            draw = rng.sample(remaining, 2 + missing)
+            full_board = list(board) + draw[2:]
+            own = mine if mine is not None else hand_value(hole, full_board)
+            other = hand_value(draw[:2], full_board)
+            score += 1.0 if own > other else (0.5 if own == other else 0.0)
+        return score / samples
+
+    def bucket(self, hole: Sequence[Card], board: Sequence[Card], rng=random) -> int:
+        return min(int(self.equity(hole, board, rng) * self.buckets), self.buckets - 1)
+
+
+def load_bucketer(params: Dict):
+    """Bucketer saved by ``params()``: equity bins or hand_buckets.py tables"""
+    if params.get('kind') == 'kmeans':
+        from hand_buckets import HandBuckets
+        return HandBuckets(params['path'])
+    return EquityBuckets(params['buckets'], params['samples'])
+
+
+class GameConfig(NamedTuple):
+    stack: int = 1000
+    small_blind: int = 10
+    big_blind: int = 20  # também o raise mínimo, como nas mesas do jogo
+
+
+class GameTree:
+    """
+    Public betting tree of the abstract game.
+
+    Children are node ids (>= 0) or ``-1 - t`` for terminal ``t``;
+    terminals are (folder or -1 for showdown, chips of player 0, chips of
+    player 1).
+    """
+
+    def __init__(self, config: GameConfig = GameConfig(), street: int = 0,
+                 contrib: Optional[List[int]] = None, actor: int = 0, raises: int = 0, acted: int = 0):
+        """Full game by default; a later root (river_solver.py) passes its street and chips in"""
+        self.config = config
+        self.street: List[int] = []
+        self.player: List[int] = []
+        self.pot: List[int] = []
+        self.to_call: List[int] = []
+        self.children: List[List[int]] = []
+        self.legal: List[Tuple[int, ...]] = []
+        self.terminals: List[Tuple[int, int, int]] = []
+        self._build(street, list(contrib or [config.small_blind, config.big_blind]), actor, raises, acted)
+        self.mask = np.zeros((len(self.street), NUM_ACTIONS), dtype=bool)
+        for node, actions in enumerate(self.legal):
+            self.mask[node, list(actions)] = True
+
+    def __len__(self) -> int:
+        return len(self.street)
+
+    def _terminal(self, folder: int, contrib) -> int:
+        self.terminals.append((folder, contrib[0], contrib[1]))
+        return -len(self.terminals)
+
+    def _build(self, street: int, contrib: List[int], actor: int, raises: int, acted: int) -> int:
+        stack, min_raise = self.config.stack, self.config.big_blind
+        node = len(self.street)
+        to_call = contrib[1 - actor] - contrib[actor]
+        pot = contrib[0] + contrib[1]
+        self.street.append(street)
+        self.player.append(actor)
+        self.pot.append(pot)
+        self.to_call.append(to_call)
+        self.children.append([0] * NUM_ACTIONS)
+        self.legal.append(())
+
+        remaining = stack - contrib[actor]
+        can_raise = raises < MAX_RAISES and remaining > to_call and stack - contrib[1 - actor] > 0
+        amounts = {}
+        if to_call > 0:
+            amounts[FOLD] = None
+        amounts[CALL] = min(to_call, remaining)
+        if can_raise:
+            for action, size in ((RAISE_SMALL, 0), (RAISE_LARGE, 1)):
+                amount = raise_amount(street, size, pot, to_call, min_raise)
+                if amount < remaining and amount not in amounts.values():
+                    amounts[action] = amount
+            amounts[ALLIN] = remaining
+
+        for action, amount in amounts.items():
+            if action == FOLD:
+                child = self._terminal(actor, contrib)
+            else:
+                after = list(contrib)
+                after[actor] += amount
+                if action == CALL and acted > 0:
+                    all_in = stack in after
+                    if street == len(STREETS) - 1 or all_in:
+                        child = self._terminal(-1, after)
+                    else:
+                        child = self._build(street + 1, after, 0, 0, 0)
+                else:
+                    child = self._build(street, after, 1 - actor, raises + (action != CALL), acted + 1)
+            self.children[node][action] = child
+        self.legal[node] = tuple(amounts)
+        return node
+
+
+def regret_matching(regrets: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    positive = np.where(mask, np.maximum(regrets, 0.0), 0.0)
+    total = positive.sum()
+    if total > 0:
+        return positive / total
+    return mask / mask.sum()
+
+
+class _Traversal:
+    """One worker's state for a batch of external-sampling iterations"""
+
+    def __init__(self, tree: GameTree, bucketer, regrets: np.ndarray, plus: bool, rng):
+        self.tree = tree
+        self.bucketer = bucketer
+        self.regrets = regrets
+        self.strategy = np.zeros_like(regrets)
+        self.plus = plus
+        self.rng = rng
+
+    def deal(self):
+        cards = self.rng.sample(DECK, 9)
+        holes, board = (cards[0:2], cards[2:4]), cards[4:]
+        buckets = [[self.bucketer.bucket(hole, board[:n], self.rng) for n in BOARD_SIZES]
+                   for hole in holes]
+        values = [hand_value(hole, board) for hole in holes]
+        winner = 0 if values[0] > values[1] else (1 if values[1] > values[0] else -1)
+        return buckets, winner
+
+    def payoff(self, terminal: int, traverser: int, winner: int) -> float:
+        folder, chips0, chips1 = self.tree.terminals[terminal]
+        chips = (chips0, chips1)
+        loser = folder if folder >= 0 else (1 - winner if winner >= 0 else -1)
+        if loser < 0:
+            return 0.0
+        return -chips[traverser] if loser == traverser else chips[1 - traverser]
+
+    def traverse(self, node: int, traverser: int, buckets, winner: int) -> float:
+        if node < 0:
+            return self.payoff(-1 - node, traverser, winner)
+        tree = self.tree
+        actor = tree.player[node]
+        bucket = buckets[actor][tree.street[node]]
+        regrets = self.regrets[node, bucket]
+        sigma = regret_matching(regrets, tree.mask[node])
+        children = tree.children[node]
+
+        if actor != traverser:
+            self.strategy[node, bucket] += sigma
+            draw = self.rng.random()
+            cumulative = 0.0
+            for action in tree.legal[node]:
+                cumulative += sigma[action]
+                if draw < cumulative:
+                    break
+            return self.traverse(children[action], traverser, buckets, winner)
+
+        utilities = np.zeros(NUM_ACTIONS)
+        for action in tree.legal[node]:
+            utilities[action] = self.traverse(children[action], traverser, buckets, winner)
+        value = float(sigma @ utilities)
+        regrets += np.where(tree.mask[node], utilities - value, 0.0)
+        if self.plus:
+            np.maximum(regrets, 0.0, out=regrets)
+        return value
+
+    def run(self, iterations: int):
+        for _ in range(iterations):
+            buckets, winner = self.deal()
+            for traverser in (0, 1):
+                self.traverse(0, traverser, buckets, winner)
+
+
+_worker: Dict = {}
+
+
+def _init_worker(config: GameConfig, bucketer):
+    _worker['tree'] = GameTree(config)
+    _worker['bucketer'] = bucketer
+
+
+def _run_batch(regrets: np.ndarray, iterations: int, seed: int, plus: bool):
+    traversal = _Traversal(_worker['tree'], _worker['bucketer'], regrets.copy(), plus,
+                           random.Random(seed))
+    traversal.run(iterations)
+    return traversal.regrets - regrets, traversal.strategy
+
+
+def sample_action(cumulative: np.ndarray, rng) -> int:
+    action = int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side='right'))
+    return min(action, NUM_ACTIONS - 1)
+
+
+def play_action(player, action: int, street: int, current_bet: int, min_raise: int,
+                pot: int) -> Tuple[str, int]:
+    """Abstract action -> make_decision's (action, chips), marking the player like it does"""
+    if action == FOLD and current_bet == 0:
+        action = CALL  # sem aposta, desistir é só passar
+    if action == FOLD:
+        player.last_action = 'fold'
+        player.folded = True
+        return "fold", 0
+    if action == CALL:
+        player.last_action = 'call'
+        return "call", min(current_bet, player.chips)
+
+    player.last_action = 'raise'
+    if action == ALLIN:
+        return "raise", player.chips
+    amount = raise_amount(street, action - RAISE_SMALL, pot, current_bet, min_raise)
+    return "raise", min(amount, player.chips)
+
+
+class CFRSolver:
+    def __init__(self, config: GameConfig = GameConfig(), bucketer=None, plus: bool = True):
+        self.config = config
+        self.bucketer = bucketer or EquityBuckets()
+        self.plus = plus
+        self.tree = GameTree(config)
+        shape = (len(self.tree), self.bucketer.size, NUM_ACTIONS)
+        self.regrets = np.zeros(shape)
+        self.strategy_sum = np.zeros(shape)
+        self.iterations = 0
+        self.batches = 0
+
+    def _merge(self, results):
+        self.batches += 1
+        for regret_delta, strategy in results:
+            self.regrets += regret_delta
+            # CFR+: média ponderada pela ordem do lote
+            self.strategy_sum += self.batches * strategy
+        if self.plus:
+            np.maximum(self.regrets, 0.0, out=self.regrets)
+
+    def train(self, iterations: int, workers: int = 1, batch: int = 200,
+              seed: Optional[int] = None, log=None) -> 'CFRSolver':
+        """Run ``iterations`` deals; each process handles ``batch`` per round"""
+        seeds = random.Random(seed)
+        start = time.perf_counter()
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                           initargs=(self.config, self.bucketer))
+        else:
+            _worker.update(tree=self.tree, bucketer=self.bucketer)
+        try:
+            done = 0
+            while done < iterations:
+                sizes = []
+                for _ in range(max(1, workers)):
+                    size = min(batch, iterations - done - sum(sizes))
+                    if size > 0:
+                        sizes.append(size)
+                jobs = [(self.regrets, size, seeds.getrandbits(32), self.plus) for size in sizes]
+                if executor:
+                    results = list(executor.map(_run_batch, *zip(*jobs)))
+                else:
+                    results = [_run_batch(*job) for job in jobs]
+                self._merge(results)
+                done += sum(sizes)
+                self.iterations += sum(sizes)
+                if log:
+                    log(f"   {self.iterations} iterações ({time.perf_counter() - start:.1f}s)")
+        finally:
+            if executor:
+                executor.shutdown()
+        return self
+
+    def average_strategy(self) -> np.ndarray:
+        totals = self.strategy_sum.sum(axis=2, keepdims=True)
+        uniform = self.tree.mask / self.tree.mask.sum(axis=1, keepdims=True)
+        uniform = np.broadcast_to(uniform[:, None, :], self.strategy_sum.shape)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(totals > 0, self.strategy_sum / totals, uniform)
+
+    def policy(self, rng=None) -> 'SolverPolicy':
+        """Average strategy summed by (street, position, bet faced, bucket)"""
+        shape = (len(STREETS), len(POSITIONS), len(FACING_EDGES) + 1, self.bucketer.size, NUM_ACTIONS)
+        sums = np.zeros(shape)
+        for node in range(len(self.tree)):
+            cell = (self.tree.street[node], self.tree.player[node],
+                    facing_class(self.tree.to_call[node], self.tree.pot[node]))
+            sums[cell] += self.strategy_sum[node]
+        totals = sums.sum(axis=-1, keepdims=True)
+        default = np.zeros(NUM_ACTIONS)
+        default[CALL] = 1.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            probs = np.where(totals > 0, sums / totals, default).astype(np.float32)
+        return SolverPolicy(probs, self.bucketer, self.config, rng)
+
+
+class SolverPolicy:
+    """
+    Solved strategy for the machine. ``decide`` has the contract of
+    Player.make_decision; raises return the total chips to put in, the way
+    calculate_raise_size sizes them.
+    """
+
+    def __init__(self, probs: np.ndarray, bucketer=None, config: GameConfig = GameConfig(), rng=None):
+        self.bucketer = bucketer or EquityBuckets()
+        expected = (len(STREETS), len(POSITIONS), len(FACING_EDGES) + 1, self.bucketer.size, NUM_ACTIONS)
+        if probs.shape != expected:
+            raise ValueError(f"política com formato {probs.shape}, esperado {expected}")
+        self.probs = probs
+        self.config = config
+        self._cumulative = np.cumsum(probs, axis=-1)
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def load(cls, path: str, rng=None) -> 'SolverPolicy':
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != VERSION or tuple(meta.get('actions', ())) != ACTIONS:
+                raise ValueError(f"{path} foi gerado com outra abstração")
+            return cls(data['probs'], load_bucketer(meta['bucketer']), GameConfig(**meta['config']), rng)
+
+    def save(self, path: str):
+        meta = json.dumps({'version': VERSION, 'actions': ACTIONS, 'bucketer': self.bucketer.params(),
+                           'config': self.config._asdict()})
+        np.savez_compressed(path, probs=self.probs, meta=np.array(meta))
+
+    def _locate(self, player, community_cards, current_bet: int, pot_size: int) -> Tuple:
+        street = BOARD_SIZES.index(len(community_cards)) if len(community_cards) in BOARD_SIZES else 3
+        position = 1 if player.position == 'late' else 0
+        pot = pot_size or current_bet * 2
+        bucket = self.bucketer.bucket(player.hand, community_cards, self.rng)
+        return street, position, facing_class(current_bet, pot), bucket
+
+    def action_probabilities(self, player, community_cards, current_bet: int,
+                             pot_size: int = 0) -> Dict[str, float]:
+        row = self.probs[self._locate(player, community_cards, current_bet, pot_size)]
+        return {action: float(row[i]) for i, action in enumerate(ACTIONS)}
+
+    def decide(self, player, community_cards, current_bet: int, min_raise: int,
+               pot_size: int = 0) -> Tuple[str, int]:
+        cell = self._locate(player, community_cards, current_bet, pot_size)
+        action = sample_action(self._cumulative[cell], self.rng)
+        return play_action(player, action, cell[0], current_bet, min_raise, pot_size or current_bet * 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve o heads-up abstrato com MCCFR")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=200, help="iterações por processo a cada rodada")
+    parser.add_argument("--buckets", type=int, default=8, help="buckets de equity por street")
+    parser.add_argument("--samples", type=int, default=64, help="amostras por cálculo de equity")
+    parser.add_argument("--buckets-file", help="tabelas de hand_buckets.py no lugar dos buckets de equity")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", default="cfr_policy.npz")
+    args = parser.parse_args(argv)
+
+    if args.buckets_file:
+        bucketer = load_bucketer({'kind': 'kmeans', 'path': args.buckets_file})
+    else:
+        bucketer = EquityBuckets(args.buckets, args.samples)
+    solver = CFRSolver(bucketer=bucketer)
+    print(f"🎲 Árvore de apostas: {len(solver.tree)} nós de decisão, "
+          f"{len(solver.tree.terminals)} terminais; {bucketer.size} buckets por street")
+    solver.train(args.iterations, args.workers, args.batch, args.seed, log=print)
+    solver.policy().save(args.out)
+    print(f"✓ Política salva em {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import argparse
+import sys
 from deck import Deck
 from player import Player
 from poker_game import PokerGame
@@ -12,16 +14,41 @@ class Game:
         self.pot = 0
         self.current_bet = 0
         self.min_raise = 20
+        self.recorders = {}  # nome do jogador -> replay_buffer.HandRecorder
         
-    def play_machine_vs_machine(self, num_games: int):
+    def play_machine_vs_machine(self, num_games: int, replay: bool = False, batch_size: int = 1024,
+                                memory_every: int = 0):
         self.player1 = Player("Máquina 1", is_machine=True)
         self.player2 = Player("Máquina 2", is_machine=True)
+        players = [self.player1, self.player2]
+
+        # Relatório de memória do aprendizado a cada ``memory_every`` mãos
+        memory_monitor = None
+        if memory_every:
+            from memory_report import MemoryMonitor
+            memory_monitor = MemoryMonitor.from_env()
+
+        # Com replay, as mãos só enchem o buffer de experiência; o aprendizado
+        # roda em lote (replay_buffer.BatchQLearner) ao fim de cada mão
+        learners = {}
+        if replay:
+            from replay_buffer import BatchQLearner, HandRecorder, ReplayBuffer
+            for player in players:
+                learner = BatchQLearner(player.state_space, player.learning_rate, player.discount_factor)
+                learner.load_q_table(player.q_table)
+                buffer = ReplayBuffer()
+                learners[player.name] = (learner, buffer)
+                self.recorders[player.name] = HandRecorder(buffer)
         
         for game in range(num_games):
             print(f"\n=== Jogo {game + 1} de {num_games} ===")
+            chips_before = {player.name: player.chips for player in players}
             
             # Create a PokerGame instance for this round
             poker_game = PokerGame([self.player1, self.player2])
+            self.community_cards = []
+            self.player1.start_hand(opponent=self.player2.name)
+            self.player2.start_hand(opponent=self.player1.name)
             
             # Deal cards
             poker_game.deal_cards()
@@ -56,19 +83,47 @@ class Game:
                 self._betting_round([self.player1, self.player2])
             
             # Showdown
+            showdown = not self.player1.folded and not self.player2.folded
             self._showdown([self.player1, self.player2])
+            for player in players:
+                player.end_hand(showdown)
+
+            for player in players:
+                if player.name in learners:
+                    learner, buffer = learners[player.name]
+                    recorder = self.recorders[player.name]
+                    # Estados criados nesta mão entram no learner com os valores iniciais da Q-table
+                    learner.seed_rows([index for index, _ in recorder.steps], player.q_table)
+                    recorder.finish((player.chips - chips_before[player.name]) / 1000)
+                    if len(buffer):
+                        learner.train(buffer, batch_size)
+                    # Só as linhas que o lote mudou voltam, e o teto da Q-table vale para elas
+                    for state, q_values in learner.pop_changes().items():
+                        player.q_table[state] = q_values
+                        player.q_usage.touch(state)
+                    player._enforce_q_limit()
             
             # Save Q-tables
             self.player1.save_q_table()
             self.player2.save_q_table()
+
+            if memory_monitor and (game + 1) % memory_every == 0:
+                memory_monitor.report(players)
     
     def _betting_round(self, players: List[Player]):
         self.current_bet = 0
         for player in players:
             if not player.folded:
                 action, amount = player.make_decision(self.community_cards, self.current_bet, self.min_raise, self.pot)
+                if player.name in self.recorders:
+                    self.recorders[player.name].record(player.last_state_index, action)
+                amount = min(amount, player.chips)
+                for observer in players:
+                    observer.observe_action(self.community_cards, action, amount, own=observer is player,
+                                            actor=player.name)
                 if action == "raise":
                     self.current_bet = amount
+                player.chips -= amount
                 self.pot += amount
     
     def _showdown(self, players: List[Player]):
@@ -82,6 +137,7 @@ class Game:
             winner = active_players[0]
             print(f"\n🏆 {winner.name} vence o pote de {self.pot} chips!")
             winner.chips += self.pot
+            self.pot = 0
             return
         
         # Compare hands - now using tuple comparison for proper tie-breaking
@@ -92,30 +148,11 @@ class Game:
             # Find all players with the exact same hand value tuple
             winners = [p for p, v in hand_values if v[1] == best_value[1][1]]
         
-        # Award the pot and ensure total chips remain 2000
+        # Award the pot without any chip rebalancing
         if len(winners) == 1:
             winner = winners[0]
             print(f"\n🏆 {winner.name} vence {self.pot} chips com {best_value[1][0]}!")
             winner.chips += self.pot
-
-            # Ensure total chips remain 2000
-            other_players = [p for p in players if p != winner]
-            if not other_players:
-                print("\n⚠️  Não há outro jogador para transferir fichas.")
-                return
-            other_player = other_players[0]
-
-            # Calculate how many chips the winner has over 1000
-            excess_chips = winner.chips - 1000
-
-            # If the winner has more than 1000 chips, transfer the excess to the other player
-            if excess_chips > 0 and other_player.chips < 1000:
-                transfer_amount = min(excess_chips, 1000 - other_player.chips)
-                winner.chips -= transfer_amount
-                other_player.chips += transfer_amount
-                print(f"\n⚖️  {transfer_amount} chips transferidos de {winner.name} para {other_player.name} para manter o total de 2000.")
-            else:
-                print("\ni️  Nenhuma transferência de fichas necessária.")
         else:
             # Split pot among winners with odd chip rule
             split_amount = self.pot // len(winners)
@@ -132,26 +169,42 @@ class Game:
                     print(f"\n🏆 {winner.name} vence {amount} chips com {best_value[1][0]}!")
                 winner.chips += amount
 
-            # Ensure total chips remain 2000 after split
-            for winner in winners:
-                excess_chips = winner.chips - 1000
-                if excess_chips > 0:
-                    # Distribute excess chips among other players (excluding winners)
-                    remaining_players = [p for p in players if p not in winners]
-                    if remaining_players:
-                        transfer_amount = min(excess_chips, 1000 - remaining_players[0].chips)
-                        winner.chips -= transfer_amount
-                        remaining_players[0].chips += transfer_amount
-                        print(f"\n⚖️  {transfer_amount} chips transferidos de {winner.name} para {remaining_players[0].name} para manter o total de 2000.")
-                    else:
-                        # If no other players, return chips to the pot (shouldn't happen)
-                        self.pot += excess_chips
-                        winner.chips -= excess_chips
-                        print(f"\n⚠️  {excess_chips} chips retornados ao pote de {winner.name} (situação inesperada).")
-                else:
-                    print("\ni️  Nenhuma transferência de fichas necessária.")
+        self.pot = 0  # Clear the pot after distribution
+
+def simulate(num_games: int, replay: bool = False, profile: str = None, interval: float = 0.005,
+             memory_every: int = 0):
+    """Máquina vs máquina; com ``profile``, grava <profile>.collapsed e <profile>.prof"""
+    game = Game()
+    if not profile:
+        game.play_machine_vs_machine(num_games, replay=replay, memory_every=memory_every)
+        return game
+
+    from sampling_profiler import SamplingProfiler
+    with SamplingProfiler(interval) as profiler:
+        game.play_machine_vs_machine(num_games, replay=replay, memory_every=memory_every)
+    paths = profiler.write(profile)
+    profiler.print_report()
+    print(f"Pilhas: {paths[0]} | pstats: {paths[1]}")
+    return game
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        parser = argparse.ArgumentParser(description="Simulação máquina vs máquina")
+        parser.add_argument("--games", type=int, default=100)
+        parser.add_argument("--replay", action="store_true", help="aprendizado por replay em lote")
+        parser.add_argument("--profile", metavar="PREFIXO",
+                            help="perfil amostrado em PREFIXO.collapsed e PREFIXO.prof")
+        parser.add_argument("--interval-ms", type=float, default=5.0, help="intervalo de amostragem")
+        parser.add_argument("--memory-every", type=int, default=0, metavar="N",
+                            help="relatório de memória a cada N mãos")
+        args = parser.parse_args(argv)
+        if args.memory_every:
+            from memory_report import tracing_from_env
+            tracing_from_env()
+        simulate(args.games, args.replay, args.profile, args.interval_ms / 1000, args.memory_every)
+        return
 
-def main():
     print("Bem-vindo ao Poker Texas Hold'em!")
     print("\nEscolha o modo de jogo:")
     print("1. Humano vs Máquina")
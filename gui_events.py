@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Barramento de eventos do log da GUI.
+
+Em vez de procurar trechos como "=== Flop ===" em cada mensagem, a GUI
+publica eventos tipados (mensagem, estado das fichas, fase, resultado da
+mão). O histórico fica em um buffer circular de capacidade fixa e os
+handlers da interface não rodam a cada publicação: os eventos pendentes
+são agrupados e entregues uma única vez no próximo ciclo ocioso do Tk
+(root.after_idle), só com o último evento de cada tipo.
+
+O eco no console é opcional (POKER_GUI_ECHO=1 liga).
+
+Todas as chamadas devem acontecer na thread do Tk; a thread da máquina
+devolve resultados pela fila da GUI, nunca publicando aqui diretamente.
+"""
+
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+# Tipos de evento
+MESSAGE = 'message'
+CHIP_STATE = 'chip_state'
+PHASE = 'phase'
+HAND_RESULT = 'hand_result'
+
+DEFAULT_CAPACITY = 500
+
+
+def echo_from_env() -> bool:
+    return os.environ.get("POKER_GUI_ECHO", "0") == "1"
+
+
+class GameEvent:
+    __slots__ = ('kind', 'text', 'data', 'timestamp')
+
+    def __init__(self, kind: str, text: str = "", data: Optional[Dict] = None):
+        self.kind = kind
+        self.text = text
+        self.data = data or {}
+        self.timestamp = time.time()
+
+    def __repr__(self):
+        return f"GameEvent({self.kind!r}, {self.text!r}, {self.data!r})"
+
+
+class EventBus:
+    """
+    Buffer circular de eventos com entrega agrupada.
+
+    ``schedule`` recebe uma função sem argumentos e deve chamá-la uma vez
+    mais tarde (na GUI, ``root.after_idle``). Sem ``schedule`` os handlers
+    rodam na hora, o que é útil em testes e scripts.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, echo: bool = False,
+                 schedule: Optional[Callable[[Callable[[], None]], None]] = None):
+        self.history = deque(maxlen=capacity)
+        self.echo = echo
+        self.schedule = schedule
+        self.published = 0
+        self.flushes = 0
+        self._handlers: Dict[str, List[Callable[[GameEvent], None]]] = {}
+        # Último evento pendente de cada tipo, na ordem em que foram vistos
+        self._pending: Dict[str, GameEvent] = {}
+        self._scheduled = False
+
+    def subscribe(self, kind: str, handler: Callable[[GameEvent], None]):
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def publish(self, kind: str, text: str = "", **data) -> GameEvent:
+        event = GameEvent(kind, text, data)
+        self.history.append(event)
+        self.published += 1
+        if self.echo and text:
+            print(text)
+
+        if kind in self._handlers:
+            # Reinsere para manter a ordem do último evento de cada tipo
+            self._pending.pop(kind, None)
+            self._pending[kind] = event
+            if self.schedule is None:
+                self.flush()
+            elif not self._scheduled:
+                self._scheduled = True
+                self.schedule(self.flush)
+        return event
+
+    def flush(self):
+        """Entrega o último evento pendente de cada tipo aos seus handlers"""
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        if pending:
+            self.flushes += 1
+        for kind, event in pending.items():
+            for handler in self._handlers.get(kind, ()):
+                handler(event)
+
+    def messages(self, limit: Optional[int] = None) -> List[str]:
+        """Textos do histórico, do mais antigo ao mais recente"""
+        texts = [event.text for event in self.history if event.text]
+        return texts[-limit:] if limit else texts
+
+    def clear(self):
+        self.history.clear()
+        self._pending.clear()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Camada de diff entre o estado do jogo e os widgets Tk.
+
+ViewDiff lembra as opções que cada widget está mostrando e só chama
+``configure`` com as que mudaram, evitando que o Tk refaça o layout de
+cartas e contadores idênticos a cada ação. FrameTimer mede quanto tempo
+cada atualização da tela leva, para conferir o ganho.
+
+Widgets atualizados pelo ViewDiff não devem ser configurados diretamente
+em outro lugar (ou chame ``forget`` depois), senão o cache fica velho.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+
+_UNSET = object()
+
+
+class ViewDiff:
+    def __init__(self):
+        self._shown = {}
+        self.applied = 0
+        self.skipped = 0
+
+    def apply(self, widget, **options) -> bool:
+        """Configura só as opções que mudaram; retorna True se algo mudou"""
+        shown = self._shown.setdefault(widget, {})
+        changed = {key: value for key, value in options.items()
+                   if shown.get(key, _UNSET) != value}
+        if not changed:
+            self.skipped += 1
+            return False
+        widget.configure(**changed)
+        shown.update(changed)
+        self.applied += 1
+        return True
+
+    def forget(self, widget=None):
+        """Descarta o que foi lembrado (de um widget ou de todos)"""
+        if widget is None:
+            self._shown.clear()
+        else:
+            self._shown.pop(widget, None)
+
+
+class FrameTimer:
+    """Duração das últimas ``window`` atualizações de tela"""
+
+    def __init__(self, window: int = 120):
+        self.samples = deque(maxlen=window)
+        self.frames = 0
+
+    @contextmanager
+    def frame(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.append(time.perf_counter() - start)
+            self.frames += 1
+
+    def summary(self) -> dict:
+        samples = list(self.samples)
+        if not samples:
+            return {'frames': 0, 'last_ms': 0.0, 'avg_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'frames': self.frames,
+            'last_ms': samples[-1] * 1000,
+            'avg_ms': sum(samples) / len(samples) * 1000,
+            'max_ms': max(samples) * 1000,
+        }
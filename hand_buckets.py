@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Card abstraction from equity distributions, clustered offline.
+
+``evaluate_hand_strength`` and ``cfr_solver.EquityBuckets`` reduce a hand
+to a single number, so a flush draw and a weak made hand with the same
+mean equity share a bucket. This tool instead describes every hand by the
+histogram of its equity over the rest of the board (``runouts`` random
+completions to the river, each scored against ``opponents`` random hands)
+and clusters those histograms per street with k-means.
+
+For 1-D histograms the earth mover's distance is the L1 distance between
+cumulative histograms; k-means runs on the cumulative histograms with the
+usual squared L2 distance, which keeps the centroid update a plain mean.
+Buckets are numbered by the mean equity of their centroid, so bucket 0 is
+the weakest, as with ``EquityBuckets``.
+
+Hands are scored in batches by ``evaluate_batch``, a NumPy version of
+``Player.get_hand_value`` (same order, ties included).
+
+Output is one file with, per street, the sorted hand indices of the
+suit-canonical hands (``suit_isomorphism.canonical_index``) and their
+bucket ids, plus the centroids. ``HandBuckets`` maps it read-only, so every
+process shares the pages; a lookup is a binary search. Pre-flop holds all
+169 classes; later streets hold the classes of the ``hands`` sampled ones,
+and any other hand is bucketed by its nearest centroid.
+``HandBuckets`` has the bucketer interface of ``cfr_solver``
+(``python cfr_solver.py --buckets-file hand_buckets.bin``).
+
+File layout (little endian):
+    header     magic "PHBK", version, buckets, bins, runouts, opponents,
+               centroids offset
+    streets    4 * (count, keys offset, ids offset)
+    keys/ids   per street: count uint64 canonical indices, count uint8 buckets
+    centroids  4 * buckets * bins float32 cumulative histograms
+
+Uso:
+    python hand_buckets.py --buckets 8 --hands 20000 --out hand_buckets.bin
+"""
+
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from card import Card
+from cfr_solver import BOARD_SIZES, CARD_INDEX, DECK, STREETS
+from suit_isomorphism import canonical_index, canonicalize_batch
+
+MAGIC = b'PHBK'
+VERSION = 2
+_HEADER = struct.Struct('<4sIIIIIQ')
+_STREET = struct.Struct('<QQQ')
+
+RANK_VALUES = np.array([card.value for card in DECK], dtype=np.int64)
+SUIT_IDS = np.array([Card.suits.index(card.suit) for card in DECK], dtype=np.int64)
+_RANKS = np.arange(15)
+
+BINOM = np.array([[math.comb(n, k) for k in range(6)] for n in range(len(DECK) + 1)], dtype=np.int64)
+
+CHUNK = 256  # mãos por lote nos histogramas
+
+
+def _highest(mask: np.ndarray) -> np.ndarray:
+    """Highest rank value set in each row of a (M, 15) mask, 0 if none"""
+    return np.where(mask.any(axis=1), 14 - np.argmax(mask[:, ::-1], axis=1), 0)
+
+
+def _top(values: np.ndarray, exclude: np.ndarray, k: int) -> np.ndarray:
+    """``k`` highest values per row, skipping the rank ``exclude`` of that row"""
+    kept = np.where(values != exclude[:, None], values, 0)
+    return -np.sort(-kept, axis=1)[:, :k]
+
+
+def evaluate_batch(cards) -> np.ndarray:
+    """
+    Score (M, 5..7) card ids like ``get_hand_value``: scores compare the way
+    its tuples do. A score is the category (1 high card .. 10 royal flush)
+    followed by the five tie-break values, four bits each.
+    """
+    cards = np.asarray(cards)
+    count = len(cards)
+    values = RANK_VALUES[cards]
+    suits = SUIT_IDS[cards]
+    rows = np.repeat(np.arange(count), cards.shape[1])
+    counts = np.bincount(rows * 15 + values.ravel(), minlength=count * 15).reshape(count, 15)
+    suit_counts = np.bincount(rows * 4 + suits.ravel(), minlength=count * 4).reshape(count, 4)
+
+    desc = -np.sort(-values, axis=1)
+    if desc.shape[1] < 5:
+        desc = np.pad(desc, ((0, 0), (0, 5 - desc.shape[1])))
+
+    # Flush: como get_hand_value, a sequência de cor só é vista nas 5 maiores do naipe
+    flush_suit = np.argmax(suit_counts, axis=1)
+    has_flush = suit_counts.max(axis=1) >= 5
+    flush = -np.sort(-np.where(suits == flush_suit[:, None], values, 0), axis=1)[:, :5]
+    wheel = np.array([14, 5, 4, 3, 2])
+    flush_high = np.where(flush[:, 0] - flush[:, 4] == 4, flush[:, 0],
+                          np.where((flush == wheel).all(axis=1), 5, 0))
+    has_straight_flush = has_flush & (flush_high > 0)
+
+    present = counts > 0
+    present[:, 1] = present[:, 14]  # ás baixo
+    windows = present[:, 1:11] & present[:, 2:12] & present[:, 3:13] & present[:, 4:14] & present[:, 5:15]
+    has_straight = windows.any(axis=1)
+    straight_high = 14 - np.argmax(windows[:, ::-1], axis=1)
+
+    quads = _highest(counts == 4)
+    trips = _highest(counts == 3)
+    second_trips = _highest((counts == 3) & (_RANKS != trips[:, None]))
+    pair = _highest(counts == 2)
+    second_pair = _highest((counts == 2) & (_RANKS != pair[:, None]))
+
+    def ties(*columns):
+        columns = columns + (0,) * (5 - len(columns))
+        return np.stack([np.broadcast_to(column, (count,)) for column in columns], axis=1)
+
+    def run(high):
+        return ties(*(high - i for i in range(5)))
+
+    pair_kickers = _top(values, pair, 3)
+    two_pair_kicker = _top(np.where(values != pair[:, None], values, 0), second_pair, 1)[:, 0]
+    trips_kickers = _top(values, trips, 2)
+
+    # Da categoria mais baixa para a mais alta; cada uma sobrescreve as anteriores
+    category = np.ones(count, dtype=np.int64)
+    best = desc[:, :5].copy()
+    for rank, mask, row in (
+        (2, pair > 0, ties(pair, *pair_kickers.T)),
+        (3, second_pair > 0, ties(pair, second_pair, two_pair_kicker)),
+        (4, trips > 0, ties(trips, *trips_kickers.T)),
+        (5, has_straight, run(straight_high)),
+        (6, has_flush, flush),
+        (7, (trips > 0) & ((pair > 0) | (second_trips > 0)),
+         ties(trips, np.where(second_trips > 0, second_trips, pair))),
+        (8, quads > 0, ties(quads, _top(values, quads, 1)[:, 0])),
+        (9, has_straight_flush, run(flush_high)),
+        (10, has_straight_flush & (flush_high == 14), run(14)),
+    ):
+        category[mask] = rank
+        best[mask] = row[mask]
+
+    score = category << 20
+    for i in range(5):
+        score |= best[:, i] << (16 - 4 * i)
+    return score
+
+
+def hand_index(hole, board) -> np.ndarray:
+    """
+    Exact index of (hole, board) card ids among the hands of its street:
+    hole pair rank * C(52, board size) + board rank. Accepts batches.
+    """
+    hole = np.sort(np.atleast_2d(np.asarray(hole, dtype=np.int64)), axis=1)
+    board = np.sort(np.asarray(board, dtype=np.int64).reshape(len(hole), -1), axis=1)
+    size = board.shape[1]
+    index = BINOM[hole[:, 1], 2] + hole[:, 0]
+    board_rank = np.zeros(len(hole), dtype=np.int64)
+    for i in range(size):
+        board_rank += BINOM[board[:, i], i + 1]
+    return index * BINOM[len(DECK), size] + board_rank
+
+
+def card_ids(cards: Sequence[Card]) -> List[int]:
+    return [CARD_INDEX[(card.rank, card.suit)] for card in cards]
+
+
+def equity_histograms(hole: np.ndarray, board: np.ndarray, bins: int = 10, runouts: int = 16,
+                      opponents: int = 32, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    (H, bins) histograms of each hand's equity over ``runouts`` random
+    completions of the board, each scored against ``opponents`` random hands
+    """
+    rng = rng or np.random.default_rng()
+    hole = np.asarray(hole, dtype=np.int64)
+    board = np.asarray(board, dtype=np.int64).reshape(len(hole), -1)
+    return np.concatenate([_histograms(hole[i:i + CHUNK], board[i:i + CHUNK], bins, runouts, opponents, rng)
+                           for i in range(0, len(hole), CHUNK)]) if len(hole) else np.zeros((0, bins))
+
+
+def _histograms(hole, board, bins, runouts, opponents, rng) -> np.ndarray:
+    hands, known = len(hole), 2 + board.shape[1]
+    missing = 5 - board.shape[1]
+    runouts = runouts if missing else 1
+
+    # Baralho embaralhado por mão e runout, com as cartas conhecidas no fim
+    keys = rng.random((hands, runouts, len(DECK)))
+    used = np.concatenate([hole, board], axis=1)
+    keys[np.arange(hands)[:, None, None], np.arange(runouts)[None, :, None], used[:, None, :]] = 2.0
+    deck = np.argsort(keys, axis=2)[:, :, :len(DECK) - known]
+    full_board = np.concatenate([np.broadcast_to(board[:, None, :], (hands, runouts, board.shape[1])),
+                                 deck[:, :, :missing]], axis=2)
+    rest = deck[:, :, missing:]
+
+    own = evaluate_batch(np.concatenate(
+        [np.broadcast_to(hole[:, None, :], (hands, runouts, 2)), full_board], axis=2).reshape(-1, 7))
+    first = rng.integers(rest.shape[2], size=(hands, runouts, opponents))
+    second = rng.integers(rest.shape[2] - 1, size=(hands, runouts, opponents))
+    second += second >= first
+    other = np.concatenate([
+        np.take_along_axis(rest, first, axis=2)[..., None],
+        np.take_along_axis(rest, second, axis=2)[..., None],
+        np.broadcast_to(full_board[:, :, None, :], (hands, runouts, opponents, 5)),
+    ], axis=3)
+    other = evaluate_batch(other.reshape(-1, 7)).reshape(hands, runouts, opponents)
+    own = own.reshape(hands, runouts, 1)
+    equity = ((own > other) + 0.5 * (own == other)).mean(axis=2)
+
+    slots = np.minimum((equity * bins).astype(np.int64), bins - 1)
+    counts = np.bincount((np.arange(hands)[:, None] * bins + slots).ravel(), minlength=hands * bins)
+    return counts.reshape(hands, bins) / runouts
+
+
+def kmeans(points: np.ndarray, k: int, iterations: int = 50,
+           rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Lloyd's k-means with k-means++ seeding. Returns (centroids, labels)."""
+    rng = rng or np.random.default_rng()
+    points = np.asarray(points, dtype=np.float64)
+    k = min(k, len(points))
+    norms = (points ** 2).sum(axis=1)
+
+    centroids = [points[rng.integers(len(points))]]
+    nearest = ((points - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = nearest.sum()
+        choice = rng.choice(len(points), p=nearest / total) if total > 0 else rng.integers(len(points))
+        centroids.append(points[choice])
+        nearest = np.minimum(nearest, ((points - points[choice]) ** 2).sum(axis=1))
+    centroids = np.array(centroids)
+
+    labels = None
+    for _ in range(iterations):
+        distances = norms[:, None] - 2.0 * points @ centroids.T + (centroids ** 2).sum(axis=1)
+        new_labels = np.argmin(distances, axis=1)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        members = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, points)
+        empty = members == 0
+        centroids[~empty] = sums[~empty] / members[~empty, None]
+        if empty.any():
+            # Cluster vazio recomeça no ponto mais distante do seu centróide
+            far = np.argsort(distances[np.arange(len(points)), labels])[::-1][:empty.sum()]
+            centroids[empty] = points[far]
+    return centroids, labels
+
+
+def _ordered_clusters(cdfs: np.ndarray, buckets: int, bins: int, rng) -> Tuple[np.ndarray, np.ndarray]:
+    """k-means on cumulative histograms, buckets renumbered by mean equity"""
+    centroids, labels = kmeans(cdfs, buckets, rng=rng)
+    centers = (np.arange(bins) + 0.5) / bins
+    means = np.diff(centroids, axis=1, prepend=0.0) @ centers
+    order = np.argsort(means, kind='stable')
+    rename = np.empty(len(order), dtype=np.int64)
+    rename[order] = np.arange(len(order))
+    full = np.ones((buckets, bins))  # sem mãos suficientes, buckets sobrando nunca são escolhidos
+    full[:len(order)] = centroids[order]
+    return full, rename[labels]
+
+
+def build_tables(buckets: int = 8, hands: int = 20000, bins: int = 10, runouts: int = 16,
+                 opponents: int = 32, seed: Optional[int] = None, log=None):
+    """
+    Cluster every street. Returns ([(keys, ids)] per street, centroids of
+    shape (streets, buckets, bins)).
+    """
+    rng = np.random.default_rng(seed)
+    tables, centroids = [], np.ones((len(STREETS), buckets, bins))
+    start = time.perf_counter()
+    for street, size in enumerate(BOARD_SIZES):
+        if size == 0:
+            dealt = np.array([(a, b) for b in range(len(DECK)) for a in range(b)])
+        else:
+            dealt = np.argsort(rng.random((hands, len(DECK))), axis=1)[:, :2 + size]
+        # Uma mão por classe de isomorfismo de naipes (as 1326 iniciais viram 169)
+        hole, board = canonicalize_batch(dealt[:, :2], dealt[:, 2:])
+        keys, first = np.unique(hand_index(hole, board), return_index=True)
+        hist = equity_histograms(hole[first], board[first], bins, runouts * 4 if size == 0 else runouts,
+                                 opponents, rng)
+        centroids[street], ids = _ordered_clusters(np.cumsum(hist, axis=1), buckets, bins, rng)
+        tables.append((keys.astype(np.uint64), ids.astype(np.uint8)))
+        if log:
+            log(f"   {STREETS[street]}: {len(keys)} mãos ({time.perf_counter() - start:.1f}s)")
+    return tables, centroids
+
+
+def _align8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def export_tables(path: str, tables, centroids: np.ndarray, runouts: int, opponents: int):
+    """Write the lookup tables, replacing ``path`` atomically"""
+    streets, buckets, bins = centroids.shape
+    offset = _HEADER.size + _STREET.size * streets
+    entries, blobs = [], []
+    for keys, ids in tables:
+        keys_offset = _align8(offset)
+        ids_offset = keys_offset + 8 * len(keys)
+        entries.append(_STREET.pack(len(keys), keys_offset, ids_offset))
+        blobs.append((keys_offset, keys.astype('<u8').tobytes()))
+        blobs.append((ids_offset, ids.astype(np.uint8).tobytes()))
+        offset = ids_offset + len(ids)
+    centroids_offset = _align8(offset)
+    blobs.append((centroids_offset, centroids.astype('<f4').tobytes()))
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, buckets, bins, runouts, opponents, centroids_offset))
+        f.write(b''.join(entries))
+        for blob_offset, blob in blobs:
+            f.write(b'\0' * (blob_offset - f.tell()))
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class HandBuckets:
+    """
+    Read-only, memory-mapped bucket tables. Same interface as
+    ``cfr_solver.EquityBuckets`` (``size``, ``params``, ``bucket``).
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.hits = 0
+        self.misses = 0
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, buckets, bins, runouts, opponents, centroids_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} não é uma tabela de buckets válida")
+        self.buckets, self.bins, self.runouts, self.opponents = buckets, bins, runouts, opponents
+        self._keys, self._ids = [], []
+        for street in range(len(STREETS)):
+            count, keys_offset, ids_offset = _STREET.unpack_from(self._mm, _HEADER.size + _STREET.size * street)
+            self._keys.append(np.frombuffer(self._mm, '<u8', count, keys_offset))
+            self._ids.append(np.frombuffer(self._mm, np.uint8, count, ids_offset))
+        self._centroids = np.frombuffer(self._mm, '<f4', len(STREETS) * buckets * bins,
+                                        centroids_offset).reshape(len(STREETS), buckets, bins)
+
+    def __reduce__(self):
+        # Processos do CFR reabrem o arquivo em vez de copiar as tabelas
+        return HandBuckets, (self.path,)
+
+    @property
+    def size(self) -> int:
+        return self.buckets
+
+    def params(self):
+        return {'kind': 'kmeans', 'path': self.path, 'buckets': self.buckets}
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._keys)
+
+    def bucket(self, hole: Sequence[Card], board: Sequence[Card], rng=None) -> int:
+        street = BOARD_SIZES.index(len(board)) if len(board) in BOARD_SIZES else len(STREETS) - 1
+        hole_ids, board_ids = card_ids(hole), card_ids(board)
+        key = canonical_index(hole_ids, board_ids)
+        keys = self._keys[street]
+        pos = int(np.searchsorted(keys, key))
+        if pos < len(keys) and int(keys[pos]) == key:
+            self.hits += 1
+            return int(self._ids[street][pos])
+
+        self.misses += 1
+        seed = rng.getrandbits(63) if rng is not None else None
+        hist = equity_histograms(np.array([hole_ids]), np.array([board_ids]), self.bins, self.runouts,
+                                 self.opponents, np.random.default_rng(seed))
+        distances = ((self._centroids[street] - np.cumsum(hist[0])) ** 2).sum(axis=1)
+        return int(np.argmin(distances))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agrupa as mãos por distribuição de equity (k-means)")
+    parser.add_argument("--buckets", type=int, default=8, help="buckets por street")
+    parser.add_argument("--hands", type=int, default=20000, help="mãos sorteadas por street pós-flop")
+    parser.add_argument("--bins", type=int, default=10, help="faixas do histograma de equity")
+    parser.add_argument("--runouts", type=int, default=16, help="finais de board por mão")
+    parser.add_argument("--opponents", type=int, default=32, help="mãos adversárias por final de board")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", default="hand_buckets.bin")
+    args = parser.parse_args(argv)
+    if not 1 <= args.buckets <= 255:
+        parser.error("--buckets deve estar entre 1 e 255")
+
+    print(f"🎲 {args.buckets} buckets, histogramas de {args.bins} faixas "
+          f"({args.runouts} finais x {args.opponents} adversários)")
+    tables, centroids = build_tables(args.buckets, args.hands, args.bins, args.runouts,
+                                     args.opponents, args.seed, log=print)
+    export_tables(args.out, tables, centroids, args.runouts, args.opponents)
+    print(f"✓ Tabelas salvas em {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
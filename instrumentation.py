@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Spans e contadores para os caminhos quentes do motor.
+
+Desligado (padrão) não custa nada: os métodos medidos (``HOT_PATHS``) só
+são embrulhados quando ``enable()`` é chamado, e ``disable()`` devolve os
+originais às classes. Para trechos que não são métodos, ``span(nome)``
+custa uma checagem de flag quando desligado.
+
+Cada span acumula contagem, tempo total, máximo e um histograma
+logarítmico (4 bins por potência de 2, erro < 19%) de onde saem p50/p99
+sem guardar as amostras. ``count(nome)`` soma contadores avulsos; o
+wrapper de ``make_decision`` conta as ações escolhidas.
+
+Ligar em tempo de execução: ``instrumentation.enable()`` ou, no servidor
+web, POKER_TRACE=1.
+
+Uso:
+    python instrumentation.py --games 200 --top 10
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib
+import io
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# (módulo, classe, método, nome do span)
+HOT_PATHS = [
+    ('poker_game', 'PokerGame', 'deal_cards', 'poker_game.deal_cards'),
+    ('game', 'Game', '_betting_round', 'game.betting_round'),
+    ('game', 'Game', '_showdown', 'game.showdown'),
+    ('player', 'Player', 'make_decision', 'player.make_decision'),
+    ('player', 'Player', 'update_q_value', 'player.update_q_value'),
+    ('player', 'Player', 'save_q_table', 'player.save_q_table'),
+    ('player', 'Player', 'get_state', 'player.get_state'),
+    ('player', 'Player', 'evaluate_hand_strength', 'player.evaluate_hand_strength'),
+    ('player', 'Player', 'get_hand_value', 'player.get_hand_value'),
+]
+BINS_PER_OCTAVE = 4
+
+_lock = threading.Lock()
+_enabled = False
+_patched: Dict[Tuple[type, str], object] = {}
+spans: Dict[str, 'SpanStats'] = {}
+counters: Dict[str, int] = {}
+
+
+class SpanStats:
+    __slots__ = ('count', 'total_ns', 'max_ns', 'bins')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.bins: Dict[int, int] = {}
+
+    def add(self, ns: int):
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        b = int(math.log2(ns) * BINS_PER_OCTAVE) if ns > 0 else 0
+        self.bins[b] = self.bins.get(b, 0) + 1
+
+    def percentile(self, pct: float) -> float:
+        """Limite superior do bin que contém o percentil (ns)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for b in sorted(self.bins):
+            seen += self.bins[b]
+            if seen >= rank:
+                return min(2 ** ((b + 1) / BINS_PER_OCTAVE), self.max_ns)
+        return float(self.max_ns)
+
+
+def record(name: str, ns: int):
+    with _lock:
+        stats = spans.get(name)
+        if stats is None:
+            stats = spans[name] = SpanStats()
+        stats.add(ns)
+
+
+def count(name: str, n: int = 1):
+    if _enabled:
+        with _lock:
+            counters[name] = counters.get(name, 0) + n
+
+
+@contextlib.contextmanager
+def _timed(name: str):
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter_ns() - start)
+
+
+_NULL = contextlib.nullcontext()
+
+
+def span(name: str):
+    """``with span("nome"):`` mede o bloco se a instrumentação estiver ligada"""
+    return _timed(name) if _enabled else _NULL
+
+
+def _wrap(method, name: str):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record(name, time.perf_counter_ns() - start)
+
+    if method.__name__ == 'make_decision':
+        @functools.wraps(method)
+        def counting_wrapper(*args, **kwargs):
+            result = wrapper(*args, **kwargs)
+            count(f"decision.{result[0]}")
+            return result
+        return counting_wrapper
+    return wrapper
+
+
+def enable(paths: Optional[List[Tuple[str, str, str, str]]] = None):
+    """Liga spans e contadores e embrulha os métodos de ``paths``"""
+    global _enabled
+    with _lock:
+        for module_name, class_name, method_name, name in paths or HOT_PATHS:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            if (cls, method_name) in _patched:
+                continue
+            original = cls.__dict__[method_name]
+            _patched[(cls, method_name)] = original
+            setattr(cls, method_name, _wrap(original, name))
+        _enabled = True
+
+
+def disable():
+    """Desliga e devolve os métodos originais (os dados ficam)"""
+    global _enabled
+    with _lock:
+        for (cls, method_name), original in _patched.items():
+            setattr(cls, method_name, original)
+        _patched.clear()
+        _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _lock:
+        spans.clear()
+        counters.clear()
+
+
+def enable_from_env():
+    if os.environ.get("POKER_TRACE") == "1":
+        enable()
+
+
+def report(top: int = 10, sort: str = 'total') -> List[Dict]:
+    """Spans ordenados por tempo total ('total') ou por p99 ('p99'), em µs"""
+    with _lock:
+        rows = [{
+            'name': name,
+            'count': stats.count,
+            'total_ms': stats.total_ns / 1e6,
+            'mean_us': stats.total_ns / stats.count / 1e3,
+            'p50_us': stats.percentile(50) / 1e3,
+            'p99_us': stats.percentile(99) / 1e3,
+            'max_us': stats.max_ns / 1e3,
+        } for name, stats in spans.items() if stats.count]
+    key = 'p99_us' if sort == 'p99' else 'total_ms'
+    return sorted(rows, key=lambda row: row[key], reverse=True)[:top]
+
+
+def print_report(top: int = 10):
+    for sort, title in (('total', "tempo total"), ('p99', "p99")):
+        print("=" * 86)
+        print(f"🔍 SPANS POR {title.upper()}")
+        print("=" * 86)
+        print(f"{'span':<32}{'chamadas':>9}{'total ms':>11}{'média µs':>11}"
+              f"{'p50 µs':>9}{'p99 µs':>9}{'máx µs':>10}")
+        for row in report(top, sort):
+            print(f"{row['name']:<32}{row['count']:9d}{row['total_ms']:11.1f}{row['mean_us']:11.1f}"
+                  f"{row['p50_us']:9.1f}{row['p99_us']:9.1f}{row['max_us']:10.1f}")
+    if counters:
+        print("=" * 86)
+        for name, value in sorted(counters.items()):
+            print(f"{name:<32}{value:9d}")
+    print("=" * 86)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Onde o tempo de uma simulação é gasto")
+    parser.add_argument("--games", type=int, default=100, help="mãos máquina vs máquina")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    from game import Game
+
+    enable()
+    cwd = os.getcwd()
+    # Roda em um diretório temporário para não mexer no q_table.json real
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), span("simulation"):
+                Game().play_machine_vs_machine(args.games)
+        finally:
+            os.chdir(cwd)
+    disable()
+    print_report(args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
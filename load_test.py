@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Gerador de carga para a API web (poker_web.py).
+
+Simula muitos jogadores virtuais, cada um na sua própria mesa (table_id),
+jogando mãos por /api/game/new e /api/game/action com tempo de reflexão
+aleatório. No fim mostra vazão, latência p50/p95/p99 por endpoint e taxa de
+erros; com --max-p99-ms / --max-error-rate termina com código 1 se os
+limites forem excedidos, para uso em testes de regressão.
+
+Uso:
+    python poker_web.py &
+    python load_test.py --players 500 --duration 60
+
+    # Sem servidor: usa o cliente de teste do Flask dentro do processo
+    python load_test.py --in-process --players 50 --duration 10
+
+Cada mesa nova cria uma máquina, e sem snapshot ela lê q_table.json, o
+arquivo de uso e os modelos de oponente no caminho da requisição: o teste
+mediria parse de JSON, não a decisão. Por isso o modo --in-process exporta
+a Q-table para um snapshot compartilhado (policy_snapshot.py) antes de
+subir o app; --no-snapshot volta ao carregamento por mesa. Contra um
+servidor externo, suba-o com POKER_POLICY_SNAPSHOT.
+
+Para milhares de jogadores, aumente POKER_MAX_TABLES no servidor.
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank (samples não precisa estar ordenado)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class HttpTransport:
+    """Cliente HTTP/1.1 mínimo sobre asyncio (uma conexão por requisição)"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None) -> Tuple[int, dict]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Connection: close\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n").encode()
+
+        async def roundtrip():
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                writer.write(head + payload)
+                await writer.drain()
+                return await reader.read()
+            finally:
+                writer.close()
+
+        raw = await asyncio.wait_for(roundtrip(), self.timeout)
+        header, _, content = raw.partition(b"\r\n\r\n")
+        status = int(header.split(b" ", 2)[1])
+        try:
+            data = json.loads(content) if content else {}
+        except json.JSONDecodeError:
+            data = {}
+        return status, data
+
+
+def prepare_snapshot(q_table_path: str = "q_table.json", name: str = "Máquina") -> str:
+    """Exporta a Q-table da máquina para um snapshot temporário e aponta POKER_POLICY_SNAPSHOT para ele"""
+    from policy_snapshot import export_from_json, export_snapshot
+    directory = tempfile.mkdtemp(prefix="poker-load-")
+    atexit.register(shutil.rmtree, directory, True)
+    path = os.path.join(directory, "q_policy.bin")
+    try:
+        export_from_json(q_table_path, name, path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        export_snapshot({}, path)
+    os.environ['POKER_POLICY_SNAPSHOT'] = path
+    return path
+
+
+class InProcessTransport:
+    """Usa app.test_client() do poker_web, sem rede (roda em threads)"""
+
+    def __init__(self, snapshot: bool = True):
+        # Precisa vir antes do import: o poker_web lê o snapshot ao carregar
+        if snapshot and not os.environ.get('POKER_POLICY_SNAPSHOT'):
+            prepare_snapshot()
+        from poker_web import app
+        self.client = app.test_client()
+
+    def _call(self, method, path, body):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True) or {}
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None) -> Tuple[int, dict]:
+        return await asyncio.to_thread(self._call, method, path, body)
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.hands = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def summary(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        total = sum(len(v) for v in self.latencies.values())
+        total_errors = sum(self.errors.values())
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            endpoints[endpoint] = {
+                'requests': len(samples),
+                'errors': self.errors[endpoint],
+                'error_rate': self.errors[endpoint] / len(samples),
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p95_ms': percentile(samples, 95) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+            }
+        return {
+            'elapsed_s': elapsed,
+            'requests': total,
+            'throughput_rps': total / elapsed if elapsed > 0 else 0.0,
+            'error_rate': total_errors / total if total else 0.0,
+            'hands': self.hands,
+            'endpoints': endpoints,
+        }
+
+
+class VirtualPlayer:
+    def __init__(self, player_id: int, transport, stats: LoadStats, think_time: float, rng: random.Random):
+        self.table_id = f"load-{player_id}"
+        self.transport = transport
+        self.stats = stats
+        self.think_time = think_time
+        self.rng = rng
+
+    async def _request(self, method: str, path: str, body: Optional[dict] = None) -> Optional[dict]:
+        endpoint = f"{method} {path.split('?')[0]}"
+        start = time.perf_counter()
+        try:
+            status, data = await self.transport.request(method, path, body)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            self.stats.record(endpoint, time.perf_counter() - start, ok=False)
+            return None
+        ok = status < 400 and 'error' not in data
+        self.stats.record(endpoint, time.perf_counter() - start, ok=ok)
+        return data if ok else None
+
+    async def think(self):
+        # Tempo de reflexão humano: exponencial com média think_time
+        if self.think_time > 0:
+            await asyncio.sleep(min(self.rng.expovariate(1.0 / self.think_time), self.think_time * 5))
+
+    def choose_action(self) -> Tuple[str, int]:
+        roll = self.rng.random()
+        if roll < 0.1:
+            return 'fold', 0
+        if roll < 0.3:
+            return 'raise', self.rng.choice([20, 50, 100])
+        return 'call', 0
+
+    async def play(self, deadline: float):
+        body = {'table_id': self.table_id}
+        state_path = f"/api/game/state?table_id={self.table_id}"
+        while time.perf_counter() < deadline:
+            if await self._request("POST", "/api/game/new", body) is None:
+                await asyncio.sleep(1.0)
+                continue
+            self.stats.hands += 1
+
+            while time.perf_counter() < deadline:
+                await self.think()
+                action, amount = self.choose_action()
+                result = await self._request("POST", "/api/game/action",
+                                             {**body, 'action': action, 'amount': amount})
+                if result is None:
+                    break
+                state = result.get('state', {})
+                # Espera a máquina responder (decisão em segundo plano)
+                while state.get('machine_thinking') and time.perf_counter() < deadline:
+                    await asyncio.sleep(0.1)
+                    state = await self._request("GET", state_path) or {}
+                if state.get('game_over') or not state:
+                    break
+                player = state.get('player', {})
+                if player.get('chips', 0) <= 0 or state.get('machine', {}).get('chips', 0) <= 0:
+                    return
+
+
+async def run_load(transport, players: int, duration: float, ramp_up: float,
+                   think_time: float, seed: Optional[int] = None) -> LoadStats:
+    stats = LoadStats()
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + duration
+
+    async def start(player_id):
+        if ramp_up > 0:
+            await asyncio.sleep(ramp_up * player_id / max(players, 1))
+        vp = VirtualPlayer(player_id, transport, stats, think_time, random.Random(rng.random()))
+        await vp.play(deadline)
+
+    await asyncio.gather(*(start(i) for i in range(players)))
+    stats.finished = time.perf_counter()
+    return stats
+
+
+def print_report(summary: dict):
+    print("=" * 72)
+    print("📈 RESULTADO DO TESTE DE CARGA")
+    print("=" * 72)
+    print(f"Duração: {summary['elapsed_s']:.1f}s | Requisições: {summary['requests']} | "
+          f"Vazão: {summary['throughput_rps']:.1f} req/s | Mãos: {summary['hands']}")
+    print(f"Taxa de erros: {summary['error_rate'] * 100:.2f}%")
+    print("-" * 72)
+    print(f"{'Endpoint':<28}{'reqs':>8}{'erros':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for endpoint, row in summary['endpoints'].items():
+        print(f"{endpoint[:28]:<28}{row['requests']:>8}{row['errors']:>8}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}")
+    print("=" * 72)
+
+
+def check_thresholds(summary: dict, max_p99_ms: Optional[float], max_error_rate: Optional[float]) -> List[str]:
+    """Retorna a lista de limites violados (vazia se tudo ok)"""
+    failures = []
+    if max_error_rate is not None and summary['error_rate'] > max_error_rate:
+        failures.append(f"taxa de erros {summary['error_rate']:.4f} > {max_error_rate}")
+    if max_p99_ms is not None:
+        for endpoint, row in summary['endpoints'].items():
+            if row['p99_ms'] > max_p99_ms:
+                failures.append(f"{endpoint}: p99 {row['p99_ms']:.1f}ms > {max_p99_ms}ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga da API web do poker")
+    parser.add_argument("--url", default="http://127.0.0.1:5001", help="servidor alvo (apenas localhost)")
+    parser.add_argument("--in-process", action="store_true", help="usa o cliente de teste do Flask, sem rede")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="com --in-process, cada mesa carrega q_table.json (mede também o parse)")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30.0, help="segundos")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="segundos para iniciar todos os jogadores")
+    parser.add_argument("--think-time", type=float, default=1.5, help="média do tempo de reflexão (s)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", help="salva o resumo em JSON")
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    if args.in_process:
+        transport = InProcessTransport(snapshot=not args.no_snapshot)
+    else:
+        host = urlsplit(args.url).hostname
+        if host not in ("127.0.0.1", "localhost", "::1"):
+            parser.error("o teste de carga só roda contra localhost")
+        transport = HttpTransport(args.url)
+
+    stats = asyncio.run(run_load(transport, args.players, args.duration,
+                                 args.ramp_up, args.think_time, args.seed))
+    summary = stats.summary()
+    print_report(summary)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=4)
+
+    failures = check_thresholds(summary, args.max_p99_ms, args.max_error_rate)
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
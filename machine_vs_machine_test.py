@@ -4,7 +4,9 @@ Script para testar estratégias de máquinas competindo entre si no jogo de Poke
 """
 
 import random
-from poker_app import Player, Game
+import sys
+from player import Player
+from game import Game
 
 def run_machine_vs_machine_test(num_games=100):
     """
@@ -58,10 +60,19 @@ def run_machine_vs_machine_test(num_games=100):
         print(f"  Média de chips ganhos por jogo: {media_chips:.1f}")
 
 if __name__ == "__main__":
+    # --profile PREFIXO grava o perfil amostrado (sampling_profiler.py)
+    profile = sys.argv[sys.argv.index("--profile") + 1] if "--profile" in sys.argv[1:-1] else None
     try:
         num_games_input = input("Digite o número de jogos para testar (recomendado: 100): ")
         num_games = int(num_games_input)
-        run_machine_vs_machine_test(num_games)
+        if profile:
+            from sampling_profiler import SamplingProfiler
+            with SamplingProfiler() as profiler:
+                run_machine_vs_machine_test(num_games)
+            profiler.write(profile)
+            profiler.print_report()
+        else:
+            run_machine_vs_machine_test(num_games)
     except ValueError:
         print("❌ Entrada inválida! Por favor, insira um número inteiro.")
     except KeyboardInterrupt:
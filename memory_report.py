@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Quanto de memória o estado de aprendizado de um jogador ocupa.
+
+``deep_sizeof`` percorre dicts, listas, strings e objetos e soma
+``sys.getsizeof`` de cada objeto uma única vez (strings e floats
+compartilhados entre estados não são contados duas vezes). ``player_memory``
+quebra o total por componente do Player (q_table, eligibility_traces, ...)
+e calcula bytes por estado; ``memory_report`` junta os jogadores, o RSS e,
+se o tracemalloc estiver ligado (POKER_TRACEMALLOC=1 ou ``start_tracing``),
+o total rastreado e os arquivos que mais alocaram.
+
+``MemoryMonitor`` imprime o relatório e avisa quando um jogador passa dos
+limites. O treino (``python game.py --memory-every 100``) e o servidor
+web (POKER_MEMORY_REPORT_INTERVAL) chamam o monitor periodicamente.
+
+Variáveis de ambiente:
+    POKER_MEMORY_WARN_MB               aviso por jogador (padrão 100)
+    POKER_MEMORY_WARN_BYTES_PER_STATE  aviso de bytes por estado (padrão 2048)
+    POKER_MEMORY_REPORT_INTERVAL       segundos entre relatórios no servidor (padrão 0 = desligado)
+    POKER_TRACEMALLOC                  1 = liga o tracemalloc ao iniciar
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, Optional
+
+from policy_snapshot import table_sizes
+from web_metrics import resident_memory_bytes
+
+COMPONENTS = ('q_table', 'eligibility_traces', 'q_usage', 'state_visits',
+              'opponent_models', 'game_sequence', 'action_history')
+# Componentes que crescem com o número de estados
+PER_STATE_COMPONENTS = ('q_table', 'eligibility_traces', 'q_usage')
+MB = 1024 * 1024
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """Bytes de ``obj`` e de tudo que ele referencia, sem contar nada duas vezes"""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool, type(None))):
+            continue
+        if hasattr(item, 'nbytes') and hasattr(item, 'dtype'):  # ndarray: getsizeof já inclui os dados
+            continue
+        if isinstance(item, Mapping):
+            # Mapeamentos como PolicyOverlay só expõem o que é privado da instância
+            for key, value in item.items():
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(item, (list, tuple, set, frozenset)) or hasattr(item, 'maxlen'):
+            stack.extend(item)
+        elif hasattr(item, '__dict__'):
+            stack.append(vars(item))
+    return total
+
+
+def player_memory(player) -> Dict:
+    """Bytes por componente de aprendizado e por estado da Q-table"""
+    seen: set = set()
+    components = {}
+    for name in COMPONENTS:
+        value = getattr(player, name, None)
+        components[name] = deep_sizeof(value, seen) if value is not None else 0
+    # Com snapshot compartilhado, a memória do jogador é só a do overlay
+    states, private_states = table_sizes(player.q_table)
+    per_state = sum(components[name] for name in PER_STATE_COMPONENTS)
+    return {
+        'name': player.name,
+        'states': states,
+        'private_states': private_states,
+        'components': components,
+        'total_bytes': sum(components.values()),
+        'bytes_per_state': per_state / private_states if private_states else 0.0,
+    }
+
+
+def start_tracing(frames: int = 1):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def tracing_from_env():
+    if os.environ.get("POKER_TRACEMALLOC") == "1":
+        start_tracing()
+
+
+def memory_report(players: Iterable, top_allocations: int = 5) -> Dict:
+    report = {
+        'players': [player_memory(player) for player in players],
+        'rss_bytes': resident_memory_bytes(),
+        'tracemalloc': None,
+    }
+    report['total_bytes'] = sum(p['total_bytes'] for p in report['players'])
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics('filename')[:top_allocations]
+        report['tracemalloc'] = {
+            'current_bytes': current,
+            'peak_bytes': peak,
+            'top': [{'file': str(stat.traceback[0].filename), 'bytes': stat.size} for stat in stats],
+        }
+    return report
+
+
+def format_report(report: Dict, top_players: int = 5) -> List[str]:
+    players = sorted(report['players'], key=lambda p: p['total_bytes'], reverse=True)
+    lines = [f"🧠 Memória: aprendizado {report['total_bytes'] / MB:.2f} MB em {len(players)} jogador(es) | "
+             f"RSS {report['rss_bytes'] / MB:.1f} MB"]
+    for player in players[:top_players]:
+        parts = ", ".join(f"{name} {size / 1024:.0f} KB" for name, size in player['components'].items()
+                          if size)
+        states = f"{player['states']} estados"
+        if player['private_states'] != player['states']:
+            states += f" ({player['private_states']} próprios)"
+        lines.append(f"   {player['name']}: {player['total_bytes'] / MB:.2f} MB, {states}, "
+                     f"{player['bytes_per_state']:.0f} B/estado ({parts})")
+    if len(players) > top_players:
+        lines.append(f"   ... e mais {len(players) - top_players} jogador(es)")
+    traced = report['tracemalloc']
+    if traced:
+        lines.append(f"   tracemalloc: {traced['current_bytes'] / MB:.1f} MB "
+                     f"(pico {traced['peak_bytes'] / MB:.1f} MB)")
+        for entry in traced['top']:
+            lines.append(f"      {entry['bytes'] / 1024:8.0f} KB  {entry['file']}")
+    return lines
+
+
+class MemoryMonitor:
+    """Relatório periódico com avisos quando um jogador passa dos limites"""
+
+    def __init__(self, warn_player_mb: float = 100.0, warn_bytes_per_state: float = 2048.0,
+                 log: Callable[[str], None] = print):
+        self.warn_player_bytes = warn_player_mb * MB
+        self.warn_bytes_per_state = warn_bytes_per_state
+        self.log = log
+        self.warnings = 0
+
+    @classmethod
+    def from_env(cls, log: Callable[[str], None] = print) -> 'MemoryMonitor':
+        return cls(float(os.environ.get("POKER_MEMORY_WARN_MB", 100)),
+                   float(os.environ.get("POKER_MEMORY_WARN_BYTES_PER_STATE", 2048)), log)
+
+    def check(self, report: Dict) -> List[str]:
+        warnings = []
+        for player in report['players']:
+            if player['total_bytes'] > self.warn_player_bytes:
+                warnings.append(f"{player['name']} usa {player['total_bytes'] / MB:.1f} MB "
+                                f"(limite {self.warn_player_bytes / MB:.0f} MB)")
+            if player['bytes_per_state'] > self.warn_bytes_per_state:
+                warnings.append(f"{player['name']} usa {player['bytes_per_state']:.0f} B por estado "
+                                f"(limite {self.warn_bytes_per_state:.0f})")
+        return warnings
+
+    def report(self, players: Iterable) -> Dict:
+        start = time.perf_counter()
+        report = memory_report(players)
+        report['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        for line in format_report(report):
+            self.log(line)
+        for warning in self.check(report):
+            self.warnings += 1
+            self.log(f"⚠️  {warning}")
+        return report
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Modelo incremental de cada oponente.
+
+``Player.get_state`` lia ``opponent_stats['aggression_frequency']``, que
+ficava em 0.5 para sempre. ``OpponentModel`` acompanha, para cada oponente,
+as estatísticas clássicas de leitura de jogo:
+
+    vpip            mãos em que pôs fichas voluntariamente no pré-flop
+    pfr             mãos em que aumentou no pré-flop
+    aggression      fator (raises / calls) e frequência
+                    (raises / (raises + calls + folds)) depois do flop
+    fold_to_bet     folds quando enfrenta aposta, por street
+    showdown        mãos que chegaram ao showdown entre as que viram o flop
+
+Cada estatística é um par de contadores com decaimento exponencial: a cada
+nova observação os contadores são multiplicados por ``decay`` e somados, então
+a atualização é O(1) e as mãos antigas pesam cada vez menos (com 0.98, a
+memória efetiva é de ~50 observações). As taxas partem de um prior com peso
+``PRIOR_WEIGHT``, para não oscilar com poucas mãos.
+
+A mesa informa as ações pelo ``Player.observe_action`` e o fim da mão pelo
+``Player.end_hand``. Os contadores de cada jogador vão para
+``opponent_models.json`` junto com a Q-table, como uma lista de floats por
+oponente.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+MODEL_FILE = "opponent_models.json"
+DEFAULT_DECAY = 0.98
+PRIOR_WEIGHT = 2.0
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+# Posição de cada contador na lista persistida
+COUNTERS = ('hands', 'vpip', 'pfr', 'raises', 'calls', 'folds',
+            'faced_preflop', 'folded_preflop', 'faced_flop', 'folded_flop',
+            'faced_turn', 'folded_turn', 'faced_river', 'folded_river',
+            'saw_flop', 'showdowns')
+_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+
+PRIORS = {'vpip': 0.5, 'pfr': 0.2, 'aggression': 0.5, 'fold_to_bet': 0.4, 'showdown': 0.3}
+
+
+class OpponentModel:
+    """Estatísticas de um oponente, atualizadas ação a ação"""
+
+    def __init__(self, decay: float = DEFAULT_DECAY, counts: Optional[List[float]] = None):
+        self.decay = decay
+        self.counts = list(counts) if counts is not None else [0.0] * len(COUNTERS)
+        self._reset_hand()
+
+    def _reset_hand(self):
+        self._in_hand = False
+        self._vpip = self._pfr = self._saw_flop = False
+        self._facing = None  # street em que o oponente enfrenta uma aposta nossa
+
+    def _add(self, total: str, *hits):
+        """Uma oportunidade de ``total``; cada (contador, aconteceu) de ``hits`` conta se aconteceu"""
+        counts, decay = self.counts, self.decay
+        counts[_INDEX[total]] = counts[_INDEX[total]] * decay + 1.0
+        for hit, happened in hits:
+            counts[_INDEX[hit]] = counts[_INDEX[hit]] * decay + (1.0 if happened else 0.0)
+
+    def _rate(self, hits: str, total: str, prior: float) -> float:
+        return ((self.counts[_INDEX[hits]] + prior * PRIOR_WEIGHT)
+                / (self.counts[_INDEX[total]] + PRIOR_WEIGHT))
+
+    def observe(self, street: int, action: str, amount: int, own: bool = False):
+        """Uma ação da mão atual; ``own`` marca as do dono do modelo"""
+        if own:
+            if action == 'raise':
+                self._facing = street
+            return
+
+        self._in_hand = True
+        if street > 0:
+            self._saw_flop = True
+        facing = self._facing == street or (action == 'call' and amount > 0)
+        if facing:
+            self._add(f'faced_{STREETS[street]}', (f'folded_{STREETS[street]}', action == 'fold'))
+            self._facing = None
+
+        if street == 0:
+            if action == 'raise':
+                self._vpip = self._pfr = True
+            elif action == 'call' and amount > 0:
+                self._vpip = True
+        elif action == 'raise' or action == 'fold' or (action == 'call' and amount > 0):
+            # Passar (call de 0) não entra no fator de agressão
+            decay = self.decay
+            for name in ('raises', 'calls', 'folds'):
+                self.counts[_INDEX[name]] *= decay
+            self.counts[_INDEX[action + 's']] += 1.0
+
+    def end_hand(self, showdown: bool = False):
+        if self._in_hand:
+            self._add('hands', ('vpip', self._vpip), ('pfr', self._pfr))
+            if self._saw_flop:
+                self._add('saw_flop', ('showdowns', showdown))
+        self._reset_hand()
+
+    def start_hand(self):
+        """Fecha a mão anterior se a mesa não chamou ``end_hand``"""
+        self.end_hand(showdown=False)
+
+    @property
+    def vpip(self) -> float:
+        return self._rate('vpip', 'hands', PRIORS['vpip'])
+
+    @property
+    def pfr(self) -> float:
+        return self._rate('pfr', 'hands', PRIORS['pfr'])
+
+    @property
+    def aggression_frequency(self) -> float:
+        raises, calls, folds = (self.counts[_INDEX[name]] for name in ('raises', 'calls', 'folds'))
+        prior = PRIORS['aggression']
+        return (raises + prior * PRIOR_WEIGHT) / (raises + calls + folds + PRIOR_WEIGHT)
+
+    @property
+    def aggression_factor(self) -> float:
+        prior = PRIORS['aggression']
+        return ((self.counts[_INDEX['raises']] + prior * PRIOR_WEIGHT)
+                / (self.counts[_INDEX['calls']] + (1 - prior) * PRIOR_WEIGHT))
+
+    def fold_to_bet(self, street: int) -> float:
+        name = STREETS[street]
+        return self._rate(f'folded_{name}', f'faced_{name}', PRIORS['fold_to_bet'])
+
+    @property
+    def showdown_frequency(self) -> float:
+        return self._rate('showdowns', 'saw_flop', PRIORS['showdown'])
+
+    @property
+    def hands(self) -> float:
+        """Mãos observadas, já com o decaimento"""
+        return self.counts[_INDEX['hands']]
+
+    def features(self) -> Dict[str, float]:
+        stats = {
+            'vpip': self.vpip,
+            'pfr': self.pfr,
+            'aggression_factor': self.aggression_factor,
+            'aggression_frequency': self.aggression_frequency,
+            'showdown_frequency': self.showdown_frequency,
+        }
+        faced = sum(self.counts[_INDEX[f'faced_{name}']] for name in STREETS)
+        folded = sum(self.counts[_INDEX[f'folded_{name}']] for name in STREETS)
+        stats['fold_frequency'] = (folded + PRIORS['fold_to_bet'] * PRIOR_WEIGHT) / (faced + PRIOR_WEIGHT)
+        for street, name in enumerate(STREETS):
+            stats[f'fold_to_bet_{name}'] = self.fold_to_bet(street)
+        return stats
+
+    def to_dict(self) -> Dict:
+        return {'decay': self.decay, 'counts': [round(value, 4) for value in self.counts]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'OpponentModel':
+        counts = data.get('counts')
+        if counts is not None and len(counts) != len(COUNTERS):
+            counts = None  # formato antigo: recomeça do prior
+        return cls(data.get('decay', DEFAULT_DECAY), counts)
+
+
+def load_models(name: str, path: str = MODEL_FILE) -> Dict[str, OpponentModel]:
+    """Modelos que o jogador ``name`` tem de cada oponente"""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f).get(name, {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return {opponent: OpponentModel.from_dict(model) for opponent, model in data.items()}
@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
+import os
 import random
 import json
+import threading
+import time
+from collections import Counter
 from typing import List, Optional, Dict, Tuple
 from card import Card
+from opponent_model import MODEL_FILE, OpponentModel, load_models
+from q_table_pruning import QTableLimit, QTableUsage, USAGE_FILE, load_usage
+from state_space import DEFAULT_STATE_SPACE, rebucket_q_table
+
+# Serializes q_table.json rewrites when several tables share a process
+_q_table_file_lock = threading.Lock()
+# Chamados com a duração (s) de cada gravação do q_table.json (métricas do servidor)
+flush_listeners = []
 
 class Player:
-    def __init__(self, name, is_machine=False):
+    def __init__(self, name, is_machine=False, policy=None, compiled_policy=None,
+                 state_space=DEFAULT_STATE_SPACE, river_solver=None):
         self.name = name
         self.is_machine = is_machine
         self.hand: List[Card] = []
@@ -25,34 +38,147 @@ class Player:
             'learning_steps': 0
         }
         
+        # Política congelada compartilhada (policy_snapshot.SharedPolicy):
+        # não carrega nem grava q_table.json, só consulta o snapshot
+        self.frozen_policy = policy is not None
+
+        # Tabela de probabilidades pré-compilada (policy_table.CompiledPolicy
+        # ou cfr_solver.SolverPolicy): decide por consulta direta, sem passar pela Q-table
+        self.compiled_policy = compiled_policy
+
+        # Solver do subjogo do river (river_solver.RiverSolver): no river decide
+        # resolvendo o subjogo; se estourar o tempo, usa a política rápida
+        self.river_solver = river_solver
+        # Ações desta mão como (street, ação, fichas), registradas pela mesa
+        # com observe_action; o river_solver estima os ranges por elas
+        self.own_actions = []
+        self.opponent_actions = []
+        # Estatísticas de cada oponente (opponent_model.OpponentModel), pelo
+        # nome; get_state e calculate_raise_size leem as do oponente atual
+        self.opponent_models = load_models(self.name) if self.is_machine and not self.frozen_policy else {}
+        self.current_opponent = ''
+
+        # Espaço de estados discreto (state_space.StateSpace): número fixo de
+        # estados; None mantém a chave antiga com os valores crus
+        self.state_space = state_space
+        self.state_visits = Counter()  # visitas por índice do estado
+        self.last_state_index = None  # índice do último get_state (replay_buffer)
+
         # Carrega Q-table existente se for uma máquina
-        if self.is_machine:
+        if self.frozen_policy:
+            from policy_snapshot import PolicyOverlay
+            self.q_table = PolicyOverlay(policy)
+        elif self.is_machine:
             self.q_table = self.load_q_table()
         else:
             self.q_table = {}
 
+        # Visitas e último uso de cada estado, para podar os mais frios
+        # quando a tabela passa do teto (q_table_pruning.QTableLimit)
+        if self.is_machine and not self.frozen_policy:
+            self.q_usage = load_usage(self.name)
+            # Estados que saíram da tabela (ex.: chaves antigas reagrupadas)
+            for state in [s for s in self.q_usage.visits if s not in self.q_table]:
+                self.q_usage.forget(state)
+        else:
+            self.q_usage = QTableUsage()
+        if self.frozen_policy:
+            # Só os estados que a mesa cria por cima do snapshot ocupam memória dela
+            from policy_snapshot import overlay_limit
+            self.q_limit = overlay_limit()
+        else:
+            self.q_limit = QTableLimit.from_env()
+
     def load_q_table(self) -> Dict:
         """Carrega a Q-table do arquivo."""
         try:
             with open("q_table.json", "r") as f:
                 q_tables = json.load(f)
-                return q_tables.get(self.name, {})
+                q_table = q_tables.get(self.name, {})
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
+        # Tabela gravada com as chaves antigas (valores crus): leva para os
+        # buckets do espaço de estados em vez de deixar as linhas sem uso
+        if self.state_space is not None and not all(map(self.state_space.is_key, q_table)):
+            q_table, _ = rebucket_q_table(q_table, self.state_space)
+        return q_table
 
     def save_q_table(self):
         """Salva a Q-table no arquivo."""
-        import os
-        q_table_path = os.path.join(os.getcwd(), "q_table.json")
+        if self.frozen_policy:
+            return
+        start = time.perf_counter()
+        with _q_table_file_lock:
+            self._merge_into_file(os.path.join(os.getcwd(), "q_table.json"), self.q_table)
+            self._merge_into_file(os.path.join(os.getcwd(), USAGE_FILE), self.q_usage.to_dict())
+            if self.opponent_models:
+                self._merge_into_file(os.path.join(os.getcwd(), MODEL_FILE),
+                                      {name: model.to_dict() for name, model in self.opponent_models.items() if name})
+        for listener in flush_listeners:
+            listener(time.perf_counter() - start)
+
+    def _merge_into_file(self, path: str, data):
+        """Grava ``data`` na entrada deste jogador de um arquivo JSON compartilhado."""
         try:
-            with open(q_table_path, "r") as f:
-                q_tables = json.load(f)
+            with open(path, "r") as f:
+                tables = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            q_tables = {}
-        
-        q_tables[self.name] = self.q_table
-        with open(q_table_path, "w") as f:
-            json.dump(q_tables, f, indent=4)
+            tables = {}
+
+        tables[self.name] = data
+        # Escreve em arquivo temporário e troca, para leitores nunca verem JSON pela metade
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(tables, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _enforce_q_limit(self, *keep: str):
+        """Poda os estados mais frios se a Q-table passou do teto."""
+        for state in self.q_limit.enforce(self.q_table, self.q_usage, keep):
+            if hasattr(self, 'eligibility_traces'):
+                self.eligibility_traces.pop(state, None)
+
+    @property
+    def opponent_model(self) -> OpponentModel:
+        """Modelo do oponente desta mão (o de ``start_hand`` ou o último que agiu)."""
+        model = self.opponent_models.get(self.current_opponent)
+        if model is None:
+            model = self.opponent_models[self.current_opponent] = OpponentModel()
+        return model
+
+    @property
+    def opponent_stats(self) -> Dict[str, float]:
+        return self.opponent_model.features()
+
+    def start_hand(self, opponent: Optional[str] = None):
+        """
+        Limpa a mão anterior (cartas, fold, aposta e ações); chamado pela mesa antes de distribuir.
+        ``opponent`` é o nome do oponente da mão: as ações próprias que vêm antes
+        da primeira ação dele já vão para o modelo certo.
+        """
+        if opponent is not None:
+            self.current_opponent = opponent
+        self.hand = []
+        self.folded = False
+        self.current_bet = 0
+        self.own_actions = []
+        self.opponent_actions = []
+        for model in self.opponent_models.values():
+            model.start_hand()
+
+    def end_hand(self, showdown: bool = False):
+        """Fecha a mão nos modelos dos oponentes; ``showdown`` se as cartas foram mostradas."""
+        for model in self.opponent_models.values():
+            model.end_hand(showdown)
+
+    def observe_action(self, community_cards: List[Card], action: str, amount: int, own: bool = False,
+                       actor: Optional[str] = None):
+        """Registra uma ação desta mão, do próprio jogador ou do oponente ``actor``."""
+        street = {0: 0, 3: 1, 4: 2}.get(len(community_cards), 3)
+        (self.own_actions if own else self.opponent_actions).append((street, action, amount))
+        if not own and actor is not None:
+            self.current_opponent = actor
+        self.opponent_model.observe(street, action, amount, own)
 
     def receive_card(self, card: Card):
         if card:
@@ -303,14 +429,16 @@ class Player:
         # Use position that was set by the game
         position = self.position if self.position else "unknown"
         
-        # Opponent modeling - track opponent's aggression frequency
-        if hasattr(self, 'opponent_stats'):
-            opp_aggression = self.opponent_stats.get('aggression_frequency', 0.5)
-        else:
-            self.opponent_stats = {'aggression_frequency': 0.5, 'fold_frequency': 0.5}
-            opp_aggression = 0.5
+        # Opponent modeling - aggression frequency from the streaming model
+        opp_aggression = self.opponent_model.aggression_frequency
             
         # Combine all factors into state representation
+        if self.state_space is not None:
+            index, state = self.state_space.encode(phase, board_texture, position, hand_strength,
+                                                   chips_ratio, bet_ratio, opp_aggression)
+            self.state_visits[index] += 1
+            self.last_state_index = index
+            return state
         state = (f"{phase}_{board_texture}_{position}_"
                 f"{hand_strength:.2f}_{chips_ratio:.2f}_"
                 f"{bet_ratio:.2f}_{pot_odds:.2f}_"
@@ -358,9 +486,12 @@ class Player:
         """
         if state not in self.q_table:
             self.q_table[state] = {'fold': 0, 'call': 0, 'raise': 0}
+            self.q_usage.touch(state)
         
         if next_state not in self.q_table:
             self.q_table[next_state] = {'fold': 0, 'call': 0, 'raise': 0}
+            self.q_usage.touch(next_state)
+        self._enforce_q_limit(state, next_state)
         
         # Initialize game sequence if not exists
         if not hasattr(self, 'game_sequence'):
@@ -540,6 +671,18 @@ class Player:
             # Pode fazer raises maiores (pressure)
             stack_multiplier = 1.15
 
+        # === 5b. AJUSTES PELO OPONENTE ===
+
+        opponent_multiplier = 1.0
+        street = {0: 0, 3: 1, 4: 2}.get(len(community_cards), 3)
+        fold_to_bet = self.opponent_model.fold_to_bet(street)
+        if hand_strength < 0.4 and fold_to_bet > 0.6:
+            # Oponente larga muito: um bluff menor já basta
+            opponent_multiplier = 0.85
+        elif hand_strength >= 0.6 and fold_to_bet < 0.25:
+            # Oponente quase nunca larga: value bet maior
+            opponent_multiplier = 1.15
+
         # === 6. CONSIDERAÇÃO DE APOSTA EXISTENTE ===
 
         # Se já houver uma aposta alta no board, ajusta accordingly
@@ -559,7 +702,8 @@ class Player:
         # === 7. CÁLCULO FINAL ===
 
         # Aplica todos os multiplicadores
-        final_multiplier = base_multiplier * phase_multiplier * texture_multiplier * position_multiplier * stack_multiplier
+        final_multiplier = (base_multiplier * phase_multiplier * texture_multiplier * position_multiplier
+                            * stack_multiplier * opponent_multiplier)
 
         # Calcula raise em relação ao pot
         pot_based_raise = int(effective_pot * final_multiplier)
@@ -610,80 +754,224 @@ class Player:
         return raise_size
 
     def make_decision(self, community_cards: List[Card], current_bet: int, min_raise: int, pot_size: int = 0) -> Tuple[str, int]:
+            """
+            Escolhe a ação da máquina: "fold", "call" (valor a pagar) ou "raise"
+            (valor do aumento). Não mexe nas fichas; quem chama aplica a ação.
+            """
+            if self.is_machine and self.river_solver is not None and len(community_cards) == 5:
+                decision = self.river_solver.decide(self, community_cards, current_bet, min_raise, pot_size)
+                if decision is not None:
+                    return decision
+
+            if self.is_machine and self.compiled_policy is not None:
+                return self.compiled_policy.decide(self, community_cards, current_bet, min_raise, pot_size)
+
             if self.is_machine:
                 state = self.get_state(community_cards, current_bet)
-                
+
+                # Initialize Q-table for new states
                 if state not in self.q_table:
-                    # More balanced initial Q-values with randomization
                     hand_strength = self.evaluate_hand_strength(community_cards)
-                    position_factor = 1.1 if "late" in state else 0.9  # Reduced position impact
+                    position_factor = 1.1 if "late" in state else 0.9
                     texture_factor = 1.1 if "wet" in state or "very_wet" in state else 1.0
-                    
-                    # Add small random variation to prevent identical initial values
+
                     random_factor = lambda: random.uniform(-0.05, 0.05)
-                    
-                    # More conservative base values
+
                     fold_base = -0.1 - (hand_strength * 0.2) + random_factor()
                     call_base = 0.0 + (hand_strength * 0.3) * position_factor + random_factor()
                     raise_base = -0.05 + (hand_strength * 0.4) * position_factor * texture_factor + random_factor()
-                    
-                    # More balanced preflop adjustments
+
                     if len(community_cards) == 0:
-                        if hand_strength > 0.7:  # Premium hands
+                        if hand_strength > 0.7:
                             fold_base -= 0.1
                             raise_base += 0.2
-                        elif hand_strength > 0.5:  # Playable hands
+                        elif hand_strength > 0.5:
                             call_base += 0.1
-                    
+
                     self.q_table[state] = {
                         'fold': fold_base,
                         'call': call_base,
                         'raise': raise_base
                     }
-                
-                # Simplified decision making for human games
-                if not hasattr(self, 'last_action'):
-                    hand_strength = self.evaluate_hand_strength(community_cards)
-                    
-                    # Base decision on hand strength
-                    if hand_strength > 0.8:  # Very strong hand
-                        action = 'raise'
-                    elif hand_strength > 0.5:  # Decent hand
-                        action = 'call'
-                    else:  # Weak hand
-                        action = 'fold' if current_bet > self.chips * 0.1 else 'call'
+                self.q_usage.touch(state)
+                self._enforce_q_limit(state)
+
+                # ===== ESTRATÉGIA MELHORADA =====
+                hand_strength = self.evaluate_hand_strength(community_cards)
+
+                # Calcular pot odds e implied odds
+                if not pot_size:
+                    pot_size = current_bet * 2  # Aproximação do pote atual
+                bet_to_call = current_bet
+
+                # Evitar divisão por zero
+                if bet_to_call == 0:
+                    pot_odds = 0
                 else:
-                    # Don't make consecutive raises
-                    action = 'call' if self.last_action == 'raise' else 'call'
-                
-                # Store last action
-                self.last_action = action
-                
-                # Store state and action for Q-value update
+                    pot_odds = pot_size / (pot_size + bet_to_call) if (pot_size + bet_to_call) > 0 else 0
+
+                # Fator de risco baseado no tamanho da aposta
+                bet_size_ratio = bet_to_call / self.chips if self.chips > 0 else 1
+
+                # Inicializar tracking de ações se necessário
+                if not hasattr(self, 'action_history'):
+                    self.action_history = []
+                if not hasattr(self, 'consecutive_raises'):
+                    self.consecutive_raises = 0
+
+                # Usar Q-table com epsilon-greedy (exploração vs exploitação)
+                epsilon = max(0.1, 0.3 - (self.game_sequence.get('hands_played', 0) * 0.01))
+
+                if random.random() < epsilon:
+                    # Exploração: decisão aleatória ponderada pela força da mão
+                    weights = {
+                        'fold': max(0.1, 1.0 - hand_strength),
+                        'call': max(0.2, hand_strength * 0.8),
+                        'raise': max(0.1, hand_strength * 1.2)
+                    }
+                    total_weight = sum(weights.values())
+                    normalized_weights = {k: v/total_weight for k, v in weights.items()}
+
+                    actions = list(normalized_weights.keys())
+                    probabilities = list(normalized_weights.values())
+                    action = random.choices(actions, weights=probabilities)[0]
+                else:
+                    # Exploitação: usar Q-table
+                    q_values = self.q_table[state]
+                    action = max(q_values, key=q_values.get)
+
+                # ===== AJUSTES ESTRATÉGICOS BASEADOS EM CONTEXTO =====
+
+                # REGRA ESPECIAL: Apostas all-in ou quase (>70%) requerem mãos feitas muito fortes
+                if bet_size_ratio > 0.7:
+                    # Verificar se tem mão feita forte (não apenas draw)
+                    hand_type, hand_value = self.get_hand_value(community_cards)
+                    made_hands = ["Flush", "Full House", "Quadra", "Straight Flush", "Royal Flush"]
+                    strong_pairs = ["Trinca", "Dois Pares"]
+
+                    if hand_type not in made_hands and hand_type not in strong_pairs:
+                        # Não pagar aposta gigante com apenas draws ou pares fracos
+                        action = 'fold'
+
+                # 1. FOLD: Desistir com mãos fracas ou apostas muito altas
+                if action == 'fold':
+                    # Sempre fazer fold com mãos muito fracas e apostas significativas
+                    if hand_strength < 0.3 and bet_size_ratio > 0.15:
+                        pass  # Manter fold
+                    # Considerar pot odds para draws
+                    elif hand_strength >= 0.4 and pot_odds > 0.3:
+                        action = 'call'  # Pot odds favoráveis, vale a pena ver
+                    # Não fazer fold com mãos boas
+                    elif hand_strength > 0.6:
+                        action = 'call'  # Mão boa demais para desistir
+
+                # 2. CALL: Pagar apostas
+                elif action == 'call':
+                    # Apostas gigantes (>70% do stack) - apenas para nuts
+                    if bet_size_ratio > 0.7:
+                        if hand_strength < 0.85:
+                            action = 'fold'  # Só continuar com as melhores mãos
+                    # Apostas muito altas (>50% do stack) requerem mãos muito fortes
+                    elif bet_size_ratio > 0.5 and hand_strength < 0.7:
+                        # 80% de chance de fold com aposta gigante e mão não premium
+                        if random.random() < 0.8:
+                            action = 'fold'
+                    # Com mãos muito fortes, considerar raise em vez de call
+                    elif hand_strength > 0.75 and bet_size_ratio < 0.3:
+                        # 40% de chance de raise com mão forte
+                        if random.random() < 0.4:
+                            action = 'raise'
+                    # Com mãos médias e apostas altas, considerar fold
+                    elif hand_strength < 0.4 and bet_size_ratio > 0.25:
+                        # 60% de chance de fold com mão fraca e aposta alta
+                        if random.random() < 0.6:
+                            action = 'fold'
+                    # Semi-blefe com draws
+                    elif 0.5 < hand_strength < 0.7 and len(community_cards) >= 3 and bet_size_ratio < 0.3:
+                        # 25% de chance de raise com draw (apenas se aposta não for muito alta)
+                        if random.random() < 0.25:
+                            action = 'raise'
+
+                # 3. RAISE: Aumentar aposta
+                elif action == 'raise':
+                    # Evitar raises consecutivos excessivos
+                    if self.consecutive_raises >= 2:
+                        action = 'call'  # Não ser muito agressivo
+                    # Com mãos fracas, ocasionalmente blefar
+                    elif hand_strength < 0.35 and bet_size_ratio < 0.15:
+                        # 70% de chance de recuar do raise se mão muito fraca
+                        if random.random() < 0.7:
+                            action = 'fold' if bet_to_call > 0 else 'call'
+                    # Limitar raises com stack baixo
+                    elif self.chips < 200 and bet_size_ratio > 0.4:
+                        action = 'call'  # Preservar fichas
+
+                # ===== ESTRATÉGIA PRÉ-FLOP ESPECÍFICA =====
+                if len(community_cards) == 0:
+                    preflop_strength = self.evaluate_preflop_hand()
+
+                    # Mãos premium (AA, KK, QQ, AK): jogar agressivo
+                    if preflop_strength > 0.75:
+                        if action == 'call' and random.random() < 0.6:
+                            action = 'raise'
+                    # Mãos especulativas (pares baixos, suited connectors)
+                    elif 0.4 < preflop_strength < 0.6:
+                        if action == 'raise':
+                            action = 'call'  # Ser mais conservador
+                        if bet_size_ratio > 0.2:
+                            action = 'fold'  # Não pagar muito por mãos especulativas
+                    # Lixo (7-2, 8-3, etc)
+                    elif preflop_strength < 0.3:
+                        if bet_to_call > min_raise:
+                            action = 'fold'  # Descartar lixo
+
+                # ===== ESTRATÉGIA PÓS-FLOP =====
+                if len(community_cards) >= 3:
+                    # Com monstros (full house+), slow play ocasionalmente
+                    if hand_strength > 0.85 and random.random() < 0.3:
+                        if action == 'raise':
+                            action = 'call'  # Slow play para extrair valor
+
+                    # No river, ser mais cauteloso
+                    if len(community_cards) == 5:
+                        # Não blefar tanto no river
+                        if hand_strength < 0.4 and action == 'raise':
+                            action = 'fold' if bet_to_call > 0 else 'call'
+
+                # Atualizar histórico de ações
+                self.action_history.append(action)
+                if action == 'raise':
+                    self.consecutive_raises += 1
+                else:
+                    self.consecutive_raises = 0
+
+                # Limitar histórico a últimas 10 ações
+                if len(self.action_history) > 10:
+                    self.action_history.pop(0)
+
+                # Store state and action for Q-learning
                 self.last_state = state
                 self.last_action = action
-                
+
+                # ===== EXECUTAR AÇÃO =====
                 if action == "fold":
                     self.folded = True
                     return "fold", 0
+
                 elif action == "raise":
-                    # Usa estratégia de raise variável inteligente
+                    # Usa estratégia de raise variável inteligente (pote, fase, mesa, posição, stack)
                     raise_amount = self.calculate_raise_size(community_cards, current_bet, min_raise, pot_size)
 
                     # Garante que não excede fichas disponíveis
                     raise_amount = min(raise_amount, self.chips)
 
-                    # Deduz fichas e retorna
-                    self.chips -= raise_amount
                     return "raise", raise_amount
+
                 else:  # call
                     bet_amount = min(current_bet, self.chips)
-                    if bet_amount >= self.chips:
-                        bet_amount = self.chips
-                    self.chips -= bet_amount
-                    
-                    # Save Q-table after significant actions
-                    if self.is_machine:
+
+                    # Save Q-table periodically
+                    if self.is_machine and random.random() < 0.1:
                         self.save_q_table()
-                    
+
                     return "call", bet_amount
@@ -2,9 +2,18 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
+import queue
 import random
-from poker_app import Card, Deck, Player, PokerGame, HistoryManager, RankingManager
+import threading
+from card import Card
+from deck import Deck
+from player import Player
+from poker_game import PokerGame
+from history_manager import HistoryManager
+from ranking_manager import RankingManager
 from card_graphics import CardGraphics
+from gui_events import EventBus, MESSAGE, CHIP_STATE, PHASE, HAND_RESULT, echo_from_env
+from gui_view import ViewDiff, FrameTimer
 
 class PokerGUI:
     def __init__(self, root):
@@ -111,8 +120,22 @@ class PokerGUI:
         self.target_chips = 5000  # Win condition
         self.starting_chips = 1000
         
-        # Store game messages
-        self.message_history = []
+        # Game log: bounded ring buffer, UI handlers coalesced once per Tk idle cycle
+        self.events = EventBus(echo=echo_from_env(), schedule=self.root.after_idle)
+        self.events.subscribe(CHIP_STATE, lambda event: self.update_chip_displays())
+        self.events.subscribe(PHASE, self.on_phase_event)
+        self.events.subscribe(HAND_RESULT, self.on_hand_result_event)
+
+        # Card and chip widgets are only reconfigured when what they show changes
+        self.view = ViewDiff()
+        self.frame_timer = FrameTimer()
+
+        # Machine decisions run on a worker thread; results come back via this queue
+        self.machine_results = queue.Queue()
+        self.machine_thinking = False
+        self.machine_poll_ms = 50
+        self.hand_id = 0
+        self._locked_button_states = None
         
         # Start a new game session
         self.start_new_session()
@@ -613,6 +636,17 @@ class PokerGUI:
             cursor='hand2'
         )
         self.fold_button.pack()
+
+        # "Thinking" indicator shown while the machine decides on a worker thread
+        self.thinking_label = tk.Label(
+            self.button_container,
+            text="",
+            font=('Segoe UI', 11, 'bold'),
+            fg=self.colors['accent_gold'],
+            bg=self.colors['bg_dark'],
+            width=18
+        )
+        self.thinking_label.pack(side='left', padx=10)
         
         # Hand progress indicators with modern timeline
         self.progress_frame = tk.Frame(
@@ -712,16 +746,9 @@ class PokerGUI:
         self.disable_buttons()
         self.new_hand_button.config(state='disabled')
 
-    def log_message(self, message):
-        """Add a message to the game log"""
-        # Store message in history
-        self.message_history.append(message)
-
-        # Print to console for debugging
-        print(message)
-
-        # Update hand stats if needed
-        self.update_game_info(message)
+    def log_message(self, message, kind=MESSAGE, **data):
+        """Add a message to the game log (echoed to the console if POKER_GUI_ECHO=1)"""
+        self.events.publish(kind, message, **data)
         
     def log_chip_state(self, action):
         """Log the current state of all chips"""
@@ -741,58 +768,43 @@ class PokerGUI:
             message += f"\nEncontrado: {total} chips"
             message += f"\nDiferença: {difference:+d} chips"
 
-        self.log_message(message)
-
-        # Update chip displays
-        self.update_chip_displays()
+        # Chip displays are refreshed once per idle cycle by the CHIP_STATE handler
+        self.log_message(message, CHIP_STATE)
         
     def update_chip_displays(self):
         """Update all chip displays in the UI with modern styling"""
-        self.player_chips_display.config(text=f"💎 {self.player.chips}")
-        self.machine_chips_display.config(text=f"💎 {self.machine.chips}")
+        self.view.apply(self.player_chips_display, text=f"💎 {self.player.chips}")
+        self.view.apply(self.machine_chips_display, text=f"💎 {self.machine.chips}")
 
         # Calculate total chips in play
         if self.game is not None:
             total = self.player.chips + self.machine.chips + self.game.pot
-            self.pot_display.config(text=f"{self.game.pot}")
-            self.current_bet_display.config(text=f"{self.current_bet}")
+            self.view.apply(self.pot_display, text=f"{self.game.pot}")
+            self.view.apply(self.current_bet_display, text=f"{self.current_bet}")
         else:
             total = self.player.chips + self.machine.chips
-            self.pot_display.config(text="0")
-            self.current_bet_display.config(text="0")
+            self.view.apply(self.pot_display, text="0")
+            self.view.apply(self.current_bet_display, text="0")
 
         # Update total display and change color if there's an error
         expected_total = self.starting_chips * 2
-        self.total_chips_display.config(text=f"{total}")
-
-        if total != expected_total:
-            # Red for error
-            self.total_chips_display.config(fg=self.colors['accent_red'])
-            self.total_chips_border.config(bg=self.colors['accent_red'])
-        else:
-            # Green for correct
-            self.total_chips_display.config(fg=self.colors['accent_green'])
-            self.total_chips_border.config(bg=self.colors['accent_green'])
+        # Red for error, green for correct
+        color = self.colors['accent_red'] if total != expected_total else self.colors['accent_green']
+        self.view.apply(self.total_chips_display, text=f"{total}", fg=color)
+        self.view.apply(self.total_chips_border, bg=color)
         
-    def update_game_info(self, message):
-        """Update game state indicators based on log messages"""
-        # Update hand type displays
-        if "Jogador 1 tem " in message and "\n" in message:
-            hand_type = message.split("Jogador 1 tem ")[1].split("\n")[0]
-            self.hand_type_display.config(text=hand_type)
-            
-        # Update game progress
-        if "=== Flop ===" in message:
-            self.update_progress_indicators(1)  # Flop
-        elif "=== Turn ===" in message:
-            self.update_progress_indicators(2)  # Turn
-        elif "=== River ===" in message:
-            self.update_progress_indicators(3)  # River
-        elif "🏆" in message and "vence" in message:
-            self.update_progress_indicators(4)  # Showdown
-        elif "=== Nova Mão ===" in message:
-            self.update_progress_indicators(0)  # Pre-flop
+    def on_phase_event(self, event):
+        """Update progress indicators when a new betting round starts"""
+        stage = event.data['stage']  # 0 pre-flop, 1 flop, 2 turn, 3 river
+        self.update_progress_indicators(stage)
+        if stage == 0:
             self.hand_type_display.config(text="-")
+
+    def on_hand_result_event(self, event):
+        """Show the player's hand type and mark the showdown stage"""
+        if event.data.get('player_hand'):
+            self.hand_type_display.config(text=event.data['player_hand'])
+        self.update_progress_indicators(4)  # Showdown
             
     def update_progress_indicators(self, stage_index):
         """Update the hand progress indicators with modern styling"""
@@ -833,46 +845,28 @@ class PokerGUI:
             self.phase_label.config(fg=fg_color)
 
     def update_display(self):
-        """Update all card displays"""
-        # Update community cards
-        for i, label in enumerate(self.community_card_labels):
-            if i < len(self.game.community_cards):
-                card = self.game.community_cards[i]
-                image = self.card_graphics.get_card_image(card.rank, card.suit)
-                label.configure(image=image)
-                label._image = image  # Keep a reference
-            else:
-                label.configure(image='')
-                label._image = None
-        
-        # Update opponent cards (legacy, hidden frame)
-        for i, label in enumerate(self.opponent_card_labels):
-            if i < len(self.machine.hand):
-                if (self.game and len(self.game.community_cards) == 5 and 
-                    self.betting_round_complete and not any(p.folded for p in self.game.players)):
-                    card = self.machine.hand[i]
-                    image = self.card_graphics.get_card_image(card.rank, card.suit)
-                else:
-                    image = self.card_back
-                label.configure(image=image)
-                label._image = image
-            else:
-                label.configure(image='')
-                label._image = None
-        
-        # Update player cards (legacy, hidden frame)
-        for i, label in enumerate(self.player_card_labels):
-            if i < len(self.player.hand):
-                card = self.player.hand[i]
-                image = self.card_graphics.get_card_image(card.rank, card.suit)
-                label.configure(image=image)
-                label._image = image
-            else:
-                label.configure(image='')
-                label._image = None
-
-        # Update chip displays
-        self.update_chip_displays()
+        """Update all card displays, touching only the labels whose card changed"""
+        with self.frame_timer.frame():
+            show_machine_cards = (self.game and len(self.game.community_cards) == 5 and
+                                  self.betting_round_complete and not any(p.folded for p in self.game.players))
+
+            # Community cards, then opponent and player cards (legacy, hidden frames)
+            cells = [(self.community_card_labels, self.game.community_cards, True),
+                     (self.opponent_card_labels, self.machine.hand, show_machine_cards),
+                     (self.player_card_labels, self.player.hand, True)]
+            for labels, cards, face_up in cells:
+                for i, label in enumerate(labels):
+                    if i >= len(cards):
+                        image = ''
+                    elif face_up:
+                        image = self.card_graphics.get_card_image(cards[i].rank, cards[i].suit)
+                    else:
+                        image = self.card_back
+                    if self.view.apply(label, image=image):
+                        label._image = image or None  # Keep a reference
+
+            # Update chip displays
+            self.update_chip_displays()
 
     def start_new_session(self):
         """Start a new poker session"""
@@ -910,7 +904,7 @@ class PokerGUI:
             }
         
         # Clear log and history
-        self.message_history.clear()
+        self.events.clear()
 
         # Reset hand stats and progress
         self.hand_type_display.config(text="-")
@@ -934,11 +928,10 @@ class PokerGUI:
 
     def new_hand(self):
         """Start a new hand within the current session"""
-        # Reset hand states
-        self.player.hand = []
-        self.player.folded = False
-        self.machine.hand = []
-        self.machine.folded = False
+        self.hand_id += 1
+        # Reset hand states; the machine also opens the hand in its opponent model
+        self.player.start_hand(opponent=self.machine.name)
+        self.machine.start_hand(opponent=self.player.name)
         self.betting_round_complete = False  # Reset betting round flag
         
         # Hide winner frame if visible
@@ -949,7 +942,7 @@ class PokerGUI:
         self.update_progress_indicators(0)
         
         # Log hand start
-        self.log_message("\n=== Nova Mão ===")
+        self.log_message("\n=== Nova Mão ===", PHASE, stage=0)
         self.log_message(f"Jogador 1: {self.player.chips} chips")
         self.log_message(f"Máquina: {self.machine.chips} chips")
         
@@ -1010,6 +1003,8 @@ class PokerGUI:
         
         # Calculate call amount
         additional_bet = self.machine_bet_in_round - self.player_bet_in_round
+        self.machine.observe_action(self.game.community_cards, 'call',
+                                    min(max(additional_bet, 0), self.player.chips), actor=self.player.name)
         
         if additional_bet > 0:
             # Call (match the current bet)
@@ -1036,9 +1031,11 @@ class PokerGUI:
         self.update_chip_displays()
         self.update_display()
         
-        # Machine's turn
-        self.machine_action()
-        
+        # Machine's turn (continues in after_machine_action)
+        self.machine_action(self.after_machine_action)
+
+    def after_machine_action(self):
+        """Finish the betting round once the machine has acted"""
         # Check if machine folded
         if self.machine.folded:
             self.end_hand("Jogador 1")
@@ -1074,6 +1071,7 @@ class PokerGUI:
 
         if total_amount <= self.player.chips:
             # Standard raise
+            self.machine.observe_action(self.game.community_cards, 'raise', total_amount, actor=self.player.name)
             self.player.chips -= total_amount
             self.game.pot += total_amount
             self.player_bet_in_round += total_amount
@@ -1087,21 +1085,12 @@ class PokerGUI:
             self.update_display()
             
             # Machine's turn
-            self.machine_action()
-            
-            # Check if machine folded
-            if self.machine.folded:
-                self.end_hand("Jogador 1")
-                return
-            
-            # Betting round complete after both players have acted
-            self.betting_round_complete = True
-            self.update_display()
-            self.check_game_state()
+            self.machine_action(self.after_machine_action)
         elif self.player.chips > call_amount:
             # Not enough for full raise, but can do a smaller raise
             available_raise = self.player.chips - call_amount
             total_amount = call_amount + available_raise
+            self.machine.observe_action(self.game.community_cards, 'raise', total_amount, actor=self.player.name)
             
             self.player.chips = 0  # All-in
             self.game.pot += total_amount
@@ -1113,15 +1102,7 @@ class PokerGUI:
             
             # Update UI and continue game
             self.update_display()
-            self.machine_action()
-            
-            if self.machine.folded:
-                self.end_hand("Jogador 1")
-                return
-                
-            self.betting_round_complete = True
-            self.update_display()
-            self.check_game_state()
+            self.machine_action(self.after_machine_action)
         else:
             # Not enough chips even for the call - must go all-in with call
             self.log_message("⚠️ Chips insuficientes para raise! Use Call para all-in.")
@@ -1340,21 +1321,88 @@ class PokerGUI:
 
     def fold_action(self):
         """Player chooses to fold"""
+        self.machine.observe_action(self.game.community_cards, 'fold', 0, actor=self.player.name)
         self.player.folded = True
         self.log_message("Jogador: Fold")
         self.end_hand("Máquina")
         self.disable_buttons()
         self.new_hand_button.config(state='normal')
 
-    def machine_action(self):
-        """Handle machine's betting action"""
+    def machine_action(self, on_done=None):
+        """
+        Start the machine's betting action.
+
+        make_decision (which may rewrite q_table.json) runs on a worker thread
+        so the window keeps responding; inputs stay locked until the result is
+        applied on the Tk thread and ``on_done`` runs.
+        """
         # Log state before action
         self.log_message(f"\nAntes da ação da Máquina:")
         self.log_chip_state("Estado Inicial")
 
-        # Get machine's decision
-        action, amount = self.machine.make_decision(self.game.community_cards, self.current_bet, self.game.min_raise)
+        self.machine_thinking = True
+        self.lock_inputs()
+        self.thinking_label.config(text="🤖 Máquina pensando")
+
+        # Snapshot the arguments; the Tk thread does not touch the game meanwhile
+        community_cards = list(self.game.community_cards)
+        current_bet = self.current_bet
+        min_raise = self.game.min_raise
+        hand_id = self.hand_id
+
+        def decide():
+            try:
+                result = self.machine.make_decision(community_cards, current_bet, min_raise)
+            except Exception as e:
+                result = e
+            self.machine_results.put((hand_id, result))
+
+        threading.Thread(target=decide, name="machine-decision", daemon=True).start()
+        self.root.after(self.machine_poll_ms, self._poll_machine_result, on_done, 0)
 
+    def _poll_machine_result(self, on_done, ticks):
+        """Check the result queue from the Tk event loop"""
+        try:
+            hand_id, result = self.machine_results.get_nowait()
+        except queue.Empty:
+            dots = "." * (ticks // 6 % 4)
+            self.thinking_label.config(text=f"🤖 Máquina pensando{dots}")
+            self.root.after(self.machine_poll_ms, self._poll_machine_result, on_done, ticks + 1)
+            return
+
+        self.machine_thinking = False
+        self.thinking_label.config(text="")
+        self.unlock_inputs()
+
+        if hand_id != self.hand_id:
+            return  # Stale result from a hand that no longer exists
+
+        if isinstance(result, Exception):
+            self.log_message(f"⚠️ Erro na decisão da máquina: {result}")
+            result = ("call", 0)
+
+        self.apply_machine_decision(*result)
+        if on_done is not None:
+            on_done()
+
+    def lock_inputs(self):
+        """Disable every control that could change the game while the machine thinks"""
+        buttons = [self.call_button, self.raise_button, self.fold_button,
+                   self.new_hand_button, self.new_session_button]
+        self._locked_button_states = [(b, str(b.cget('state')) or 'normal') for b in buttons]
+        for button in buttons:
+            button.config(state='disabled')
+
+    def unlock_inputs(self):
+        """Restore the controls locked by lock_inputs"""
+        if self._locked_button_states is None:
+            return
+        for button, state in self._locked_button_states:
+            button.config(state=state)
+        self._locked_button_states = None
+
+    def apply_machine_decision(self, action, amount):
+        """Apply the machine's decision to the chips and pot"""
         if action == "fold":
             # Machine folds
             self.machine.folded = True
@@ -1369,6 +1417,7 @@ class PokerGUI:
 
             if total_amount <= self.machine.chips:
                 # Standard raise
+                self.machine.observe_action(self.game.community_cards, 'raise', total_amount, own=True)
                 self.machine.chips -= total_amount
                 self.game.pot += total_amount
                 self.machine_bet_in_round += total_amount
@@ -1380,6 +1429,7 @@ class PokerGUI:
             else:
                 # All-in raise
                 all_in_amount = self.machine.chips
+                self.machine.observe_action(self.game.community_cards, 'raise', all_in_amount, own=True)
                 self.machine.chips = 0
                 self.game.pot += all_in_amount
                 self.machine_bet_in_round += all_in_amount
@@ -1391,6 +1441,8 @@ class PokerGUI:
         else:  # call/check
             # Calculate call amount
             call_amount = self.player_bet_in_round - self.machine_bet_in_round
+            self.machine.observe_action(self.game.community_cards, 'call',
+                                        min(max(call_amount, 0), self.machine.chips), own=True)
 
             if call_amount > 0:
                 if call_amount <= self.machine.chips:
@@ -1435,7 +1487,7 @@ class PokerGUI:
             self.log_chip_state("Estado antes do Flop")
             
             self.game.deal_community_cards(3)  # Deal 3 cards for the flop
-            self.log_message("\n=== Flop ===")
+            self.log_message("\n=== Flop ===", PHASE, stage=1)
             
             # Reset bets for new round
             self.current_bet = 0
@@ -1451,7 +1503,7 @@ class PokerGUI:
             self.log_chip_state("Estado antes do Turn")
             
             self.game.deal_community_cards(1)  # Deal 1 card for the turn
-            self.log_message("\n=== Turn ===")
+            self.log_message("\n=== Turn ===", PHASE, stage=2)
             
             # Reset bets for new round
             self.current_bet = 0
@@ -1467,7 +1519,7 @@ class PokerGUI:
             self.log_chip_state("Estado antes do River")
             
             self.game.deal_community_cards(1)  # Deal 1 card for the river
-            self.log_message("\n=== River ===")
+            self.log_message("\n=== River ===", PHASE, stage=3)
             
             # Reset bets for new round
             self.current_bet = 0
@@ -1486,6 +1538,9 @@ class PokerGUI:
 
     def end_hand(self, winner_by_fold=None):
         """End the current hand and update session stats"""
+        # Close the hand in the machine's opponent model (showdown only if nobody folded)
+        self.machine.end_hand(showdown=not winner_by_fold)
+
         # Determine the winner
         if winner_by_fold:
             winner_name = winner_by_fold
@@ -1511,7 +1566,7 @@ class PokerGUI:
                 winner_hand_type = player_type  # Ambos têm a mesma mão
                 result += f"🤝 EMPATE! Pote dividido!"
 
-            self.log_message(result)
+            self.log_message(result, HAND_RESULT, winner=winner_name, player_hand=player_type)
         
         # Show winner banner
         if self.winner_frame is not None:
@@ -1523,7 +1578,7 @@ class PokerGUI:
                         text=f"🏆 {winner_name} VENCE POR DESISTÊNCIA! 🏆",
                         fg="#FFD700" if winner_name == "Jogador 1" else "#FF6347"
                     )
-                    self.log_message(f"\n🏆 {winner_name} vence por desistência!")
+                    self.log_message(f"\n🏆 {winner_name} vence por desistência!", HAND_RESULT, winner=winner_name)
                 elif winner_name == "Empate":
                     self.winner_label.config(
                         text=f"🤝 EMPATE COM {winner_hand_type} - POTE DIVIDIDO! 🤝",
@@ -1891,6 +1946,17 @@ DICAS PARA INICIANTES:
             scrollbar.pack(side="right", fill="y")
             canvas.pack(side="left", fill="both", expand=True)
 
+        # Interface tab: display refresh cost
+        ui_frame = ttk.Frame(notebook)
+        notebook.add(ui_frame, text='Interface')
+        frames = self.frame_timer.summary()
+        ttk.Label(ui_frame, text="Atualização da Tela", font=('Arial', 12, 'bold')).pack(pady=5)
+        ttk.Label(ui_frame, text=f"Atualizações: {frames['frames']}").pack(anchor='w', padx=10)
+        ttk.Label(ui_frame, text=f"Tempo médio: {frames['avg_ms']:.2f} ms").pack(anchor='w', padx=10)
+        ttk.Label(ui_frame, text=f"Tempo máximo: {frames['max_ms']:.2f} ms").pack(anchor='w', padx=10)
+        ttk.Label(ui_frame, text=f"Widgets reconfigurados: {self.view.applied}").pack(anchor='w', padx=10)
+        ttk.Label(ui_frame, text=f"Widgets sem mudança: {self.view.skipped}").pack(anchor='w', padx=10)
+
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
         if event.num == 5 or event.delta < 0:
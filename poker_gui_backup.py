@@ -3,7 +3,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import random
-from poker_app import Card, Deck, Player, PokerGame, HistoryManager, RankingManager
+from card import Card
+from deck import Deck
+from player import Player
+from poker_game import PokerGame
+from history_manager import HistoryManager
+from ranking_manager import RankingManager
 from card_graphics import CardGraphics
 
 class PokerGUI:
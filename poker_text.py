@@ -7,7 +7,12 @@ Esta versão funciona diretamente no terminal, sem precisar de um servidor X.
 import random
 import time
 import os
-from poker_app import Card, Deck, Player, PokerGame, HistoryManager, RankingManager
+from card import Card
+from deck import Deck
+from player import Player
+from poker_game import PokerGame
+from history_manager import HistoryManager
+from ranking_manager import RankingManager
 
 # Cores ANSI para o terminal
 class Colors:
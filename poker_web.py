@@ -4,34 +4,182 @@ Flask Web Server for Texas Hold'em Poker
 Provides REST API for game state and actions
 """
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, request, send_from_directory
 from flask_cors import CORS
 import os
 import json
-from poker_app import Card, Player, PokerGame
+import mimetypes
+import threading
+import time
+import player as player_module
+from card import Card
+from player import Player
+from poker_game import PokerGame
+from ai_worker_pool import DecisionWorkerPool, PoolSaturatedError
+from build_assets import MANIFEST_NAME
+from policy_snapshot import PolicyOverlay, table_sizes
+from web_metrics import CONTENT_TYPE, Counter, Gauge, Histogram, Registry, resident_memory_bytes
 
 app = Flask(__name__, static_folder='static')
 CORS(app)  # Enable CORS for API access
 
+# AI decisions run on a bounded pool so requests never wait on make_decision
+AI_WORKERS = int(os.environ.get('POKER_AI_WORKERS', 4))
+AI_MAX_PENDING = int(os.environ.get('POKER_AI_MAX_PENDING', 256))
+# Seconds a decision may wait in its table's queue before the machine just
+# checks/calls; a decision that already started is not interrupted.
+# POKER_AI_DEADLINE is the old name of the variable.
+AI_MAX_QUEUE_WAIT = float(os.environ.get('POKER_AI_MAX_QUEUE_WAIT',
+                                         os.environ.get('POKER_AI_DEADLINE', 2.0)))
+MAX_TABLES = int(os.environ.get('POKER_MAX_TABLES', 1000))
+# Tables untouched this long are dropped when the limit is reached
+TABLE_IDLE_SECONDS = float(os.environ.get('POKER_TABLE_IDLE_SECONDS', 1800))
+
+decision_pool = DecisionWorkerPool(max_workers=AI_WORKERS,
+                                   max_pending=AI_MAX_PENDING,
+                                   max_queue_wait=AI_MAX_QUEUE_WAIT)
+
+# Optional frozen policy shared by every table and worker process via mmap.
+# Republishing the file (policy_snapshot.py) hot-reloads it.
+POLICY_SNAPSHOT = os.environ.get('POKER_POLICY_SNAPSHOT')
+shared_policy = None
+if POLICY_SNAPSHOT:
+    from policy_snapshot import SharedPolicy
+    shared_policy = SharedPolicy(POLICY_SNAPSHOT)
+
+# Optional compiled action table (policy_table.py): machines decide by lookup,
+# or a solved heads-up strategy (cfr_solver.py) used the same way. Both fill
+# the machine's compiled_policy slot, so only one may be set.
+COMPILED_POLICY = os.environ.get('POKER_COMPILED_POLICY')
+CFR_POLICY = os.environ.get('POKER_CFR_POLICY')
+if CFR_POLICY and COMPILED_POLICY:
+    raise ValueError("POKER_CFR_POLICY and POKER_COMPILED_POLICY are both set; choose one")
+compiled_policy = None
+if COMPILED_POLICY:
+    from policy_table import CompiledPolicy
+    compiled_policy = CompiledPolicy.load(COMPILED_POLICY)
+if CFR_POLICY:
+    from cfr_solver import SolverPolicy
+    compiled_policy = SolverPolicy.load(CFR_POLICY)
+
+# Optional real-time river subgame solver (river_solver.py), on when
+# POKER_RIVER_SOLVER_MS > 0; past its budget the machine plays the fast policy
+RIVER_SOLVER_MS = float(os.environ.get('POKER_RIVER_SOLVER_MS', 0))
+river_solver = None
+if RIVER_SOLVER_MS > 0:
+    from river_solver import RiverSolver
+    river_solver = RiverSolver(RIVER_SOLVER_MS)
+
+def visible_q_table_states():
+    """
+    Shared snapshot states counted once, plus the states each machine holds on
+    its own. Read without the table locks, so the value is approximate while
+    machines are adding states.
+    """
+    total = len(shared_policy) if shared_policy is not None else 0
+    for table in list(tables.values()):
+        q_table = table.machine.q_table
+        if isinstance(q_table, PolicyOverlay):
+            total += q_table.total_size - len(q_table.policy)
+        else:
+            total += len(q_table)
+    return total
+
+# Prometheus metrics served at GET /metrics (web_metrics.py)
+metrics = Registry()
+http_requests = metrics.register(Counter(
+    'poker_http_requests_total', 'HTTP requests by route, method and status',
+    ('route', 'method', 'status')))
+http_latency = metrics.register(Histogram(
+    'poker_http_request_duration_seconds', 'HTTP request latency by route', ('route',)))
+ai_decision_latency = metrics.register(Histogram(
+    'poker_ai_decision_seconds', 'Time the machine spends in make_decision'))
+q_table_flush_latency = metrics.register(Histogram(
+    'poker_q_table_flush_seconds', 'Time to persist q_table.json'))
+metrics.register(Gauge('poker_active_tables', 'Open tables', lambda: len(tables)))
+metrics.register(Gauge('poker_decision_queue_depth', 'AI decisions submitted and not finished',
+                       lambda: decision_pool.queue_depth))
+metrics.register(Gauge('poker_q_table_states',
+                       'Q-table states across machines, the shared snapshot counted once (approximate)',
+                       visible_q_table_states))
+metrics.register(Gauge('poker_q_table_private_states',
+                       'Q-table states held by the machines themselves (overlay states with a snapshot)',
+                       lambda: sum(table_sizes(t.machine.q_table)[1] for t in list(tables.values()))))
+metrics.register(Gauge('process_resident_memory_bytes', 'Resident memory size in bytes',
+                       resident_memory_bytes))
+player_module.flush_listeners.append(q_table_flush_latency.observe)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    # Route templates, not raw paths, so table ids and asset names stay out of the labels
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    http_requests.inc(route, request.method, str(response.status_code))
+    if 'request_start' in g:
+        http_latency.observe(time.perf_counter() - g.request_start, route)
+    return response
+
+# Periodic memory report of the machines' learning state (memory_report.py)
+# Off by default: importing the app must not start a background thread
+MEMORY_REPORT_INTERVAL = float(os.environ.get('POKER_MEMORY_REPORT_INTERVAL', 0))
+
+def locked_machines():
+    """Each table's machine, sized while its table lock is held"""
+    for table in list(tables.values()):
+        with table.lock:
+            yield table.machine
+
+def report_memory_periodically():
+    from memory_report import MemoryMonitor, tracing_from_env
+    tracing_from_env()
+    monitor = MemoryMonitor.from_env()
+    while True:
+        time.sleep(MEMORY_REPORT_INTERVAL)
+        monitor.report(locked_machines())
+
+if MEMORY_REPORT_INTERVAL > 0:
+    threading.Thread(target=report_memory_periodically, name="memory-report", daemon=True).start()
+
+# Spans on the engine hot paths (instrumentation.py), off unless POKER_TRACE=1
+import instrumentation
+instrumentation.enable_from_env()
+
 # Game state management
 class GameState:
-    def __init__(self):
+    def __init__(self, table_id="default"):
+        self.table_id = table_id
         self.player = Player("Você")
-        self.machine = Player("Máquina", is_machine=True)
+        self.machine = Player("Máquina", is_machine=True, policy=shared_policy,
+                              compiled_policy=compiled_policy, river_solver=river_solver)
         self.game = None
         self.current_phase = "waiting"
         self.winner = None
         self.game_over = False
+        # Guards every mutation; the machine's turn runs on a worker thread
+        self.lock = threading.RLock()
+        self.machine_thinking = False
+        self.last_machine_action = None
+        self.machine_action_seq = 0
+        self.hand_number = 0
+        self.last_access = time.monotonic()
         
     def new_hand(self):
         """Start a new hand"""
-        self.player.hand = []
-        self.player.folded = False
-        self.player.current_bet = 0
-        
-        self.machine.hand = []
-        self.machine.folded = False
-        self.machine.current_bet = 0
+        with self.lock:
+            self._new_hand()
+
+    def _new_hand(self):
+        # Any decision still queued for the previous hand becomes a no-op
+        self.hand_number += 1
+        self.machine_thinking = False
+        self.last_machine_action = None
+
+        # Cards, fold, bet and the hand's action history, as in game.py
+        self.player.start_hand(opponent=self.machine.name)
+        self.machine.start_hand(opponent=self.player.name)
         
         self.game = PokerGame([self.player, self.machine])
         self.game.deal_cards()
@@ -73,16 +221,48 @@ class GameState:
             'current_bet': self.game.current_bet,
             'community_cards': [{'rank': c.rank, 'suit': c.suit} for c in self.game.community_cards],
             'winner': self.winner,
-            'game_over': self.game_over
+            'game_over': self.game_over,
+            'machine_thinking': self.machine_thinking,
+            'last_machine_action': self.last_machine_action,
+            'machine_action_seq': self.machine_action_seq
         }
     
     def process_action(self, action, amount=0):
-        """Process player action and get machine response"""
+        """
+        Process player action and queue the machine response.
+
+        Returns as soon as the player's action is applied; the machine's reply
+        is computed on ``decision_pool`` and shows up in ``get_state`` as
+        ``last_machine_action`` once ``machine_thinking`` goes back to False.
+        """
+        with self.lock:
+            result = self._apply_player_action(action, amount)
+            if 'error' in result or self.game_over:
+                return result
+            self.machine_thinking = True
+            hand_number = self.hand_number
+
+        try:
+            decision_pool.submit(self.table_id,
+                                 lambda: self.machine_turn(hand_number),
+                                 fallback=lambda: self.machine_timeout(hand_number))
+        except PoolSaturatedError:
+            with self.lock:
+                self.machine_thinking = False
+            raise
+        result['machine_thinking'] = True
+        return result
+
+    def _apply_player_action(self, action, amount):
         if self.game_over or self.player.folded:
             return {'error': 'Game is over or player has folded'}
+        if self.machine_thinking:
+            return {'error': 'Machine is still thinking'}
         
         # Process player action
         if action == 'fold':
+            self.machine.observe_action(self.game.community_cards, 'fold', 0, actor=self.player.name)
+            self.machine.end_hand()
             self.player.folded = True
             self.winner = self.machine.name
             self.game_over = True
@@ -92,50 +272,84 @@ class GameState:
         
         elif action == 'call':
             call_amount = min(self.game.current_bet - self.player.current_bet, self.player.chips)
+            self.machine.observe_action(self.game.community_cards, 'call', call_amount, actor=self.player.name)
             self.player.chips -= call_amount
             self.player.current_bet += call_amount
             self.game.pot += call_amount
             
         elif action == 'raise':
             raise_amount = min(amount, self.player.chips)
+            self.machine.observe_action(self.game.community_cards, 'raise', raise_amount, actor=self.player.name)
             self.player.chips -= raise_amount
             self.player.current_bet += raise_amount
             self.game.pot += raise_amount
             self.game.current_bet = self.player.current_bet
         
-        # Machine's turn
-        if not self.machine.folded:
-            machine_action, machine_amount = self.machine.make_decision(
-                self.game.community_cards,
-                self.game.current_bet - self.machine.current_bet,
-                20
-            )
-            
-            if machine_action == 'fold':
-                self.machine.folded = True
-                self.winner = self.player.name
-                self.game_over = True
-                self.player.chips += self.game.pot
-                self.game.pot = 0
-                return {'status': 'success', 'message': 'Machine folded', 'machine_action': 'fold'}
+        return {'status': 'success'}
+
+    def machine_turn(self, hand_number):
+        """Run the machine's decision (worker thread)"""
+        with self.lock:
+            if hand_number != self.hand_number:
+                return None
+            try:
+                if self.machine.folded or self.game_over:
+                    return None
+                start = time.perf_counter()
+                machine_action, machine_amount = self.machine.make_decision(
+                    self.game.community_cards,
+                    self.game.current_bet - self.machine.current_bet,
+                    20,
+                    self.game.pot
+                )
+                ai_decision_latency.observe(time.perf_counter() - start)
+                return self._apply_machine_action(machine_action, machine_amount)
+            finally:
+                self.machine_thinking = False
+
+    def machine_timeout(self, hand_number):
+        """Queue-wait fallback: the job waited too long to start, so just check/call"""
+        with self.lock:
+            if hand_number != self.hand_number:
+                return None
+            try:
+                if self.machine.folded or self.game_over:
+                    return None
+                return self._apply_machine_action('call', 0)
+            finally:
+                self.machine_thinking = False
+
+    def _apply_machine_action(self, machine_action, machine_amount):
+        if machine_action == 'fold':
+            self.machine.end_hand()
+            self.machine.folded = True
+            self.winner = self.player.name
+            self.game_over = True
+            self.player.chips += self.game.pot
+            self.game.pot = 0
+        
+        elif machine_action == 'call':
+            call_amount = min(self.game.current_bet - self.machine.current_bet, self.machine.chips)
+            self.machine.observe_action(self.game.community_cards, 'call', call_amount, own=True)
+            self.machine.chips -= call_amount
+            self.machine.current_bet += call_amount
+            self.game.pot += call_amount
             
-            elif machine_action == 'call':
-                call_amount = min(self.game.current_bet - self.machine.current_bet, self.machine.chips)
-                self.machine.chips -= call_amount
-                self.machine.current_bet += call_amount
-                self.game.pot += call_amount
-                
-            elif machine_action == 'raise':
-                self.machine.chips -= machine_amount
-                self.machine.current_bet += machine_amount
-                self.game.pot += machine_amount
-                self.game.current_bet = self.machine.current_bet
+        elif machine_action == 'raise':
+            self.machine.observe_action(self.game.community_cards, 'raise', machine_amount, own=True)
+            self.machine.chips -= machine_amount
+            self.machine.current_bet += machine_amount
+            self.game.pot += machine_amount
+            self.game.current_bet = self.machine.current_bet
         
+        self.last_machine_action = {'action': machine_action, 'amount': machine_amount}
+        self.machine_action_seq += 1
+
         # Check if betting round is complete
-        if self.player.current_bet == self.machine.current_bet:
+        if not self.game_over and self.player.current_bet == self.machine.current_bet:
             self.advance_phase()
         
-        return {'status': 'success', 'machine_action': machine_action, 'machine_amount': machine_amount}
+        return self.last_machine_action
     
     def advance_phase(self):
         """Advance to next game phase"""
@@ -181,26 +395,103 @@ class GameState:
         self.game.pot = 0
         self.game_over = True
         self.current_phase = "showdown"
+        self.machine.end_hand(showdown=True)
+
+# Tables by id; requests without a table id use the default one
+tables = {}
+tables_lock = threading.Lock()
+
+def evict_idle_tables(now=None):
+    """Drop tables idle longer than TABLE_IDLE_SECONDS; call with tables_lock held"""
+    now = time.monotonic() if now is None else now
+    evicted = 0
+    for table_id, table in list(tables.items()):
+        if table_id == "default" or now - table.last_access < TABLE_IDLE_SECONDS:
+            continue
+        # A table whose lock is held or whose machine is still deciding is busy
+        if table.machine_thinking or not table.lock.acquire(blocking=False):
+            continue
+        try:
+            del tables[table_id]
+            evicted += 1
+        finally:
+            table.lock.release()
+    return evicted
+
+def get_table(table_id="default"):
+    """Return the table for ``table_id``, creating it on first use"""
+    with tables_lock:
+        table = tables.get(table_id)
+        if table is None:
+            if len(tables) >= MAX_TABLES:
+                evict_idle_tables()
+            if len(tables) >= MAX_TABLES:
+                raise LookupError(f"Table limit reached ({MAX_TABLES})")
+            table = tables[table_id] = GameState(table_id)
+        table.last_access = time.monotonic()
+        return table
+
+def table_from_request():
+    data = request.get_json(silent=True) or {}
+    return get_table(str(data.get('table_id') or request.args.get('table_id') or 'default'))
 
 # Global game state
-game_state = GameState()
+game_state = get_table()
+
+# Output of build_assets.py: content-hashed, precompressed static files
+ASSET_DIR = os.path.join(app.root_path, 'static', 'dist')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Files build_assets.py writes without a content hash in the name
+UNHASHED_ASSETS = ('index.html', MANIFEST_NAME)
+
+def send_asset(filename, cache_control):
+    """Send a built file, picking the .br/.gz variant the client accepts"""
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if (request.accept_encodings.quality(encoding) > 0
+                and os.path.isfile(os.path.join(ASSET_DIR, filename + suffix))):
+            response = send_from_directory(ASSET_DIR, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIR, filename, mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = cache_control
+    return response
 
 @app.route('/')
 def index():
     """Serve the main HTML page"""
+    if os.path.isfile(os.path.join(ASSET_DIR, 'index.html')):
+        # Always revalidate the page itself; the hashed assets it links never change
+        return send_asset('index.html', 'no-cache')
     return send_from_directory('static', 'index.html')
 
+@app.route('/assets/<path:filename>')
+def assets(filename):
+    """Serve content-hashed assets with long-lived caching"""
+    if filename in UNHASHED_ASSETS:
+        # Same name on every build: must be revalidated like the page
+        return send_asset(filename, 'no-cache')
+    return send_asset(filename, IMMUTABLE_CACHE)
+
 @app.route('/api/game/state', methods=['GET'])
 def get_game_state():
     """Get current game state"""
-    return jsonify(game_state.get_state())
+    try:
+        return jsonify(table_from_request().get_state())
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 503
 
 @app.route('/api/game/new', methods=['POST'])
 def new_game():
     """Start a new game"""
     try:
-        game_state.new_hand()
-        return jsonify({'status': 'success', 'message': 'New hand started', 'state': game_state.get_state()})
+        table = table_from_request()
+        table.new_hand()
+        return jsonify({'status': 'success', 'message': 'New hand started', 'state': table.get_state()})
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -218,9 +509,12 @@ def game_action():
         if action not in ['call', 'raise', 'fold']:
             return jsonify({'error': 'Invalid action'}), 400
         
-        result = game_state.process_action(action, amount)
-        result['state'] = game_state.get_state()
+        table = table_from_request()
+        result = table.process_action(action, amount)
+        result['state'] = table.get_state()
         return jsonify(result)
+    except (LookupError, PoolSaturatedError) as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -233,6 +527,11 @@ def get_stats():
         'total_chips': game_state.player.chips + game_state.machine.chips
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Not found'}), 404
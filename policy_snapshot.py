@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Frozen, memory-mapped Q-table snapshots.
+
+A snapshot is a read-only binary copy of one player's Q-table that every
+process can ``mmap`` instead of parsing q_table.json into its own dict.
+Publishing a new snapshot is an atomic rename, and ``SharedPolicy`` picks it
+up on the next lookup after ``check_interval`` seconds.
+
+File layout (little endian):
+    header   magic "PQTS", version, state count, keys offset, values offset
+    offsets  (count + 1) uint64 offsets into the keys blob
+    keys     UTF-8 state strings, sorted bytewise
+    values   count * 3 float64 (fold, call, raise)
+
+Each table keeps the states it creates in a private ``PolicyOverlay``, capped
+at ``POKER_OVERLAY_MAX_STATES`` (default 5000, 0 = no cap) by the same
+cold-state eviction as the regular Q-table.
+
+Uso:
+    python policy_snapshot.py q_table.json "Máquina" q_policy.bin
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections.abc import MutableMapping
+from typing import Dict, Optional, Tuple
+
+from q_table_pruning import QTableLimit
+from state_space import DEFAULT_STATE_SPACE, StateSpace, rebucket_q_table
+
+ACTIONS = ('fold', 'call', 'raise')
+MAGIC = b'PQTS'
+VERSION = 1
+_HEADER = struct.Struct('<4sIQQQ')
+OVERLAY_MAX_STATES = 5000
+
+
+def _align8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def export_snapshot(q_table: Dict[str, Dict[str, float]], path: str):
+    """Write ``q_table`` as a snapshot, replacing ``path`` atomically."""
+    keys = sorted(state.encode('utf-8') for state in q_table)
+    offsets = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(key))
+
+    keys_offset = _HEADER.size + 8 * len(offsets)
+    values_offset = _align8(keys_offset + offsets[-1])
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(keys), keys_offset, values_offset))
+        f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+        f.write(b''.join(keys))
+        f.write(b'\0' * (values_offset - keys_offset - offsets[-1]))
+        for key in keys:
+            q_values = q_table[key.decode('utf-8')]
+            f.write(struct.pack('<3d', *(float(q_values.get(a, 0.0)) for a in ACTIONS)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def export_from_json(json_path: str, player_name: str, path: str,
+                     state_space: Optional[StateSpace] = DEFAULT_STATE_SPACE) -> int:
+    """Export one player's table from q_table.json. Returns the state count."""
+    with open(json_path, 'r') as f:
+        q_table = json.load(f).get(player_name, {})
+    # Legacy raw-value keys are never produced by get_state: map them onto
+    # the state space first, as Player.load_q_table does
+    if state_space is not None and not all(map(state_space.is_key, q_table)):
+        q_table, _ = rebucket_q_table(q_table, state_space)
+    export_snapshot(q_table, path)
+    return len(q_table)
+
+
+class PolicySnapshot:
+    """Read-only view over a snapshot file; lookups never copy the table."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, keys_offset, values_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} não é um snapshot de política válido")
+        self._count = count
+        self._keys_offset = keys_offset
+        self._offsets = memoryview(self._mm)[_HEADER.size:keys_offset].cast('Q')
+        self._values = memoryview(self._mm)[values_offset:values_offset + 24 * count].cast('d')
+
+    def __len__(self):
+        return self._count
+
+    def _key(self, index: int) -> bytes:
+        base = self._keys_offset
+        return self._mm[base + self._offsets[index]:base + self._offsets[index + 1]]
+
+    def _find(self, state: str) -> int:
+        target = state.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key(lo) == target:
+            return lo
+        return -1
+
+    def get(self, state: str) -> Optional[Dict[str, float]]:
+        index = self._find(state)
+        if index < 0:
+            return None
+        row = index * 3
+        return {action: self._values[row + i] for i, action in enumerate(ACTIONS)}
+
+    def __contains__(self, state):
+        return self._find(state) >= 0
+
+    def states(self):
+        for index in range(self._count):
+            yield self._key(index).decode('utf-8')
+
+
+class SharedPolicy:
+    """
+    Snapshot that follows atomic republishes of ``path``.
+
+    The file is re-checked at most every ``check_interval`` seconds; when it
+    changed, the new file is mapped and the old mapping is dropped once no
+    lookup is using it.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._snapshot = PolicySnapshot(path)
+        self._next_check = time.monotonic() + check_interval
+
+    @property
+    def snapshot(self) -> PolicySnapshot:
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._next_check = now + self.check_interval
+                    self._maybe_reload()
+        return self._snapshot
+
+    def _maybe_reload(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._snapshot.file_id:
+            self._snapshot = PolicySnapshot(self.path)
+            self.reloads += 1
+
+    def get(self, state: str) -> Optional[Dict[str, float]]:
+        return self.snapshot.get(state)
+
+    def __contains__(self, state):
+        return state in self.snapshot
+
+    def __len__(self):
+        return len(self.snapshot)
+
+
+class PolicyOverlay(MutableMapping):
+    """
+    Dict-like Q-table for a machine playing from a shared snapshot.
+
+    Reads fall through to the snapshot; writes (new states created by
+    ``make_decision``) stay in a small private dict. Values read from the
+    snapshot are fresh dicts, so mutating them does not change the policy.
+
+    Iteration and ``len`` cover the private dict only, which is what eviction
+    can remove; ``total_size`` also counts the snapshot.
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.local: Dict[str, Dict[str, float]] = {}
+
+    def __getitem__(self, state):
+        if state in self.local:
+            return self.local[state]
+        q_values = self.policy.get(state)
+        if q_values is None:
+            raise KeyError(state)
+        return q_values
+
+    def __contains__(self, state):
+        return state in self.local or state in self.policy
+
+    def __setitem__(self, state, q_values):
+        self.local[state] = q_values
+
+    def __delitem__(self, state):
+        del self.local[state]
+
+    def __iter__(self):
+        return iter(self.local)
+
+    def __len__(self):
+        return len(self.local)
+
+    @property
+    def overlay_size(self) -> int:
+        """States created by this table"""
+        return len(self.local)
+
+    @property
+    def total_size(self) -> int:
+        """States visible through the overlay: the snapshot plus local additions"""
+        return len(self.policy) + sum(1 for state in self.local if state not in self.policy)
+
+
+def overlay_limit() -> QTableLimit:
+    """Cap on the states a table adds on top of the snapshot"""
+    return QTableLimit(int(os.environ.get('POKER_OVERLAY_MAX_STATES', OVERLAY_MAX_STATES)))
+
+
+def table_sizes(q_table) -> Tuple[int, int]:
+    """(visible states, states held privately) of a Q-table dict or overlay"""
+    if isinstance(q_table, PolicyOverlay):
+        return q_table.total_size, q_table.overlay_size
+    return len(q_table), len(q_table)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print(__doc__.split("Uso:")[1])
+        sys.exit(1)
+    count = export_from_json(sys.argv[1], sys.argv[2], sys.argv[3])
+    print(f"✓ {count} estados exportados para {sys.argv[3]}")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Compiled policy: a dense action-probability table for machine opponents.
+
+``Player.make_decision`` re-derives the same answer on every call: build a
+state string, argmax the Q-values, then run a chain of heuristic overrides
+with several ``random.random()`` draws. ``compile_policy`` folds all of that
+into one NumPy array indexed by a discretized state, so a production
+opponent only computes its cell and samples one action.
+
+Cells are (phase, board texture, position, hand strength, bet/stack ratio,
+short stack). Bin edges line up with the thresholds used by the overrides,
+so every rule resolves the same way for every situation inside a cell. The
+compiler assumes what make_decision cannot know from the state alone:
+no consecutive raises, pot ~= 2x the bet, a made hand (two pair or better)
+~= strength >= 0.5, and any pre-flop bet exceeding the minimum raise.
+
+Training keeps using make_decision; pass ``compiled_policy`` to Player to
+play from the table instead.
+
+Uso:
+    python policy_table.py q_table.json "Máquina" policy_table.npz
+"""
+
+import json
+import random
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from state_space import BET_EDGES
+
+ACTIONS = ('fold', 'call', 'raise')
+FOLD, CALL, RAISE = range(3)
+VERSION = 1
+
+PHASES = {0: 0, 3: 1, 4: 2, 5: 3}  # community card count -> phase index
+PHASE_NAMES = ('preflop', 'flop', 'turn', 'river')
+TEXTURES = ('none', 'dry', 'wet', 'very_wet', 'paired')
+POSITIONS = ('early', 'late', 'unknown')
+HS_BINS = 20  # 0.05 wide, matching the 0.05-multiple strength thresholds
+# bet/stack ratio bucket = number of edges the ratio is strictly above
+BET_BINS = len(BET_EDGES) + 1
+SHORT_STACK = 200  # chips below which raises are capped
+
+SHAPE = (len(PHASE_NAMES), len(TEXTURES), len(POSITIONS), HS_BINS, BET_BINS, 2)
+NUM_CELLS = int(np.prod(SHAPE))
+
+
+def hs_bucket(hand_strength: float) -> int:
+    return min(max(int(hand_strength * HS_BINS), 0), HS_BINS - 1)
+
+
+def bet_bucket(bet_ratio: float) -> int:
+    return sum(1 for edge in BET_EDGES if bet_ratio > edge)
+
+
+def cell_index(phase: int, texture: int, position: int, hs: int, bet: int, short: int) -> int:
+    return int(np.ravel_multi_index((phase, texture, position, hs, bet, short), SHAPE))
+
+
+def _representative(bucket: int, edges, top: float) -> float:
+    """Middle of a bucket (0 stays 0: no bet to call)"""
+    if bucket == 0:
+        return 0.0
+    low = edges[bucket - 1]
+    high = edges[bucket] if bucket < len(edges) else top
+    return (low + high) / 2
+
+
+def _state_cell(state: str) -> Optional[Tuple[int, int, int, int, int, int]]:
+    """Cell of a Player.get_state string, or None if it does not parse"""
+    parts = state.split('_')
+    if len(parts) < 8:
+        return None
+    try:
+        hand_strength, chips_ratio, bet_ratio = (float(x) for x in parts[-5:-2])
+        phase = PHASE_NAMES.index(parts[0])
+        position = POSITIONS.index(parts[-6])
+        texture = TEXTURES.index('_'.join(parts[1:-6]))
+    except ValueError:
+        return None
+    short = 1 if chips_ratio * 1000 < SHORT_STACK else 0
+    return phase, texture, position, hs_bucket(hand_strength), bet_bucket(bet_ratio), short
+
+
+def _initial_q(hand_strength: float, phase: int, texture: int, position: int) -> List[float]:
+    """make_decision's initial Q-values for an unseen state, without the noise"""
+    position_factor = 1.1 if POSITIONS[position] == 'late' else 0.9
+    texture_factor = 1.1 if 'wet' in TEXTURES[texture] else 1.0
+    fold = -0.1 - hand_strength * 0.2
+    call = hand_strength * 0.3 * position_factor
+    raise_ = -0.05 + hand_strength * 0.4 * position_factor * texture_factor
+    if phase == 0:
+        if hand_strength > 0.7:
+            fold -= 0.1
+            raise_ += 0.2
+        elif hand_strength > 0.5:
+            call += 0.1
+    return [fold, call, raise_]
+
+
+def _remap(dist, rule):
+    """Push a distribution through ``rule(action) -> [(new_action, p), ...]``"""
+    out = [0.0, 0.0, 0.0]
+    for action, p in enumerate(dist):
+        if p:
+            for new_action, q in rule(action):
+                out[new_action] += p * q
+    return out
+
+
+def cell_distribution(q_values, hand_strength: float, bet_ratio: float, phase: int,
+                      short_stack: bool, epsilon: float) -> List[float]:
+    """Action probabilities make_decision produces for one situation"""
+    hs, bsr = hand_strength, bet_ratio
+    has_bet = bsr > 0
+    pot_odds = 2 / 3 if has_bet else 0.0
+    community = (0, 3, 4, 5)[phase]
+    no_bet_fold = FOLD if has_bet else CALL
+
+    # epsilon-greedy: weighted exploration or the Q argmax
+    weights = [max(0.1, 1.0 - hs), max(0.2, hs * 0.8), max(0.1, hs * 1.2)]
+    total = sum(weights)
+    dist = [epsilon * w / total for w in weights]
+    dist[int(np.argmax(q_values))] += 1.0 - epsilon
+
+    if bsr > 0.7 and hs < 0.5:
+        dist = [1.0, 0.0, 0.0]
+
+    def context(action):
+        if action == FOLD:
+            if hs < 0.3 and bsr > 0.15:
+                return [(FOLD, 1.0)]
+            if hs >= 0.4 and pot_odds > 0.3:
+                return [(CALL, 1.0)]
+            if hs > 0.6:
+                return [(CALL, 1.0)]
+            return [(FOLD, 1.0)]
+        if action == CALL:
+            if bsr > 0.7:
+                return [(FOLD if hs < 0.85 else CALL, 1.0)]
+            if bsr > 0.5 and hs < 0.7:
+                return [(FOLD, 0.8), (CALL, 0.2)]
+            if hs > 0.75 and bsr < 0.3:
+                return [(RAISE, 0.4), (CALL, 0.6)]
+            if hs < 0.4 and bsr > 0.25:
+                return [(FOLD, 0.6), (CALL, 0.4)]
+            if 0.5 < hs < 0.7 and community >= 3 and bsr < 0.3:
+                return [(RAISE, 0.25), (CALL, 0.75)]
+            return [(CALL, 1.0)]
+        if hs < 0.35 and bsr < 0.15:
+            return [(no_bet_fold, 0.7), (RAISE, 0.3)]
+        if short_stack and bsr > 0.4:
+            return [(CALL, 1.0)]
+        return [(RAISE, 1.0)]
+
+    dist = _remap(dist, context)
+
+    if community == 0:
+        if hs > 0.75:
+            dist = _remap(dist, lambda a: [(RAISE, 0.6), (CALL, 0.4)] if a == CALL else [(a, 1.0)])
+        elif 0.4 < hs < 0.6:
+            dist = _remap(dist, lambda a: [(CALL, 1.0)] if a == RAISE else [(a, 1.0)])
+            if bsr > 0.2:
+                dist = [1.0, 0.0, 0.0]
+        elif hs < 0.3 and has_bet:
+            dist = [1.0, 0.0, 0.0]
+    else:
+        if hs > 0.85:
+            dist = _remap(dist, lambda a: [(CALL, 0.3), (RAISE, 0.7)] if a == RAISE else [(a, 1.0)])
+        if community == 5 and hs < 0.4:
+            dist = _remap(dist, lambda a: [(no_bet_fold, 1.0)] if a == RAISE else [(a, 1.0)])
+
+    total = sum(dist)
+    return [p / total for p in dist]
+
+
+def compile_policy(q_table: Dict[str, Dict[str, float]], epsilon: float = 0.1) -> np.ndarray:
+    """
+    Compile a Q-table into a (NUM_CELLS, 3) float32 probability table.
+
+    Q-values of every state that falls in a cell are averaged; cells the
+    table never visited use make_decision's initial values.
+    """
+    sums = np.zeros((NUM_CELLS, 3))
+    counts = np.zeros(NUM_CELLS)
+    for state, q_values in q_table.items():
+        cell = _state_cell(state)
+        if cell is not None:
+            index = cell_index(*cell)
+            sums[index] += [q_values.get(a, 0.0) for a in ACTIONS]
+            counts[index] += 1
+
+    probs = np.empty((NUM_CELLS, 3), dtype=np.float32)
+    for index in range(NUM_CELLS):
+        phase, texture, position, hs, bet, short = np.unravel_index(index, SHAPE)
+        hand_strength = (hs + 0.5) / HS_BINS
+        bet_ratio = _representative(bet, BET_EDGES, 1.0)
+        if counts[index]:
+            q_values = sums[index] / counts[index]
+        else:
+            q_values = _initial_q(hand_strength, phase, texture, position)
+        probs[index] = cell_distribution(q_values, hand_strength, bet_ratio, phase, bool(short), epsilon)
+    return probs
+
+
+class CompiledPolicy:
+    """Frozen fast path: one table lookup and one random draw per decision."""
+
+    def __init__(self, probs: np.ndarray, rng: Optional[random.Random] = None):
+        if probs.shape != (NUM_CELLS, 3):
+            raise ValueError(f"tabela de política com formato {probs.shape}, esperado {(NUM_CELLS, 3)}")
+        self.probs = probs
+        # Cumulative rows as plain floats: sampling never touches NumPy
+        self._cumulative = np.cumsum(probs, axis=1).tolist()
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_q_table(cls, q_table, epsilon: float = 0.1, rng=None) -> 'CompiledPolicy':
+        return cls(compile_policy(q_table, epsilon), rng)
+
+    @classmethod
+    def load(cls, path: str, rng=None) -> 'CompiledPolicy':
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != VERSION or tuple(meta.get('shape', ())) != SHAPE:
+                raise ValueError(f"{path} foi compilado com outro formato de estado")
+            return cls(data['probs'], rng)
+
+    def save(self, path: str):
+        meta = json.dumps({'version': VERSION, 'shape': SHAPE, 'actions': ACTIONS})
+        np.savez_compressed(path, probs=self.probs, meta=np.array(meta))
+
+    def _locate(self, player, community_cards, current_bet: int) -> Tuple[int, float]:
+        hand_strength = player.evaluate_hand_strength(community_cards)
+        texture = player._evaluate_board_texture(community_cards) if community_cards else 'none'
+        position = player.position if player.position in POSITIONS else 'unknown'
+        bet_ratio = current_bet / player.chips if player.chips > 0 else 1
+        index = cell_index(PHASES.get(len(community_cards), 3), TEXTURES.index(texture),
+                           POSITIONS.index(position), hs_bucket(hand_strength),
+                           bet_bucket(bet_ratio), 1 if player.chips < SHORT_STACK else 0)
+        return index, hand_strength
+
+    def cell(self, player, community_cards, current_bet: int) -> int:
+        return self._locate(player, community_cards, current_bet)[0]
+
+    def action_probabilities(self, player, community_cards, current_bet: int) -> Dict[str, float]:
+        row = self.probs[self.cell(player, community_cards, current_bet)]
+        return {action: float(row[i]) for i, action in enumerate(ACTIONS)}
+
+    def decide(self, player, community_cards, current_bet: int, min_raise: int,
+               pot_size: int = 0) -> Tuple[str, int]:
+        """Same contract as Player.make_decision: chips are left to the caller."""
+        index = self.cell(player, community_cards, current_bet)
+        draw = self.rng.random()
+        cumulative = self._cumulative[index]
+        action = RAISE if draw >= cumulative[CALL] else (CALL if draw >= cumulative[FOLD] else FOLD)
+
+        player.last_action = ACTIONS[action]
+        if action == FOLD:
+            player.folded = True
+            return "fold", 0
+        if action == RAISE:
+            # Mesmo sizing de make_decision
+            raise_amount = player.calculate_raise_size(community_cards, current_bet, min_raise,
+                                                       pot_size or current_bet * 2)
+            return "raise", min(raise_amount, player.chips)
+        return "call", min(current_bet, player.chips)
+
+
+def compile_from_json(json_path: str, player_name: str, path: str, epsilon: float = 0.1) -> int:
+    """Compile one player's table from q_table.json. Returns the number of states read."""
+    with open(json_path, 'r') as f:
+        q_table = json.load(f).get(player_name, {})
+    CompiledPolicy.from_q_table(q_table, epsilon).save(path)
+    return len(q_table)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print(__doc__.split("Uso:")[1])
+        sys.exit(1)
+    count = compile_from_json(sys.argv[1], sys.argv[2], sys.argv[3])
+    print(f"✓ {count} estados compilados em {NUM_CELLS} células: {sys.argv[3]}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Poda e compactação da Q-table.
+
+Treinos longos enchem o q_table.json de estados vistos uma única vez.
+``QTableUsage`` guarda, por estado, quantas vezes ele foi usado e o passo
+em que foi visto por último; ``QTableLimit`` mantém a tabela abaixo de um
+teto (número de estados e/ou memória) removendo primeiro os estados mais
+frios:
+
+    1. visitados uma vez só, do mais antigo para o mais recente
+    2. os demais, do menos recente para o mais recente (LRU)
+    3. empate: menor soma de |Q| (menos informação aprendida)
+
+A poda corre online (``Player.update_q_value`` / ``make_decision``) e
+offline por este script, que também compacta o arquivo: arredonda os
+valores, descarta linhas zeradas e grava JSON sem indentação.
+
+Variáveis de ambiente:
+    POKER_Q_TABLE_MAX_STATES   teto de estados por jogador (padrão 50000, 0 = sem teto)
+    POKER_Q_TABLE_MAX_MB       teto de memória estimada por jogador
+
+Uso:
+    python q_table_pruning.py q_table.json --max-states 20000 --decimals 4
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_MAX_STATES = 50000
+LOW_WATER = 0.9  # poda até 90% do teto, para não podar a cada estado novo
+USAGE_FILE = "q_table_usage.json"
+DICT_SLOT_BYTES = 36  # hash + ponteiros de chave e valor, com folga da tabela hash
+
+
+class QTableUsage:
+    """Visitas e último passo de uso de cada estado"""
+
+    def __init__(self, visits: Optional[Dict[str, int]] = None,
+                 last_seen: Optional[Dict[str, int]] = None, step: int = 0):
+        self.visits = visits if visits is not None else {}
+        self.last_seen = last_seen if last_seen is not None else {}
+        self.step = step
+
+    def touch(self, state: str):
+        self.step += 1
+        self.visits[state] = self.visits.get(state, 0) + 1
+        self.last_seen[state] = self.step
+
+    def forget(self, state: str):
+        self.visits.pop(state, None)
+        self.last_seen.pop(state, None)
+
+    def to_dict(self) -> Dict:
+        return {
+            'step': self.step,
+            'states': {state: [count, self.last_seen.get(state, 0)]
+                       for state, count in self.visits.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QTableUsage':
+        states = data.get('states', {})
+        return cls({s: v[0] for s, v in states.items()},
+                   {s: v[1] for s, v in states.items()},
+                   data.get('step', 0))
+
+
+def load_usage(name: str, path: str = USAGE_FILE) -> QTableUsage:
+    try:
+        with open(path, "r") as f:
+            return QTableUsage.from_dict(json.load(f).get(name, {}))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return QTableUsage()
+
+
+def estimate_entry_bytes(q_table: Dict[str, Dict[str, float]], sample: int = 200) -> int:
+    """Memória média de um estado (chave, dict de ações e floats) em uma amostra"""
+    total = count = 0
+    for state, q_values in q_table.items():
+        total += sys.getsizeof(state) + sys.getsizeof(q_values)
+        total += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in q_values.items())
+        count += 1
+        if count >= sample:
+            break
+    return total // count + DICT_SLOT_BYTES if count else 0
+
+
+def _coldness(state: str, q_table: Dict, usage: QTableUsage):
+    q_values = q_table[state]
+    return (usage.visits.get(state, 0) > 1,
+            usage.last_seen.get(state, 0),
+            sum(abs(v) for v in q_values.values()))
+
+
+def prune(q_table: Dict[str, Dict[str, float]], usage: QTableUsage, target: int,
+          keep: Iterable[str] = ()) -> List[str]:
+    """Remove os estados mais frios até sobrarem ``target``; retorna os removidos"""
+    excess = len(q_table) - target
+    if excess <= 0:
+        return []
+    keep = set(keep)
+    candidates = (s for s in q_table if s not in keep)
+    evicted = heapq.nsmallest(excess, candidates, key=lambda s: _coldness(s, q_table, usage))
+    for state in evicted:
+        del q_table[state]
+        usage.forget(state)
+    return evicted
+
+
+class QTableLimit:
+    """Teto rígido do tamanho de uma Q-table"""
+
+    def __init__(self, max_states: Optional[int] = DEFAULT_MAX_STATES,
+                 max_bytes: Optional[int] = None, low_water: float = LOW_WATER):
+        self.max_states = max_states or None
+        self.max_bytes = max_bytes or None
+        self.low_water = low_water
+        self.entry_bytes = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> 'QTableLimit':
+        max_states = int(os.environ.get("POKER_Q_TABLE_MAX_STATES", DEFAULT_MAX_STATES))
+        max_mb = float(os.environ.get("POKER_Q_TABLE_MAX_MB", 0))
+        return cls(max_states, int(max_mb * 1024 * 1024) if max_mb else None)
+
+    def capacity(self, q_table: Dict) -> Optional[int]:
+        """Número máximo de estados permitido para esta tabela"""
+        limits = []
+        if self.max_states:
+            limits.append(self.max_states)
+        if self.max_bytes:
+            if not self.entry_bytes:
+                self.entry_bytes = estimate_entry_bytes(q_table)
+            if self.entry_bytes:
+                limits.append(max(1, self.max_bytes // self.entry_bytes))
+        return min(limits) if limits else None
+
+    def enforce(self, q_table: Dict, usage: QTableUsage, keep: Iterable[str] = ()) -> List[str]:
+        capacity = self.capacity(q_table)
+        if capacity is None or len(q_table) <= capacity:
+            return []
+        evicted = prune(q_table, usage, int(capacity * self.low_water), keep)
+        self.evictions += len(evicted)
+        return evicted
+
+
+def compact(q_table: Dict[str, Dict[str, float]], decimals: int = 4) -> Dict[str, Dict[str, float]]:
+    """Valores arredondados, sem as linhas que ficaram todas zeradas"""
+    compacted = {}
+    for state, q_values in q_table.items():
+        row = {action: round(value, decimals) for action, value in q_values.items()}
+        if any(row.values()):
+            compacted[state] = row
+    return compacted
+
+
+def _write_json(path: str, data: Dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def maintain_file(path: str, limit: QTableLimit, decimals: int = 4,
+                  usage_path: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """Poda e compacta todas as tabelas de ``path``; retorna antes/depois por jogador"""
+    usage_path = usage_path or os.path.join(os.path.dirname(path), USAGE_FILE)
+    with open(path, "r") as f:
+        q_tables = json.load(f)
+    try:
+        with open(usage_path, "r") as f:
+            usages = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        usages = {}
+
+    summary = {}
+    for name, q_table in q_tables.items():
+        usage = QTableUsage.from_dict(usages.get(name, {}))
+        before = len(q_table)
+        q_table = compact(q_table, decimals)
+        limit.enforce(q_table, usage)
+        for state in list(usage.visits):
+            if state not in q_table:
+                usage.forget(state)
+        q_tables[name] = q_table
+        usages[name] = usage.to_dict()
+        summary[name] = {'before': before, 'after': len(q_table)}
+
+    size_before = os.path.getsize(path)
+    _write_json(path, q_tables)
+    _write_json(usage_path, usages)
+    summary['_bytes'] = {'before': size_before, 'after': os.path.getsize(path)}
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poda e compacta o q_table.json")
+    parser.add_argument("path", nargs="?", default="q_table.json")
+    parser.add_argument("--max-states", type=int, default=DEFAULT_MAX_STATES,
+                        help="teto de estados por jogador (0 = sem teto)")
+    parser.add_argument("--max-mb", type=float, default=0, help="teto de memória por jogador")
+    parser.add_argument("--decimals", type=int, default=4, help="casas decimais mantidas")
+    args = parser.parse_args(argv)
+
+    limit = QTableLimit(args.max_states, int(args.max_mb * 1024 * 1024) if args.max_mb else None,
+                        low_water=1.0)
+    summary = maintain_file(args.path, limit, args.decimals)
+    sizes = summary.pop('_bytes')
+    for name, counts in summary.items():
+        print(f"{name}: {counts['before']} -> {counts['after']} estados")
+    print(f"Arquivo: {sizes['before'] / 1024:.1f} KB -> {sizes['after'] / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Experience replay and batched Q-learning over the bounded state space.
+
+``update_q_value`` learns one transition at a time through nested dict
+lookups. Here transitions ``(state_id, action, reward, next_state_id)``
+go into fixed-size NumPy ring buffers and ``BatchQLearner`` applies a
+whole batch of TD targets at once on a dense ``(space.size, 3)`` array:
+a gather for ``Q[s, a]`` and ``max Q[s']``, and a scatter with
+``np.add.at`` that averages duplicate ``(s, a)`` pairs of the batch, so
+a state that shows up a thousand times moves once by its mean TD error.
+
+State ids are ``StateSpace`` indices (``Player.last_state_index``); an
+id of ``TERMINAL`` marks the end of a hand, which has no bootstrap term.
+Playing and learning are decoupled: games only fill the buffer, and
+``BatchQLearner.train`` consumes it whenever the caller chooses.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from state_space import DEFAULT_STATE_SPACE, StateSpace, TEXTURES, parse_state
+
+ACTIONS = ('fold', 'call', 'raise')
+ACTION_INDEX = {action: i for i, action in enumerate(ACTIONS)}
+TERMINAL = -1
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer; the oldest transitions are overwritten."""
+
+    def __init__(self, capacity: int = 100000):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int32)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int32)
+        self.position = 0  # next slot to write
+        self.size = 0
+        self.added = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state_id: int, action: int, reward: float, next_state_id: int = TERMINAL):
+        i = self.position
+        self.states[i] = state_id
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state_id
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.added += 1
+
+    def extend(self, states, actions, rewards, next_states):
+        """Append many transitions with one vectorized write"""
+        count = len(states)
+        if count > self.capacity:  # only the newest ones fit
+            states, actions, rewards, next_states = (
+                np.asarray(a)[-self.capacity:] for a in (states, actions, rewards, next_states))
+            self.added += count - self.capacity
+            count = self.capacity
+        slots = (self.position + np.arange(count)) % self.capacity
+        self.states[slots] = states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = next_states
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        self.added += count
+
+    def sample(self, batch_size: int, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, ...]:
+        """Uniform sample with replacement"""
+        if not self.size:
+            raise ValueError("buffer de experiência vazio")
+        rng = rng or np.random.default_rng()
+        idx = rng.integers(0, self.size, batch_size)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx]
+
+
+class BatchQLearner:
+    """Dense Q array for a ``StateSpace`` updated a batch at a time."""
+
+    def __init__(self, space: StateSpace = DEFAULT_STATE_SPACE, learning_rate: float = 0.1,
+                 discount: float = 0.9, max_update: float = 0.3):
+        self.space = space
+        self.learning_rate = learning_rate
+        self.discount = discount
+        self.max_update = max_update  # same clamp as update_q_value
+        self.q = np.zeros((space.size, len(ACTIONS)))
+        self.touched = np.zeros(space.size, dtype=bool)
+        self.changed = np.zeros(space.size, dtype=bool)  # updated since the last pop_changes
+        self.updates = 0
+
+    def update(self, states, actions, rewards, next_states) -> float:
+        """One TD step for a batch; returns the mean absolute TD error"""
+        states = np.asarray(states, dtype=np.int64)
+        actions = np.asarray(actions, dtype=np.int64)
+        next_states = np.asarray(next_states, dtype=np.int64)
+
+        terminal = next_states < 0
+        next_max = self.q[np.where(terminal, 0, next_states)].max(axis=1)
+        next_max[terminal] = 0.0
+        td = np.asarray(rewards, dtype=np.float64) + self.discount * next_max - self.q[states, actions]
+
+        # Duplicated (s, a) pairs share one averaged step
+        flat = states * len(ACTIONS) + actions
+        _, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+        counts = counts[inverse]
+        step = np.clip(self.learning_rate * td, -self.max_update, self.max_update) / counts
+        np.add.at(self.q.reshape(-1), flat, step)
+
+        self.touched[states] = True
+        self.changed[states] = True
+        self.updates += len(states)
+        return float(np.abs(td).mean())
+
+    def train(self, buffer: ReplayBuffer, batch_size: int = 1024, steps: int = 1,
+              rng: Optional[np.random.Generator] = None) -> float:
+        """``steps`` updates on batches sampled from ``buffer``; returns the last TD error"""
+        error = 0.0
+        for _ in range(steps):
+            error = self.update(*buffer.sample(batch_size, rng))
+        return error
+
+    def load_q_table(self, q_table: Dict[str, Dict[str, float]]) -> int:
+        """Seed from a Player Q-table; states that share a bucket are averaged"""
+        sums = np.zeros_like(self.q)
+        counts = np.zeros(self.space.size)
+        for state, q_values in q_table.items():
+            fields = parse_state(state)
+            if fields is None or fields['texture'] not in TEXTURES:
+                continue
+            index, _ = self.space.encode(**fields)
+            sums[index] += [q_values.get(a, 0.0) for a in ACTIONS]
+            counts[index] += 1
+        seen = counts > 0
+        self.q[seen] = sums[seen] / counts[seen, None]
+        self.touched |= seen
+        return int(seen.sum())
+
+    def seed_rows(self, state_ids, q_table: Dict[str, Dict[str, float]]) -> int:
+        """Load rows for states first seen after ``load_q_table`` (e.g. priors
+        make_decision created mid-run), so a later update does not overwrite
+        the untouched actions with zeros"""
+        seeded = 0
+        for index in state_ids:
+            if self.touched[index]:
+                continue
+            q_values = q_table.get(self.space.state_key(int(index)))
+            if q_values is not None:
+                self.q[index] = [q_values.get(a, 0.0) for a in ACTIONS]
+                self.touched[index] = True
+                seeded += 1
+        return seeded
+
+    def _rows(self, mask: np.ndarray) -> Dict[str, Dict[str, float]]:
+        return {self.space.state_key(int(index)): dict(zip(ACTIONS, map(float, self.q[index])))
+                for index in np.flatnonzero(mask)}
+
+    def to_q_table(self) -> Dict[str, Dict[str, float]]:
+        """Rows that were loaded or updated, keyed like ``Player.get_state``"""
+        return self._rows(self.touched)
+
+    def pop_changes(self) -> Dict[str, Dict[str, float]]:
+        """Rows updated since the previous call; writing back only these keeps
+        states the player's Q-table limit pruned from coming back"""
+        rows = self._rows(self.changed)
+        self.changed[:] = False
+        return rows
+
+
+class HandRecorder:
+    """
+    Collects one player's decisions during a hand and turns them into
+    transitions when the hand ends: every decision bootstraps from the
+    next one, and the last is terminal with the hand's reward.
+    """
+
+    def __init__(self, buffer: ReplayBuffer):
+        self.buffer = buffer
+        self.steps: List[Tuple[int, int]] = []
+
+    def record(self, state_id: Optional[int], action: str):
+        if state_id is not None and action in ACTION_INDEX:
+            self.steps.append((state_id, ACTION_INDEX[action]))
+
+    def finish(self, reward: float):
+        if self.steps:
+            states = [s for s, _ in self.steps]
+            rewards = [0.0] * (len(states) - 1) + [reward]
+            self.buffer.extend(states, [a for _, a in self.steps], rewards, states[1:] + [TERMINAL])
+        self.steps = []
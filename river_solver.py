@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Real-time river subgame solver.
+
+On the river make_decision only has rules such as "don't bluff much on
+the river". ``RiverSolver`` instead solves the river betting from the
+current spot with CFR+ and plays its average strategy for the machine's
+actual hand:
+
+    ranges     every two-card hand the board allows (1081 combos),
+               weighted by how likely each one was to take the actions of
+               this hand (``Player.own_actions`` / ``opponent_actions``):
+               raises favour strong hands, checks weak ones. Pre-flop
+               actions use the pre-flop score, later ones the river rank.
+    showdown   exact ranks from ``Player.get_hand_value`` for every combo,
+               cached per board up to suit isomorphism
+    betting    the ``cfr_solver`` river tree: fold, call, the two
+               ``calculate_raise_size`` sizes and all-in, ``MAX_RAISES``
+               raises per street
+
+Regret updates are vectorized over all combos at once, and showdown and
+fold values against a whole range cost O(combos) per terminal, card
+removal included (per-card cumulative sums over the rank order).
+
+The solve runs until its time budget (50 ms by default; POKER_RIVER_SOLVER_MS
+turns it on in the web server) and returns None when it could not finish
+``min_iterations`` in time, e.g. while a new board's ranks are still being
+computed. make_decision then falls back to the fast policy (compiled
+table, or Q-table and rules).
+"""
+
+import itertools
+import random
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cfr_solver import (CARD_INDEX, DECK, MAX_RAISES, NUM_ACTIONS, GameConfig, GameTree,
+                        hand_value, play_action, sample_action)
+from player import Player
+from suit_isomorphism import relabel, suit_permutation
+
+RIVER = 3
+BOARD_CACHE_SIZE = 16
+DTYPE = np.float32  # metade da memória a percorrer por iteração
+
+# Probabilidade de cada ação dada a força da mão (0 = pior, 1 = melhor)
+ACTION_LIKELIHOOD = {
+    'raise': lambda s: 0.1 + 0.9 * s * s,
+    'call': lambda s: 0.3 + 0.7 * s,
+    'check': lambda s: 1.0 - 0.6 * s * s,
+}
+
+
+def _percentile(values: np.ndarray) -> np.ndarray:
+    """Mid-rank percentile in [0, 1] of each value"""
+    ordered = np.sort(values)
+    below = np.searchsorted(ordered, values, 'left')
+    above = np.searchsorted(ordered, values, 'right')
+    return (below + above) / (2.0 * len(values))
+
+
+_preflop_scores: Dict[Tuple[int, int], float] = {}
+
+
+def preflop_score(a: int, b: int) -> float:
+    key = (min(a, b), max(a, b))
+    if key not in _preflop_scores:
+        _preflop_scores[key] = Player.evaluate_preflop_hand(SimpleNamespace(hand=[DECK[a], DECK[b]]))
+    return _preflop_scores[key]
+
+
+class RiverBoard:
+    """Combos, showdown ranks and card-removal indices of one river board"""
+
+    def __init__(self, board_ids: Sequence[int]):
+        remaining = [i for i in range(len(DECK)) if i not in set(board_ids)]
+        pairs = list(itertools.combinations(range(len(remaining)), 2))
+        board = [DECK[i] for i in board_ids]
+        values = [hand_value((DECK[remaining[a]], DECK[remaining[b]]), board) for a, b in pairs]
+        order = {value: rank for rank, value in enumerate(sorted(set(values)))}
+
+        self.remaining = remaining
+        self.cards = np.array(pairs)  # (N, 2) índices locais em ``remaining``
+        self.combo = {(remaining[a], remaining[b]): n for n, (a, b) in enumerate(pairs)}
+        self.ranks = np.array([order[value] for value in values])
+        self.strength = _percentile(self.ranks)
+        self.preflop = _percentile(np.array([preflop_score(remaining[a], remaining[b]) for a, b in pairs]))
+
+        ordered = np.sort(self.ranks)
+        self.order = np.argsort(self.ranks, kind='stable')
+        self.below = np.searchsorted(ordered, self.ranks, 'left')
+        self.not_above = np.searchsorted(ordered, self.ranks, 'right')
+
+        # Combos com cada carta, na ordem de rank, e a posição de cada combo nelas
+        with_card = [[] for _ in remaining]
+        for n, (a, b) in enumerate(pairs):
+            with_card[a].append(n)
+            with_card[b].append(n)
+        with_card = np.array(with_card)
+        with_card = np.take_along_axis(with_card, np.argsort(self.ranks[with_card], axis=1, kind='stable'), 1)
+        self.with_card = with_card
+        self.card_below = np.empty(self.cards.shape, dtype=np.int64)
+        self.card_not_above = np.empty(self.cards.shape, dtype=np.int64)
+        for card in range(len(remaining)):
+            card_ranks = self.ranks[with_card[card]]
+            for slot in (0, 1):
+                combos = np.nonzero(self.cards[:, slot] == card)[0]
+                self.card_below[combos, slot] = np.searchsorted(card_ranks, self.ranks[combos], 'left')
+                self.card_not_above[combos, slot] = np.searchsorted(card_ranks, self.ranks[combos], 'right')
+        # Índices planos em (carta, posição) das somas acumuladas por carta
+        width = with_card.shape[1] + 1
+        self.flat_below = [self.cards[:, s] * width + self.card_below[:, s] for s in (0, 1)]
+        self.flat_not_above = [self.cards[:, s] * width + self.card_not_above[:, s] for s in (0, 1)]
+        self.flat_total = [self.cards[:, s] * width + width - 1 for s in (0, 1)]
+        self.incidence = np.zeros((len(pairs), len(remaining)), dtype=DTYPE)
+        self.incidence[np.arange(len(pairs))[:, None], self.cards] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def showdown(self, reach: np.ndarray, win: np.ndarray, lose: np.ndarray) -> np.ndarray:
+        """
+        Showdown value of every combo against opponent reaches ``reach``
+        (terminals x combos): ``win`` per unit of weight it beats plus
+        ``lose`` per unit it loses to, ignoring combos that share a card.
+        """
+        terminals = len(reach)
+        cumulative = np.zeros((terminals, len(self) + 1), dtype=DTYPE)
+        np.cumsum(reach[:, self.order], axis=1, out=cumulative[:, 1:])
+        beats = cumulative[:, self.below]
+        loses = cumulative[:, -1:] - cumulative[:, self.not_above]
+
+        per_card = np.zeros((terminals,) + self.with_card.shape[:1] + (self.with_card.shape[1] + 1,), dtype=DTYPE)
+        np.cumsum(reach[:, self.with_card], axis=2, out=per_card[:, :, 1:])
+        per_card = per_card.reshape(terminals, -1)
+        for slot in (0, 1):
+            beats -= per_card[:, self.flat_below[slot]]
+            loses -= per_card[:, self.flat_total[slot]] - per_card[:, self.flat_not_above[slot]]
+        return beats * win[:, None] + loses * lose[:, None]
+
+    def fold(self, reach: np.ndarray, amount: np.ndarray) -> np.ndarray:
+        """``amount`` times the opponent weight that shares no card with each combo"""
+        card_total = reach @ self.incidence
+        valid = reach.sum(axis=1, keepdims=True) + reach
+        for slot in (0, 1):
+            valid -= card_total[:, self.cards[:, slot]]
+        return valid * amount[:, None]
+
+    def range_weights(self, actions: Sequence[Tuple[int, str, int]]) -> np.ndarray:
+        weights = np.ones(len(self))
+        for street, action, amount in actions:
+            label = 'check' if action == 'call' and not amount else action
+            likelihood = ACTION_LIKELIHOOD.get(label)
+            if likelihood is not None:
+                weights *= likelihood(self.preflop if street == 0 else self.strength)
+        return weights / weights.sum()
+
+
+class RiverSolver:
+    def __init__(self, budget_ms: float = 50.0, min_iterations: int = 10, rng=None):
+        self.budget = budget_ms / 1000.0
+        self.min_iterations = min_iterations
+        self.rng = rng or random.Random()
+        self.solved = 0
+        self.fallbacks = 0
+        self._boards: 'OrderedDict[Tuple[int, ...], RiverBoard]' = OrderedDict()
+
+    def board(self, board_ids: Sequence[int]) -> RiverBoard:
+        """Cached by suit-canonical board; ``solve`` relabels the hole cards to match"""
+        key = tuple(sorted(board_ids))
+        board = self._boards.get(key)
+        if board is None:
+            board = self._boards[key] = RiverBoard(key)
+            if len(self._boards) > BOARD_CACHE_SIZE:
+                self._boards.popitem(last=False)
+        else:
+            self._boards.move_to_end(key)
+        return board
+
+    def solve(self, hole, board_cards, pot: int, to_call: int, chips: int, min_raise: int,
+              own_actions=(), opponent_actions=(), deadline: Optional[float] = None):
+        """
+        Average root strategy for ``hole`` and the iterations run, or None if
+        fewer than ``min_iterations`` fit before ``deadline``.
+        """
+        deadline = deadline if deadline is not None else time.perf_counter() + self.budget
+        board_ids = [CARD_INDEX[(c.rank, c.suit)] for c in board_cards]
+        # Ranges e showdowns não dependem dos nomes dos naipes
+        suits = suit_permutation(board_ids)
+        river = self.board(relabel(board_ids, suits))
+        hero = river.combo[relabel([CARD_INDEX[(c.rank, c.suit)] for c in hole], suits)]
+
+        dead = max(pot - to_call, 0)
+        stack = dead // 2 + chips
+        contrib = [dead // 2, min(dead - dead // 2 + to_call, stack)]
+        river_actions = [a for s, a, _ in list(own_actions) + list(opponent_actions) if s == RIVER]
+        raises = min(river_actions.count('raise'), MAX_RAISES)
+        tree = GameTree(GameConfig(stack, 0, min_raise), RIVER, contrib, 0, raises,
+                        1 if river_actions or to_call else 0)
+
+        # Terminais de showdown (vence/perde) e de fold (ganho ou perda fixa), por jogador
+        showdowns = [t for t, terminal in enumerate(tree.terminals) if terminal[0] < 0]
+        folds = [t for t, terminal in enumerate(tree.terminals) if terminal[0] >= 0]
+        chips = np.array([terminal[1:] for terminal in tree.terminals], dtype=float)
+        folder = np.array([terminal[0] for terminal in tree.terminals])
+        payoffs = []
+        for p in (0, 1):
+            fold_amount = np.where(folder[folds] == p, -chips[folds, p], chips[folds, 1 - p])
+            payoffs.append(tuple(x.astype(DTYPE) for x in (chips[showdowns, 1 - p], -chips[showdowns, p], fold_amount)))
+        terminals = (showdowns, folds, payoffs)
+
+        root = np.stack([river.range_weights(own_actions), river.range_weights(opponent_actions)]).astype(DTYPE)
+        # (nó, ação, combo): os combos ficam contíguos nas operações vetorizadas.
+        # Só a estratégia média da raiz é usada, então só ela é acumulada.
+        regrets = np.zeros((len(tree), NUM_ACTIONS, len(river)), dtype=DTYPE)
+        strategy_sum = np.zeros((NUM_ACTIONS, len(river)))
+
+        iterations = 0
+        while time.perf_counter() < deadline:
+            iterations += 1
+            self._iterate(tree, river, regrets, strategy_sum, root, terminals, iterations)
+        if iterations < self.min_iterations:
+            return None
+
+        strategy = strategy_sum[:, hero]
+        total = strategy.sum()
+        return (strategy / total if total > 0 else tree.mask[0] / tree.mask[0].sum()), iterations
+
+    @staticmethod
+    def _iterate(tree, river, regrets, strategy_sum, root, terminals, t):
+        """One CFR+ iteration for both players, every combo at once"""
+        nodes, combos = len(tree), len(river)
+        sigma = []  # (ações legais, combos) por nó
+        reach = np.empty((nodes, 2, combos), dtype=DTYPE)
+        terminal_reach = np.empty((2, len(tree.terminals), combos), dtype=DTYPE)
+        reach[0] = root
+        for node in range(nodes):
+            actor, legal = tree.player[node], tree.legal[node]
+            # Regret matching+: proporcional ao regret positivo, uniforme se não houver
+            positive = regrets[node, legal]  # regrets já são >= 0
+            totals = positive.sum(axis=0)
+            node_sigma = np.divide(positive, totals, out=np.full_like(positive, 1.0 / len(legal)),
+                                   where=totals > 0)
+            sigma.append(node_sigma)
+            for i, action in enumerate(legal):
+                child = tree.children[node][action]
+                target = reach[child] if child >= 0 else terminal_reach[:, -1 - child]
+                target[:] = reach[node]
+                target[actor] *= node_sigma[i]
+
+        showdowns, folds, payoffs = terminals
+        terminal_values = np.empty_like(terminal_reach)
+        for p, (win, lose, fold_amount) in enumerate(payoffs):
+            opponent = terminal_reach[1 - p]
+            if showdowns:
+                terminal_values[p, showdowns] = river.showdown(opponent[showdowns], win, lose)
+            if folds:
+                terminal_values[p, folds] = river.fold(opponent[folds], fold_amount)
+
+        values = np.empty((nodes, 2, combos), dtype=DTYPE)
+        for node in reversed(range(nodes)):
+            actor, legal = tree.player[node], list(tree.legal[node])
+            children = [tree.children[node][a] for a in legal]
+            child_values = np.stack([values[c] if c >= 0 else terminal_values[:, -1 - c] for c in children])
+            own = child_values[:, actor]  # (ações legais, combos)
+            value = (sigma[node] * own).sum(axis=0)
+            values[node, actor] = value
+            values[node, 1 - actor] = child_values[:, 1 - actor].sum(axis=0)
+            regrets[node, legal] = np.maximum(regrets[node, legal] + own - value, 0.0)
+        # Média linear (CFR+) da estratégia da raiz, ponderada pelo alcance de quem age
+        strategy_sum[list(tree.legal[0])] += t * reach[0, tree.player[0]] * sigma[0]
+
+    def decide(self, player, community_cards, current_bet: int, min_raise: int,
+               pot_size: int = 0) -> Optional[Tuple[str, int]]:
+        """make_decision's contract on the river; None means use the fast policy"""
+        if len(community_cards) != 5 or len(player.hand) != 2:
+            return None
+        deadline = time.perf_counter() + self.budget
+        pot = pot_size or current_bet * 2
+        result = self.solve(player.hand, community_cards, pot, current_bet, player.chips, min_raise,
+                            player.own_actions, player.opponent_actions, deadline)
+        if result is None:
+            self.fallbacks += 1
+            return None
+        self.solved += 1
+        strategy, _ = result
+        action = sample_action(np.cumsum(strategy), self.rng)
+        return play_action(player, action, RIVER, current_bet, min_raise, pot)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Profiler estatístico para simulações máquina vs máquina.
+
+Em vez de instrumentar cada chamada (cProfile deixa a simulação várias
+vezes mais lenta), um timer do sistema (``setitimer``) interrompe o
+processo a cada ``interval`` segundos e o handler do sinal guarda a pilha
+de chamadas do momento. Fora da thread principal, ou sem ``setitimer``
+(Windows), uma thread amostra ``sys._current_frames()``.
+
+Saídas:
+    <prefixo>.collapsed   pilhas no formato "a;b;c contagem" (flamegraph.pl,
+                          speedscope, inferno)
+    <prefixo>.prof        compatível com pstats / snakeviz
+    relatório             tempo por bucket (avaliador, estratégia,
+                          aprendizado, I/O) e funções com mais amostras
+
+Uso:
+    python game.py --games 200 --profile perfil
+    python sampling_profiler.py perfil.prof        # mostra o .prof com pstats
+"""
+
+import marshal
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_INTERVAL = 0.005
+
+# Cada amostra vai para o primeiro bucket encontrado subindo a partir do topo da pilha
+BUCKETS = {
+    'evaluator': {'player:get_hand_value', 'player:evaluate_hand_strength',
+                  'player:_evaluate_board_texture'},
+    'strategy': {'player:make_decision', 'player:calculate_raise_size', 'player:get_state',
+                 'policy_table:decide', 'state_space:encode'},
+    'learning': {'player:update_q_value', 'player:_enforce_q_limit', 'q_table_pruning:*',
+                 'replay_buffer:*'},
+    'io': {'player:save_q_table', 'player:load_q_table', 'player:_merge_into_file',
+           'q_table_pruning:load_usage', 'json:*'},
+}
+
+FrameKey = Tuple[str, int, str]  # (arquivo, linha da definição, função), como no pstats
+
+
+def frame_label(key: FrameKey) -> str:
+    filename, _, name = key
+    module = os.path.splitext(os.path.basename(filename))[0]
+    if os.path.basename(os.path.dirname(filename)) == 'json':
+        module = 'json'
+    return f"{module}:{name}"
+
+
+def bucket_of(stack: Tuple[FrameKey, ...]) -> str:
+    for key in reversed(stack):
+        label = frame_label(key)
+        module = label.split(':', 1)[0]
+        for bucket, labels in BUCKETS.items():
+            if label in labels or f"{module}:*" in labels:
+                return bucket
+    return 'other'
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = DEFAULT_INTERVAL, clock: str = 'wall'):
+        """``clock='wall'`` conta também espera de I/O; ``'cpu'`` só tempo de CPU"""
+        self.interval = interval
+        self.clock = clock
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self._target_thread = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._previous_handler = None
+        self._start = 0.0
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def _on_signal(self, signum, frame):
+        self._record(frame)
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is not None:
+                self._record(frame)
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._target_thread = threading.get_ident()
+        use_signal = (hasattr(signal, 'setitimer')
+                      and threading.current_thread() is threading.main_thread())
+        if use_signal:
+            timer, signum = ((signal.ITIMER_PROF, signal.SIGPROF) if self.clock == 'cpu'
+                             else (signal.ITIMER_REAL, signal.SIGALRM))
+            self._timer = timer
+            self._previous_handler = signal.signal(signum, self._on_signal)
+            self._signum = signum
+            signal.setitimer(timer, self.interval, self.interval)
+        else:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="sampling-profiler",
+                                             daemon=True)
+            self._sampler.start()
+        return self
+
+    def stop(self):
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        elif self._previous_handler is not None:
+            signal.setitimer(self._timer, 0, 0)
+            signal.signal(self._signum, self._previous_handler)
+            self._previous_handler = None
+        self.elapsed += time.perf_counter() - self._start
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def seconds_per_sample(self) -> float:
+        return self.elapsed / self.samples if self.samples else self.interval
+
+    def collapsed(self) -> List[str]:
+        """Linhas "raiz;...;folha contagem" para ferramentas de flamegraph"""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            lines.append(f"{';'.join(frame_label(key) for key in stack)} {count}")
+        return lines
+
+    def bucket_times(self) -> Dict[str, float]:
+        """Segundos estimados por bucket"""
+        totals = {bucket: 0.0 for bucket in list(BUCKETS) + ['other']}
+        for stack, count in self.stacks.items():
+            totals[bucket_of(stack)] += count * self.seconds_per_sample
+        return totals
+
+    def pstats_dict(self) -> Dict:
+        """
+        Estatísticas no formato que ``pstats.Stats`` lê de um arquivo .prof.
+        Os tempos são estimados pelas amostras, e ``ncalls`` é o número de
+        amostras em que a função aparece, não o número de chamadas.
+        """
+        dt = self.seconds_per_sample
+        stats: Dict[FrameKey, list] = {}
+        for stack, count in self.stacks.items():
+            seen = set()
+            last = len(stack) - 1
+            for i, key in enumerate(stack):
+                entry = stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+                if key not in seen:  # recursão conta uma vez no tempo acumulado
+                    seen.add(key)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += count * dt
+                if i == last:
+                    entry[2] += count * dt
+                if i > 0:
+                    caller = entry[4].setdefault(stack[i - 1], [0, 0, 0.0, 0.0])
+                    caller[0] += count
+                    caller[1] += count
+                    caller[3] += count * dt
+                    if i == last:
+                        caller[2] += count * dt
+        return {key: (cc, nc, tt, ct, {c: tuple(v) for c, v in callers.items()})
+                for key, (cc, nc, tt, ct, callers) in stats.items()}
+
+    def write(self, prefix: str) -> Tuple[str, str]:
+        collapsed_path, prof_path = prefix + ".collapsed", prefix + ".prof"
+        with open(collapsed_path, "w") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        with open(prof_path, "wb") as f:
+            marshal.dump(self.pstats_dict(), f)
+        return collapsed_path, prof_path
+
+    def top_functions(self, count: int = 10) -> List[Tuple[str, float, float]]:
+        """(função, segundos próprios, segundos acumulados), por tempo próprio"""
+        rows = [(frame_label(key), tt, ct) for key, (_, _, tt, ct, _) in self.pstats_dict().items()]
+        return sorted(rows, key=lambda row: row[1], reverse=True)[:count]
+
+    def print_report(self, top: int = 10):
+        print("=" * 72)
+        print(f"🔬 PERFIL AMOSTRADO: {self.samples} amostras em {self.elapsed:.2f}s "
+              f"({self.interval * 1000:.1f} ms, relógio {self.clock})")
+        print("=" * 72)
+        times = self.bucket_times()
+        total = sum(times.values()) or 1.0
+        for bucket, seconds in sorted(times.items(), key=lambda item: item[1], reverse=True):
+            print(f"{bucket:<12}{seconds:9.3f}s {seconds / total * 100:6.1f}%")
+        print("-" * 72)
+        for label, self_time, cumulative in self.top_functions(top):
+            print(f"{label:<44}{self_time:9.3f}s próprio{cumulative:9.3f}s acum.")
+        print("=" * 72)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__.split("Uso:")[1])
+        sys.exit(1)
+    import pstats
+    pstats.Stats(sys.argv[1]).sort_stats("tottime").print_stats(20)
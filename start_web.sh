@@ -21,6 +21,16 @@ source .venv/bin/activate
 echo "📥 Verificando dependências..."
 pip install -q flask flask-cors numpy 2>/dev/null
 
+# Gerar atlas de cartas (precisa do Pillow) antes dos assets
+if [ ! -f "static/cards/atlas.json" ]; then
+    echo "🃏 Gerando atlas de cartas..."
+    python card_atlas.py || echo "⚠️  Atlas não gerado (Pillow ausente?); usando cartas em HTML"
+fi
+
+# Gerar assets com hash e comprimidos
+echo "🗜️  Gerando arquivos estáticos..."
+python build_assets.py
+
 echo ""
 echo "=============================================="
 echo "🌐 Iniciando servidor em http://localhost:5001"
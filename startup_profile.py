@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Perfil do tempo de import dos pontos de entrada.
+
+Roda ``python -X importtime -c "import <módulo>"`` em um processo novo para
+cada ponto de entrada e mostra o tempo total e os imports mais caros. Com
+--budget-ms termina com código 1 se o import do motor (``CORE_MODULES``)
+passar do orçamento, para uso em testes de regressão.
+
+Uso:
+    python startup_profile.py                     # todos os pontos de entrada
+    python startup_profile.py poker_web --top 20
+    python startup_profile.py --budget-ms 300 player game
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ENTRY_POINTS = ['player', 'game', 'poker_app', 'poker_text', 'poker_web', 'poker_gui']
+# O motor do jogo não deve carregar nada disso no import
+CORE_MODULES = ['card', 'deck', 'player', 'poker_game', 'game', 'poker_app']
+HEAVY_MODULES = ['numpy', 'flask', 'PIL', 'tkinter']
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Linhas de -X importtime como dicts {name, depth, self_us, cumulative_us}"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # cabeçalho
+        name = parts[2].rstrip()
+        entries.append({
+            'name': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_us': int(parts[0]),
+            'cumulative_us': int(parts[1]),
+        })
+    return entries
+
+
+def profile_import(module: str, python: str = sys.executable) -> Dict:
+    """Importa ``module`` em um processo novo e mede o custo"""
+    start = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    entries = parse_importtime(proc.stderr)
+    top_level = [e for e in entries if e['name'] == module]
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "falhou"
+    return {
+        'module': module,
+        'ok': proc.returncode == 0,
+        'error': error,
+        'wall_ms': wall_ms,
+        'import_ms': top_level[-1]['cumulative_us'] / 1000 if top_level else 0.0,
+        'entries': entries,
+    }
+
+
+def heavy_imports(modules: List[str], python: str = sys.executable) -> List[str]:
+    """Módulos de HEAVY_MODULES carregados ao importar ``modules``"""
+    code = ("import sys\n" + "".join(f"import {m}\n" for m in modules) +
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    proc = subprocess.run([python, "-c", code], capture_output=True, text=True, check=True)
+    return [m for m in proc.stdout.strip().split(",") if m]
+
+
+def top_imports(entries: List[Dict], count: int = 10) -> List[Dict]:
+    """Imports com maior tempo próprio"""
+    return sorted(entries, key=lambda e: e['self_us'], reverse=True)[:count]
+
+
+def print_report(results: List[Dict], top: int):
+    print("=" * 72)
+    print("⏱️  TEMPO DE IMPORT DOS PONTOS DE ENTRADA")
+    print("=" * 72)
+    for result in results:
+        if not result['ok']:
+            print(f"{result['module']:<14} ❌ {result['error']}")
+            continue
+        print(f"{result['module']:<14} import {result['import_ms']:8.1f} ms | "
+              f"processo {result['wall_ms']:8.1f} ms")
+        for entry in top_imports(result['entries'], top):
+            print(f"    {entry['name']:<40}{entry['self_us'] / 1000:8.1f} ms próprio"
+                  f"{entry['cumulative_us'] / 1000:10.1f} ms total")
+    print("=" * 72)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perfil de import dos pontos de entrada")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--top", type=int, default=5, help="imports mais caros por módulo")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="orçamento para o import dos módulos do motor")
+    parser.add_argument("--json", dest="json_path", help="salva os resultados em JSON")
+    args = parser.parse_args(argv)
+
+    results = [profile_import(module) for module in args.modules]
+    print_report(results, args.top)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([{k: v for k, v in r.items() if k != 'entries'} for r in results], f, indent=4)
+
+    failures = []
+    core = [r for r in results if r['module'] in CORE_MODULES]
+    heavy = heavy_imports([r['module'] for r in core if r['ok']]) if core else []
+    if heavy:
+        failures.append(f"o motor importa módulos pesados: {', '.join(heavy)}")
+    if args.budget_ms is not None:
+        for result in core:
+            if result['import_ms'] > args.budget_ms:
+                failures.append(f"{result['module']}: {result['import_ms']:.1f}ms > {args.budget_ms}ms")
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Bounded, discretized state space for the Q-learner.
+
+``Player.get_state`` used to print hand strength, stack ratio, bet ratio,
+pot odds and opponent aggression with two decimals. Stack ratios have no
+upper bound, so long sessions kept minting states that were seen once.
+A ``StateSpace`` maps every continuous feature to a fixed set of buckets,
+so the number of states is known up front (``StateSpace.size``) and every
+state has a dense integer index.
+
+State keys keep the old layout
+``phase_texture_position_hs_chips_bet_potodds_opp``; each number is the
+representative value of its bucket, so existing tools that parse keys
+(policy_table.py) keep working. Pot odds are derived from the bet ratio,
+so they add no extra dimension.
+
+A Q-table saved with the raw keys is mapped onto the space when the
+player loads it (``rebucket_q_table``): states that fall in the same
+bucket are averaged instead of being left unused.
+
+Schemes:
+    uniform   20 equal hand-strength bins (default)
+    equity    hand-strength edges at the hand-category scores
+    quantile  edges fitted to observed values (``fit_quantiles``)
+
+Uso:
+    python state_space.py q_table.json "Máquina"   # ocupação e bins sugeridos
+"""
+
+import json
+import sys
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+PHASES = ('preflop', 'flop', 'turn', 'river')
+TEXTURES = ('none', 'dry', 'wet', 'very_wet', 'paired')
+POSITIONS = ('early', 'late', 'unknown')
+FEATURES = ('hand_strength', 'chips_ratio', 'bet_ratio', 'opp_aggression')
+
+# Thresholds of the make_decision overrides on bet / stack
+BET_EDGES = (0.0, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.7)
+# evaluate_hand_strength base scores of each hand category
+EQUITY_EDGES = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95)
+
+
+class Buckets:
+    """
+    Bins over one feature: bucket k holds values in (edges[k-1], edges[k]].
+
+    A value counts as above an edge only when strictly greater, the same
+    way make_decision compares against its thresholds.
+    """
+
+    def __init__(self, edges: Sequence[float], low: float = 0.0, high: Optional[float] = None,
+                 values: Optional[Sequence[float]] = None):
+        self.edges = tuple(edges)
+        if list(self.edges) != sorted(set(self.edges)):
+            raise ValueError("os limites dos bins devem ser estritamente crescentes")
+        if values is None:
+            top = high if high is not None else (self.edges[-1] * 2 if self.edges else 1.0)
+            bounds = (low,) + self.edges + (top,)
+            values = [(bounds[k] + bounds[k + 1]) / 2 for k in range(len(self.edges) + 1)]
+        if len(values) != len(self.edges) + 1:
+            raise ValueError("é preciso um valor representativo por bin")
+        self.values = tuple(values)
+
+    @classmethod
+    def uniform(cls, bins: int, low: float = 0.0, high: float = 1.0) -> 'Buckets':
+        width = (high - low) / bins
+        return cls([low + width * k for k in range(1, bins)], low, high)
+
+    @classmethod
+    def quantiles(cls, samples: Iterable[float], bins: int, low: float = 0.0,
+                  high: Optional[float] = None) -> 'Buckets':
+        """Edges at the sample quantiles (duplicates collapse, so maybe fewer bins)"""
+        ordered = sorted(samples)
+        if not ordered:
+            raise ValueError("sem amostras para calcular quantis")
+        edges = []
+        for k in range(1, bins):
+            edge = ordered[min(len(ordered) - 1, k * len(ordered) // bins)]
+            if not edges or edge > edges[-1]:
+                edges.append(edge)
+        return cls(edges, low, high if high is not None else ordered[-1])
+
+    def __len__(self):
+        return len(self.values)
+
+    def bucket(self, x: float) -> int:
+        return bisect_left(self.edges, x)
+
+    def value(self, bucket: int) -> float:
+        return self.values[bucket]
+
+
+class StateSpace:
+    def __init__(self, hand_strength: Buckets, chips_ratio: Buckets, bet_ratio: Buckets,
+                 opp_aggression: Buckets, name: str = "custom"):
+        self.name = name
+        self.buckets = {
+            'hand_strength': hand_strength,
+            'chips_ratio': chips_ratio,
+            'bet_ratio': bet_ratio,
+            'opp_aggression': opp_aggression,
+        }
+        self.shape = (len(PHASES), len(TEXTURES), len(POSITIONS)) + tuple(
+            len(self.buckets[f]) for f in FEATURES)
+        self.size = 1
+        for dim in self.shape:
+            self.size *= dim
+        # Texto de cada valor representativo, para reconhecer chaves já discretizadas
+        self._labels = {feature: {f"{value:.2f}" for value in self.buckets[feature].values}
+                        for feature in FEATURES}
+
+    def encode(self, phase: str, texture: str, position: str, hand_strength: float,
+               chips_ratio: float, bet_ratio: float, opp_aggression: float) -> Tuple[int, str]:
+        """Dense index and key of a situation"""
+        coords = (
+            PHASES.index(phase),
+            TEXTURES.index(texture),
+            POSITIONS.index(position) if position in POSITIONS else POSITIONS.index('unknown'),
+            self.buckets['hand_strength'].bucket(hand_strength),
+            self.buckets['chips_ratio'].bucket(chips_ratio),
+            self.buckets['bet_ratio'].bucket(bet_ratio),
+            self.buckets['opp_aggression'].bucket(opp_aggression),
+        )
+        index = 0
+        for coord, dim in zip(coords, self.shape):
+            index = index * dim + coord
+        return index, self.key(coords)
+
+    def key(self, coords: Sequence[int]) -> str:
+        phase, texture, position, hs, chips, bet, opp = coords
+        bet_value = self.buckets['bet_ratio'].value(bet)
+        return (f"{PHASES[phase]}_{TEXTURES[texture]}_{POSITIONS[position]}_"
+                f"{self.buckets['hand_strength'].value(hs):.2f}_"
+                f"{self.buckets['chips_ratio'].value(chips):.2f}_"
+                f"{bet_value:.2f}_{bet_value / (1 + bet_value):.2f}_"
+                f"{self.buckets['opp_aggression'].value(opp):.2f}")
+
+    def is_key(self, state: str) -> bool:
+        """Whether ``state`` is one of this space's keys (False for legacy raw-value keys)"""
+        parts = state.split('_')
+        if len(parts) < 8:
+            return False
+        hs, chips, bet, pot_odds, opp = parts[-5:]
+        labels = self._labels
+        if not (hs in labels['hand_strength'] and chips in labels['chips_ratio']
+                and bet in labels['bet_ratio'] and opp in labels['opp_aggression']):
+            return False
+        return pot_odds == f"{float(bet) / (1 + float(bet)):.2f}"
+
+    def coords(self, index: int) -> Tuple[int, ...]:
+        coords = []
+        for dim in reversed(self.shape):
+            index, coord = divmod(index, dim)
+            coords.append(coord)
+        return tuple(reversed(coords))
+
+    def state_key(self, index: int) -> str:
+        return self.key(self.coords(index))
+
+    def fit_quantiles(self, samples: Dict[str, List[float]], bins: Optional[Dict[str, int]] = None,
+                      name: str = "quantile") -> 'StateSpace':
+        """Same space with quantile edges for the features present in ``samples``"""
+        buckets = dict(self.buckets)
+        for feature, values in samples.items():
+            if values:
+                count = (bins or {}).get(feature, len(self.buckets[feature]))
+                buckets[feature] = Buckets.quantiles(values, count)
+        return StateSpace(name=name, **buckets)
+
+
+def _base_buckets() -> Dict[str, Buckets]:
+    return {
+        'chips_ratio': Buckets((0.2, 0.5, 0.8, 1.2, 2.0), 0.0, 3.0),
+        'bet_ratio': Buckets(BET_EDGES, 0.0, 1.0),
+        'opp_aggression': Buckets((0.33, 0.67), values=(0.2, 0.5, 0.8)),
+    }
+
+
+SCHEMES = {
+    'uniform': lambda: StateSpace(Buckets.uniform(20), name='uniform', **_base_buckets()),
+    'equity': lambda: StateSpace(Buckets(EQUITY_EDGES, 0.0, 1.0), name='equity', **_base_buckets()),
+}
+
+DEFAULT_STATE_SPACE = SCHEMES['uniform']()
+
+
+def make_state_space(scheme: str = 'uniform') -> StateSpace:
+    if scheme not in SCHEMES:
+        raise ValueError(f"esquema desconhecido: {scheme} (use {', '.join(SCHEMES)})")
+    return SCHEMES[scheme]()
+
+
+def parse_state(state: str) -> Optional[Dict]:
+    """Fields of a get_state key (legacy or bucketed); None if it does not parse"""
+    parts = state.split('_')
+    if len(parts) < 8 or parts[0] not in PHASES:
+        return None
+    try:
+        numbers = [float(x) for x in parts[-5:]]
+    except ValueError:
+        return None
+    return {
+        'phase': parts[0],
+        'texture': '_'.join(parts[1:-6]),
+        'position': parts[-6],
+        'hand_strength': numbers[0],
+        'chips_ratio': numbers[1],
+        'bet_ratio': numbers[2],
+        'opp_aggression': numbers[4],
+    }
+
+
+def visit_report(space: StateSpace, visits: Counter) -> Dict:
+    """
+    Occupancy of the space: how many states were visited, how many only
+    once, and the visit histogram of each feature's buckets.
+    """
+    total = sum(visits.values())
+    histograms = {feature: [0] * len(space.buckets[feature]) for feature in FEATURES}
+    for index, count in visits.items():
+        coords = space.coords(index)
+        for offset, feature in enumerate(FEATURES, start=3):
+            histograms[feature][coords[offset]] += count
+    return {
+        'scheme': space.name,
+        'size': space.size,
+        'visited': len(visits),
+        'occupancy': len(visits) / space.size,
+        'visits': total,
+        'singletons': sum(1 for count in visits.values() if count == 1),
+        'histograms': histograms,
+    }
+
+
+def rebucket_q_table(q_table: Dict[str, Dict[str, float]], space: StateSpace) -> Tuple[Dict, Counter]:
+    """
+    Map an existing table onto ``space``: Q-values of states that land in
+    the same bucket are averaged. Returns the new table and the number of
+    old states per bucket.
+    """
+    sums: Dict[int, Dict[str, float]] = {}
+    counts: Counter = Counter()
+    for state, q_values in q_table.items():
+        fields = parse_state(state)
+        if fields is None or fields['texture'] not in TEXTURES:
+            continue
+        index, _ = space.encode(**fields)
+        row = sums.setdefault(index, {'fold': 0.0, 'call': 0.0, 'raise': 0.0})
+        for action in row:
+            row[action] += q_values.get(action, 0.0)
+        counts[index] += 1
+    table = {space.state_key(index): {a: v / counts[index] for a, v in row.items()}
+             for index, row in sums.items()}
+    return table, counts
+
+
+def print_report(report: Dict):
+    print(f"Esquema: {report['scheme']} | estados possíveis: {report['size']} | "
+          f"visitados: {report['visited']} ({report['occupancy'] * 100:.2f}%) | "
+          f"visitados uma vez: {report['singletons']}")
+    for feature, histogram in report['histograms'].items():
+        print(f"   {feature:<16}{histogram}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__.split("Uso:")[1])
+        sys.exit(1)
+    with open(sys.argv[1], "r") as f:
+        q_table = json.load(f).get(sys.argv[2], {})
+    print(f"Q-table atual: {len(q_table)} estados")
+
+    samples: Dict[str, List[float]] = {feature: [] for feature in FEATURES}
+    for state in q_table:
+        fields = parse_state(state)
+        if fields:
+            for feature in FEATURES:
+                samples[feature].append(fields[feature])
+
+    spaces = [make_state_space(name) for name in SCHEMES]
+    if q_table:
+        spaces.append(DEFAULT_STATE_SPACE.fit_quantiles(
+            {'hand_strength': samples['hand_strength'], 'chips_ratio': samples['chips_ratio']}))
+    for space in spaces:
+        _, counts = rebucket_q_table(q_table, space)
+        print_report(visit_report(space, counts))
+        if space.name == 'quantile':
+            for feature in ('hand_strength', 'chips_ratio'):
+                edges = ", ".join(f"{e:.2f}" for e in space.buckets[feature].edges)
+                print(f"   limites sugeridos para {feature}: {edges}")
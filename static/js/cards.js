@@ -20,6 +20,15 @@ const RANK_DISPLAY = {
     'J': 'J', 'Q': 'Q', 'K': 'K', 'A': 'A'
 };
 
+/**
+ * Whether the sprite sheet from card_atlas.py is loaded (cards-sprite.css)
+ * @returns {boolean}
+ */
+function cardSpritesEnabled() {
+    return getComputedStyle(document.documentElement)
+        .getPropertyValue('--card-sprites').trim() === '1';
+}
+
 /**
  * Create a card element
  * @param {Object} card - Card object with rank and suit
@@ -38,6 +47,13 @@ function createCard(card) {
     const rank = RANK_DISPLAY[card.rank] || card.rank;
     const color = SUIT_COLORS[card.suit] || 'black';
 
+    // Pre-rendered atlas: the same artwork as the desktop GUI
+    if (cardSpritesEnabled()) {
+        cardEl.classList.add('card-sprite', `card-sprite-${card.rank}-${card.suit}`);
+        cardEl.setAttribute('aria-label', `${rank}${suit}`);
+        return cardEl;
+    }
+
     cardEl.classList.add(`card-${color}`);
 
     // Card content
@@ -63,6 +79,9 @@ function createCard(card) {
 function createCardBack() {
     const cardEl = document.createElement('div');
     cardEl.className = 'card card-back';
+    if (cardSpritesEnabled()) {
+        cardEl.classList.add('card-sprite', 'card-sprite-back');
+    }
     return cardEl;
 }
 
@@ -80,7 +99,7 @@ function renderCards(containerId, cards, showBack = false) {
 
     if (!cards || cards.length === 0) {
         // Show placeholders
-        const numPlaceholders = containerId === 'communityCards' ? 5 : 2;
+        const numPlaceholders = containerId === 'community-cards' ? 5 : 2;
         for (let i = 0; i < numPlaceholders; i++) {
             container.appendChild(createCard(null));
         }
@@ -96,7 +115,7 @@ function renderCards(containerId, cards, showBack = false) {
     });
 
     // Fill remaining slots with placeholders for community cards
-    if (containerId === 'communityCards') {
+    if (containerId === 'community-cards') {
         const remaining = 5 - cards.length;
         for (let i = 0; i < remaining; i++) {
             container.appendChild(createCard(null));
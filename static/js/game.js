@@ -63,6 +63,7 @@ class PokerGame {
     async performAction(action, amount = 0) {
         try {
             this.disableButtons();
+            const previousSeq = this.currentState ? this.currentState.machine_action_seq : null;
 
             const response = await fetch(`${this.baseUrl}/api/game/action`, {
                 method: 'POST',
@@ -82,15 +83,10 @@ class PokerGame {
                 return;
             }
 
-            // Show machine action
-            if (data.machine_action) {
-                const actionText = {
-                    'call': 'pagou',
-                    'raise': 'aumentou',
-                    'fold': 'desistiu'
-                }[data.machine_action] || data.machine_action;
-
-                this.showMessage(`Máquina ${actionText}`, 'info');
+            // The machine decides in the background; wait for its reply
+            if (data.machine_thinking) {
+                this.showMessage('Máquina pensando...', 'info');
+                await this.waitForMachine(previousSeq);
             }
 
             await this.updateGameState();
@@ -110,6 +106,37 @@ class PokerGame {
         }
     }
 
+    /**
+     * Poll the state until the machine's queued action has been applied
+     */
+    async waitForMachine(previousSeq, intervalMs = 250, timeoutMs = 15000) {
+        const started = Date.now();
+        while (Date.now() - started < timeoutMs) {
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+            const state = await this.getGameState();
+            if (state && !state.machine_thinking) {
+                if (state.last_machine_action && state.machine_action_seq !== previousSeq) {
+                    this.showMachineAction(state.last_machine_action.action);
+                }
+                return state;
+            }
+        }
+        return null;
+    }
+
+    /**
+     * Show the machine's last action
+     */
+    showMachineAction(action) {
+        const actionText = {
+            'call': 'pagou',
+            'raise': 'aumentou',
+            'fold': 'desistiu'
+        }[action] || action;
+
+        this.showMessage(`Máquina ${actionText}`, 'info');
+    }
+
     /**
      * Update the UI with current game state
      */
@@ -120,51 +147,44 @@ class PokerGame {
         this.currentState = state;
 
         // Update phase
-        const phaseText = {
-            'waiting': 'AGUARDANDO',
-            'preflop': 'PRÉ-FLOP',
-            'flop': 'FLOP',
-            'turn': 'TURN',
-            'river': 'RIVER',
-            'showdown': 'SHOWDOWN'
-        }[state.phase] || state.phase.toUpperCase();
-
-        document.getElementById('gamePhase').textContent = phaseText;
+        document.querySelectorAll('.phase-item').forEach(item => {
+            item.classList.toggle('active', item.dataset.phase === state.phase);
+        });
 
         // Update chips
-        document.getElementById('playerChips').textContent = state.player.chips;
-        document.getElementById('machineChips').textContent = state.machine.chips;
-        document.getElementById('pot').textContent = state.pot;
-        document.getElementById('currentBet').textContent = state.current_bet;
-        document.getElementById('totalChips').textContent =
+        document.getElementById('player-chips').textContent = state.player.chips;
+        document.getElementById('opponent-chips').textContent = state.machine.chips;
+        document.getElementById('pot-amount').textContent = state.pot;
+        document.getElementById('call-amount').textContent = state.current_bet || '';
+        document.getElementById('total-chips').textContent =
             state.player.chips + state.machine.chips + state.pot;
 
         // Update cards
         if (state.player && state.player.hand) {
-            renderCards('playerHand', state.player.hand, false);
+            renderCards('player-cards', state.player.hand, false);
 
             // Update hand strength
             const strength = getHandStrength(state.player.hand, state.community_cards);
-            document.getElementById('handStrength').textContent = strength;
+            document.getElementById('player-cards').title = strength;
         }
 
         // Machine cards (show backs unless game is over)
         if (state.game_over && state.machine && state.machine.hand) {
             // Show machine cards at showdown
-            renderCards('machineHand', state.machine.hand, false);
+            renderCards('opponent-cards', state.machine.hand, false);
         } else if (state.machine && state.machine.hand_count > 0) {
             // Show card backs
             const backs = Array(state.machine.hand_count).fill({});
-            renderCards('machineHand', backs, true);
+            renderCards('opponent-cards', backs, true);
         } else {
-            renderCards('machineHand', [], false);
+            renderCards('opponent-cards', [], false);
         }
 
         // Community cards
-        renderCards('communityCards', state.community_cards || [], false);
+        renderCards('community-cards', state.community_cards || [], false);
 
         // Update button states
-        if (state.game_over || !state.initialized) {
+        if (state.game_over || !state.initialized || state.machine_thinking) {
             this.disableButtons();
         } else {
             this.enableButtons();
@@ -175,8 +195,8 @@ class PokerGame {
      * Show winner announcement
      */
     showWinner(winner) {
-        const overlay = document.getElementById('winnerOverlay');
-        const text = document.getElementById('winnerText');
+        const overlay = document.getElementById('game-message');
+        const text = overlay.querySelector('p');
 
         if (winner === 'Empate') {
             text.textContent = '🤝 EMPATE!';
@@ -184,22 +204,22 @@ class PokerGame {
             text.textContent = `🏆 ${winner.toUpperCase()} VENCEU!`;
         }
 
-        overlay.style.display = 'flex';
+        overlay.style.display = 'block';
     }
 
     /**
      * Hide winner announcement
      */
     hideWinner() {
-        document.getElementById('winnerOverlay').style.display = 'none';
+        document.getElementById('game-message').style.display = 'none';
     }
 
     /**
      * Show temporary message
      */
     showMessage(message, type = 'info') {
-        const messageBox = document.getElementById('messageBox');
-        messageBox.textContent = message;
+        const messageBox = document.getElementById('game-message');
+        messageBox.querySelector('p').textContent = message;
         messageBox.style.display = 'block';
 
         // Auto-hide after 3 seconds
@@ -212,18 +232,18 @@ class PokerGame {
      * Enable action buttons
      */
     enableButtons() {
-        document.getElementById('callBtn').disabled = false;
-        document.getElementById('raiseBtn').disabled = false;
-        document.getElementById('foldBtn').disabled = false;
+        document.getElementById('btn-call').disabled = false;
+        document.getElementById('btn-raise').disabled = false;
+        document.getElementById('btn-fold').disabled = false;
     }
 
     /**
      * Disable action buttons
      */
     disableButtons() {
-        document.getElementById('callBtn').disabled = true;
-        document.getElementById('raiseBtn').disabled = true;
-        document.getElementById('foldBtn').disabled = true;
+        document.getElementById('btn-call').disabled = true;
+        document.getElementById('btn-raise').disabled = true;
+        document.getElementById('btn-fold').disabled = true;
     }
 
     /**
@@ -277,6 +297,11 @@ function hideWinner() {
 // Initialize game when page loads
 document.addEventListener('DOMContentLoaded', () => {
     console.log('Page loaded, initializing game...');
+    document.getElementById('btn-fold').addEventListener('click', () => performAction('fold'));
+    document.getElementById('btn-call').addEventListener('click', () => performAction('call'));
+    document.getElementById('btn-raise').addEventListener('click', () => performAction('raise'));
+    document.getElementById('btn-new-hand').addEventListener('click', newHand);
+    document.getElementById('btn-new-game').addEventListener('click', newGame);
     game.init();
 });
 
@@ -3,10 +3,25 @@
 Script de teste para demonstrar a nova estratégia da IA
 """
 
-from poker_app import Player, Card
+import os
+import tempfile
+
+from player import Player
+from card import Card
 
 def test_ai_decisions():
     """Testa diferentes cenários de decisão da IA"""
+    # A máquina grava q_table.json, q_table_usage.json e opponent_models.json
+    # no diretório atual: roda num diretório temporário para não sujar o repositório
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        try:
+            _ai_decisions()
+        finally:
+            os.chdir(cwd)
+
+def _ai_decisions():
 
     print("=" * 70)
     print("🤖 TESTE DA NOVA ESTRATÉGIA DA MÁQUINA")
@@ -0,0 +1,82 @@
+import threading
+import time
+import unittest
+
+from ai_worker_pool import DecisionWorkerPool, PoolSaturatedError
+
+
+class TestDecisionWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = DecisionWorkerPool(max_workers=4, max_pending=8, max_queue_wait=5.0)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_same_table_runs_in_order(self):
+        order = []
+
+        def job(i):
+            def run():
+                time.sleep(0.01 if i % 2 == 0 else 0)
+                order.append(i)
+                return i
+            return run
+
+        futures = [self.pool.submit("t1", job(i)) for i in range(6)]
+        results = [f.result(timeout=5) for f in futures]
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(order, list(range(6)))
+        self.assertEqual(self.pool.queue_depth, 0)
+
+    def test_tables_run_in_parallel(self):
+        release = threading.Event()
+        blocked = self.pool.submit("slow", lambda: release.wait(5))
+        fast = self.pool.submit("fast", lambda: "done")
+        self.assertEqual(fast.result(timeout=5), "done")
+        self.assertFalse(blocked.done())
+        release.set()
+        self.assertTrue(blocked.result(timeout=5))
+
+    def test_expired_job_uses_fallback(self):
+        pool = DecisionWorkerPool(max_workers=1, max_pending=8, max_queue_wait=0.01)
+        release = threading.Event()
+        pool.submit("t1", lambda: release.wait(5))
+        late = pool.submit("t1", lambda: "decision", fallback=lambda: "fallback")
+        time.sleep(0.05)
+        release.set()
+        self.assertEqual(late.result(timeout=5), "fallback")
+        self.assertEqual(pool.expired, 1)
+        pool.shutdown()
+
+    def test_started_job_is_not_cut_short(self):
+        pool = DecisionWorkerPool(max_workers=1, max_pending=8, max_queue_wait=0.01)
+
+        def slow():
+            time.sleep(0.05)
+            return "decision"
+
+        self.assertEqual(pool.submit("t1", slow, fallback=lambda: "fallback").result(timeout=5), "decision")
+        self.assertEqual(pool.expired, 0)
+        pool.shutdown()
+
+    def test_saturation_raises(self):
+        release = threading.Event()
+        for _ in range(8):
+            self.pool.submit("t1", lambda: release.wait(5))
+        with self.assertRaises(PoolSaturatedError):
+            self.pool.submit("t2", lambda: None)
+        release.set()
+
+    def test_exception_propagates_and_table_continues(self):
+        def boom():
+            raise ValueError("bad decision")
+
+        failed = self.pool.submit("t1", boom)
+        after = self.pool.submit("t1", lambda: "ok")
+        with self.assertRaises(ValueError):
+            failed.result(timeout=5)
+        self.assertEqual(after.result(timeout=5), "ok")
+
+
+if __name__ == '__main__':
+    unittest.main()
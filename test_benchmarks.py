@@ -0,0 +1,49 @@
+import unittest
+from unittest import mock
+
+from benchmarks import BENCHMARKS, HAND_CATEGORIES, bench_player, cards, compare, measure
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_hand_fixtures_hit_their_category(self):
+        names = [bench_player(hand).get_hand_value(cards(board))[0]
+                 for hand, board in HAND_CATEGORIES.values()]
+        self.assertEqual(len(set(names)), len(HAND_CATEGORIES))
+
+    def test_every_benchmark_runs(self):
+        for name, setup in BENCHMARKS.items():
+            with self.subTest(name):
+                setup()()
+
+    def test_heads_up_hands_start_and_end(self):
+        players = []
+
+        def create(*args):
+            players.append(bench_player(*args))
+            return players[-1]
+
+        with mock.patch('benchmarks.bench_player', side_effect=create):
+            play_hand = BENCHMARKS['heads_up_hand']()
+        for _ in range(40):
+            play_hand()
+        for player, opponent in zip(players, reversed(players)):
+            # As ações guardadas são só as da última mão e cada mão fecha no modelo do oponente
+            self.assertLessEqual(len(player.own_actions), 8)
+            self.assertEqual(list(player.opponent_models), [opponent.name])
+            self.assertGreater(player.opponent_models[opponent.name].hands, 10)
+
+    def test_measure_fields(self):
+        result = measure(lambda: None, warmup=1, repeat=3, min_time=0.001)
+        self.assertEqual(result['repeat'], 3)
+        self.assertLessEqual(result['min_us'], result['median_us'])
+
+    def test_compare_flags_only_regressions_past_threshold(self):
+        baseline = {'a': {'median_us': 10.0}, 'b': {'median_us': 10.0}}
+        results = {'a': {'median_us': 11.0}, 'b': {'median_us': 13.0}, 'new': {'median_us': 1.0}}
+        regressions = compare(results, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('b:'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from build_assets import build
+
+
+class TestBuildAssets(unittest.TestCase):
+    def setUp(self):
+        self.static = tempfile.mkdtemp()
+        self.dist = os.path.join(self.static, "dist")
+        os.makedirs(os.path.join(self.static, "js"))
+        os.makedirs(os.path.join(self.static, "css"))
+        with open(os.path.join(self.static, "js", "game.js"), "w") as f:
+            f.write("console.log('poker');\n" * 50)
+        with open(os.path.join(self.static, "css", "style.css"), "w") as f:
+            f.write("body { color: green; }\n" * 50)
+        with open(os.path.join(self.static, "index.html"), "w") as f:
+            f.write('<link href="/static/css/style.css"><script src="/static/js/game.js"></script>')
+
+    def tearDown(self):
+        shutil.rmtree(self.static)
+
+    def test_hashed_and_compressed(self):
+        manifest = build(self.static, self.dist)
+        self.assertEqual(set(manifest), {"js/game.js", "css/style.css"})
+        for original, hashed in manifest.items():
+            self.assertNotEqual(original, hashed)
+            path = os.path.join(self.dist, hashed)
+            with open(os.path.join(self.static, original), "rb") as f:
+                source = f.read()
+            with gzip.open(path + ".gz", "rb") as f:
+                self.assertEqual(f.read(), source)
+            self.assertLess(os.path.getsize(path + ".gz"), len(source))
+
+        with open(os.path.join(self.dist, "index.html")) as f:
+            html = f.read()
+        self.assertIn(f"/assets/{manifest['js/game.js']}", html)
+        self.assertNotIn("/static/js/game.js", html)
+        with open(os.path.join(self.dist, "manifest.json")) as f:
+            self.assertEqual(json.load(f), manifest)
+
+    def test_hash_follows_content(self):
+        first = build(self.static, self.dist)
+        self.assertEqual(build(self.static, self.dist), first)
+        with open(os.path.join(self.static, "js", "game.js"), "a") as f:
+            f.write("// changed\n")
+        second = build(self.static, self.dist)
+        self.assertNotEqual(second["js/game.js"], first["js/game.js"])
+        self.assertEqual(second["css/style.css"], first["css/style.css"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from card_atlas import COLUMNS, ROWS, build_atlas, load_atlas
+
+
+class TestCardAtlas(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.css_path = os.path.join(self.tmpdir, "cards-sprite.css")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_build_and_crop(self):
+        index = build_atlas(scales=(1, 2), atlas_dir=self.tmpdir, css_path=self.css_path)
+        self.assertEqual(len(index["cards"]), 53)
+        self.assertEqual(set(index["scales"]), {"1", "2"})
+
+        atlas = load_atlas(1, atlas_dir=self.tmpdir)
+        self.assertEqual(atlas.image.size, (COLUMNS * 140, ROWS * 196))
+        self.assertEqual(atlas.crop("A_Spades").size, (140, 196))
+        self.assertEqual(atlas.crop("back").size, (140, 196))
+
+        hidpi = load_atlas(2, atlas_dir=self.tmpdir)
+        self.assertEqual(hidpi.crop("10_Hearts").size, (280, 392))
+
+        with open(self.css_path) as f:
+            css = f.read()
+        self.assertIn("--card-sprites: 1", css)
+        self.assertIn(".card-sprite.card-sprite-10-Hearts", css)
+        self.assertIn("cards_atlas@2x.png') 2x", css)
+
+    def test_missing_atlas_returns_none(self):
+        self.assertIsNone(load_atlas(1, atlas_dir=self.tmpdir))
+
+
+if __name__ == '__main__':
+    unittest.main()
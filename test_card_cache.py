@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import ImageFont
+
+from card_cache import CardImageCache, file_fingerprint, font_fingerprint
+
+
+class TestCardImageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def make_cache(self, scale=1.0, theme="#DC143C|#000000", fonts="dejavu"):
+        width, height = int(140 * scale), int(196 * scale)
+        return CardImageCache(self.tmpdir, width, height, scale, theme, fonts)
+
+    def test_miss_then_hit(self):
+        cache = self.make_cache()
+        data = bytes(i % 256 for i in range(140 * 196 * 4))
+        self.assertIsNone(cache.load("A_Spades"))
+        cache.store("A_Spades", data)
+        self.assertEqual(cache.load("A_Spades"), data)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Outro processo/sessão com a mesma configuração reaproveita o arquivo
+        self.assertEqual(self.make_cache().load("A_Spades"), data)
+
+    def test_variants_are_isolated(self):
+        cache = self.make_cache()
+        cache.store("back", b"\0" * (140 * 196 * 4))
+        self.assertIsNone(self.make_cache(scale=2).load("back"))
+        self.assertIsNone(self.make_cache(theme="#FF0000|#000000").load("back"))
+        self.assertIsNone(self.make_cache(fonts="arial").load("back"))
+
+    def test_truncated_file_is_a_miss(self):
+        cache = self.make_cache()
+        cache.store("K_Hearts", b"\0" * 10)
+        self.assertIsNone(cache.load("K_Hearts"))
+
+    def test_file_fingerprint_tracks_changes(self):
+        font = os.path.join(self.tmpdir, "font.ttf")
+        with open(font, "wb") as f:
+            f.write(b"a")
+        before = file_fingerprint([font])
+        with open(font, "wb") as f:
+            f.write(b"ab")
+        self.assertNotEqual(file_fingerprint([font]), before)
+        self.assertEqual(file_fingerprint(["/nonexistent.ttf"]), "/nonexistent.ttf")
+
+    def test_font_fingerprint_uses_the_loaded_file(self):
+        default = ImageFont.load_default()
+        self.assertEqual(font_fingerprint([default]), type(default).__name__)
+        font = os.path.join(self.tmpdir, "fallback.ttf")
+        with open(font, "wb") as f:
+            f.write(b"a")
+        loaded = type("Font", (), {"path": font})()
+        before = font_fingerprint([loaded])
+        self.assertIn(font, before)
+        with open(font, "wb") as f:
+            f.write(b"ab")
+        self.assertNotEqual(font_fingerprint([loaded]), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from card import Card
+from cfr_solver import (ALLIN, FOLD, PHASE_MULTIPLIERS, RAISE_SIZES, CFRSolver, EquityBuckets,
+                        GameConfig, GameTree, SolverPolicy, _Traversal, regret_matching)
+from player import Player
+
+
+class TestGameTree(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tree = GameTree()
+
+    def test_root_is_small_blind_facing_the_big_blind(self):
+        self.assertEqual((self.tree.player[0], self.tree.to_call[0], self.tree.pot[0]), (0, 10, 30))
+        self.assertIn(FOLD, self.tree.legal[0])
+        self.assertIn(ALLIN, self.tree.legal[0])
+
+    def test_terminals_stay_within_stacks(self):
+        stack = GameConfig().stack
+        for folder, chips0, chips1 in self.tree.terminals:
+            self.assertLessEqual(max(chips0, chips1), stack)
+            if folder < 0:
+                self.assertEqual(chips0, chips1)
+
+    def test_no_fold_without_a_bet(self):
+        for node, legal in enumerate(self.tree.legal):
+            self.assertEqual(FOLD in legal, self.tree.to_call[node] > 0)
+
+    def test_sizes_follow_calculate_raise_size(self):
+        for sizes, multiplier in zip(RAISE_SIZES, PHASE_MULTIPLIERS):
+            self.assertGreaterEqual(sizes[0], 0.25 * multiplier)
+            self.assertLessEqual(sizes[1], 1.0 * multiplier)
+            self.assertLess(sizes[0], sizes[1])
+
+
+class TestCFR(unittest.TestCase):
+    def test_regret_matching(self):
+        mask = np.array([False, True, True, False, True])
+        sigma = regret_matching(np.array([5.0, 1.0, -2.0, 0.0, 3.0]), mask)
+        self.assertTrue(np.allclose(sigma, [0, 0.25, 0, 0, 0.75]))
+        self.assertTrue(np.allclose(regret_matching(np.zeros(5), mask), mask / 3))
+
+    def test_payoffs_are_zero_sum(self):
+        tree = GameTree()
+        traversal = _Traversal(tree, EquityBuckets(), np.zeros((1, 1, 5)), True, random.Random(1))
+        for terminal in range(0, len(tree.terminals), 97):
+            for winner in (0, 1, -1):
+                self.assertEqual(traversal.payoff(terminal, 0, winner), -traversal.payoff(terminal, 1, winner))
+
+    def test_equity(self):
+        buckets = EquityBuckets(buckets=4, samples=32)
+        aces = [Card('A', 'Hearts'), Card('A', 'Spades')]
+        trash = [Card('7', 'Clubs'), Card('2', 'Diamonds')]
+        self.assertGreater(buckets.equity(aces, []), buckets.equity(trash, []))
+        royal = [Card('10', 'Hearts'), Card('J', 'Hearts'), Card('Q', 'Hearts'), Card('K', 'Hearts'),
+                 Card('2', 'Clubs')]
+        self.assertEqual(buckets.equity([Card('A', 'Hearts'), Card('3', 'Clubs')], royal), 1.0)
+        self.assertEqual(buckets.bucket([Card('A', 'Hearts'), Card('3', 'Clubs')], royal), 3)
+
+    def test_train_and_play(self):
+        solver = CFRSolver(bucketer=EquityBuckets(buckets=3, samples=8))
+        solver.train(20, batch=10, seed=3)
+        self.assertEqual(solver.iterations, 20)
+        self.assertGreater(solver.strategy_sum.sum(), 0)
+        self.assertGreaterEqual(solver.regrets.min(), 0.0)  # CFR+
+
+        policy = solver.policy(rng=random.Random(5))
+        self.assertTrue(np.allclose(policy.probs.sum(axis=-1), 1.0, atol=1e-5))
+        self.assertEqual(policy.probs[:, :, 0, :, FOLD].max(), 0.0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cfr_policy.npz")
+            policy.save(path)
+            loaded = SolverPolicy.load(path, rng=random.Random(5))
+        self.assertTrue(np.array_equal(loaded.probs, policy.probs))
+        self.assertEqual(loaded.bucketer.buckets, 3)
+
+        machine = Player("Máquina", compiled_policy=loaded)
+        machine.is_machine = True
+        board = [Card('2', 'Hearts'), Card('7', 'Clubs'), Card('K', 'Spades')]
+        for _ in range(30):
+            machine.hand = [Card('A', 'Hearts'), Card('K', 'Hearts')]
+            machine.folded = False
+            action, amount = machine.make_decision(board, 0, 20, 100)
+            self.assertIn(action, ('call', 'raise'))
+            if action == 'raise':
+                self.assertGreaterEqual(amount, 20)
+                self.assertLessEqual(amount, machine.chips)
+            else:
+                self.assertEqual(amount, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from game import Game
+from player import Player
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_every_hand_starts_fresh(self):
+        hole_cards = []
+        make_decision = Player.make_decision
+
+        def recording(player, *args, **kwargs):
+            hole_cards.append(len(player.hand))
+            return make_decision(player, *args, **kwargs)
+
+        cwd = os.getcwd()
+        output = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(Player, 'make_decision', autospec=True, side_effect=recording):
+            os.chdir(tmp)
+            try:
+                game = Game()
+                with contextlib.redirect_stdout(output):
+                    game.play_machine_vs_machine(20)
+            finally:
+                os.chdir(cwd)
+
+        # Cada jogador decide com as suas 2 cartas, mão após mão
+        self.assertGreater(len(hole_cards), 20)
+        self.assertEqual(set(hole_cards), {2})
+        # Um fold não passa para as mãos seguintes
+        self.assertLess(output.getvalue().count("Todos os jogadores desistiram"), 20)
+        # O pote de uma mão ganha por desistência não é pago de novo
+        self.assertEqual(game.player1.chips + game.player2.chips + game.pot, 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
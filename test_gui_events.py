@@ -0,0 +1,69 @@
+import unittest
+
+from gui_events import EventBus, MESSAGE, CHIP_STATE, PHASE, HAND_RESULT
+
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self):
+        self.scheduled = []
+        self.bus = EventBus(capacity=5, schedule=self.scheduled.append)
+        self.calls = []
+        self.bus.subscribe(CHIP_STATE, lambda e: self.calls.append((CHIP_STATE, e.text)))
+        self.bus.subscribe(PHASE, lambda e: self.calls.append((PHASE, e.data['stage'])))
+        self.bus.subscribe(HAND_RESULT, lambda e: self.calls.append((HAND_RESULT, e.data['winner'])))
+
+    def run_idle(self):
+        callbacks, self.scheduled[:] = list(self.scheduled), []
+        for callback in callbacks:
+            callback()
+
+    def test_history_is_bounded(self):
+        for i in range(20):
+            self.bus.publish(MESSAGE, f"msg {i}")
+        self.assertEqual(len(self.bus.history), 5)
+        self.assertEqual(self.bus.messages(), [f"msg {i}" for i in range(15, 20)])
+        self.assertEqual(self.bus.messages(limit=2), ["msg 18", "msg 19"])
+        self.assertEqual(self.bus.published, 20)
+
+    def test_handlers_coalesced_until_idle(self):
+        for i in range(10):
+            self.bus.publish(CHIP_STATE, f"chips {i}")
+        self.bus.publish(PHASE, "flop", stage=1)
+        self.bus.publish(PHASE, "turn", stage=2)
+
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(self.scheduled), 1)
+
+        self.run_idle()
+        self.assertEqual(self.calls, [(CHIP_STATE, "chips 9"), (PHASE, 2)])
+        self.assertEqual(self.bus.flushes, 1)
+
+    def test_order_follows_last_event_of_each_kind(self):
+        self.bus.publish(PHASE, "river", stage=3)
+        self.bus.publish(HAND_RESULT, "win", winner="Máquina")
+        self.bus.publish(PHASE, "nova mão", stage=0)
+        self.run_idle()
+        self.assertEqual(self.calls, [(HAND_RESULT, "Máquina"), (PHASE, 0)])
+
+    def test_messages_without_handler_do_not_schedule(self):
+        self.bus.publish(MESSAGE, "só texto")
+        self.assertEqual(self.scheduled, [])
+
+    def test_immediate_delivery_without_scheduler(self):
+        bus = EventBus()
+        seen = []
+        bus.subscribe(PHASE, lambda e: seen.append(e.data['stage']))
+        bus.publish(PHASE, stage=1)
+        bus.publish(PHASE, stage=2)
+        self.assertEqual(seen, [1, 2])
+
+    def test_clear_drops_pending(self):
+        self.bus.publish(CHIP_STATE, "chips")
+        self.bus.clear()
+        self.run_idle()
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(self.bus.history), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from gui_view import ViewDiff, FrameTimer
+
+
+class FakeWidget:
+    def __init__(self):
+        self.calls = []
+
+    def configure(self, **options):
+        self.calls.append(options)
+
+
+class TestViewDiff(unittest.TestCase):
+    def test_only_changed_options_are_configured(self):
+        view = ViewDiff()
+        label = FakeWidget()
+
+        self.assertTrue(view.apply(label, text="100", fg="green"))
+        self.assertFalse(view.apply(label, text="100", fg="green"))
+        self.assertTrue(view.apply(label, text="150", fg="green"))
+
+        self.assertEqual(label.calls, [{'text': "100", 'fg': "green"}, {'text': "150"}])
+        self.assertEqual((view.applied, view.skipped), (2, 1))
+
+    def test_widgets_are_tracked_separately(self):
+        view = ViewDiff()
+        a, b = FakeWidget(), FakeWidget()
+        view.apply(a, image='')
+        view.apply(b, image='')
+        self.assertEqual(len(a.calls), 1)
+        self.assertEqual(len(b.calls), 1)
+
+    def test_forget_forces_reconfigure(self):
+        view = ViewDiff()
+        label = FakeWidget()
+        view.apply(label, text="x")
+        view.forget(label)
+        self.assertTrue(view.apply(label, text="x"))
+        self.assertEqual(len(label.calls), 2)
+
+
+class TestFrameTimer(unittest.TestCase):
+    def test_summary(self):
+        timer = FrameTimer(window=2)
+        self.assertEqual(timer.summary()['frames'], 0)
+        for _ in range(3):
+            with timer.frame():
+                pass
+        summary = timer.summary()
+        self.assertEqual(summary['frames'], 3)
+        self.assertEqual(len(timer.samples), 2)
+        self.assertGreaterEqual(summary['max_ms'], summary['avg_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
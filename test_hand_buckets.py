@@ -0,0 +1,124 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from card import Card
+from cfr_solver import CFRSolver, SolverPolicy, hand_value
+from hand_buckets import (DECK, HandBuckets, build_tables, card_ids, equity_histograms, evaluate_batch,
+                          export_tables, hand_index, kmeans)
+
+
+def encode(value):
+    score = (value[0] // 100) << 20
+    for i, tie in enumerate(value[1:]):
+        score |= tie << (16 - 4 * i)
+    return score
+
+
+def cards(*names):
+    suits = {'h': 'Hearts', 'd': 'Diamonds', 'c': 'Clubs', 's': 'Spades'}
+    return [Card(name[:-1], suits[name[-1]]) for name in names]
+
+
+class TestEvaluateBatch(unittest.TestCase):
+    def assert_matches(self, hands):
+        scores = evaluate_batch(np.array([card_ids(hand) for hand in hands]))
+        for hand, score in zip(hands, scores):
+            self.assertEqual(score, encode(hand_value(hand[:2], hand[2:])), [str(c) for c in hand])
+
+    def test_random_hands_match_get_hand_value(self):
+        rng = random.Random(7)
+        for size in (5, 6, 7):
+            self.assert_matches([rng.sample(DECK, size) for _ in range(300)])
+
+    def test_rare_hands(self):
+        self.assert_matches([
+            cards('Ah', 'Kh', 'Qh', 'Jh', '10h', '2c', '3d'),   # royal
+            cards('Ah', '2h', '3h', '4h', '5h', '9c', '9d'),    # straight flush A-5
+            cards('9h', '8h', '7h', '6h', '5h', 'Kh', '2c'),    # K no topo: get_hand_value vê flush
+            cards('7c', '7d', '7h', '7s', 'Ah', 'Ad', '2c'),    # quadra
+            cards('7c', '7d', '7h', '2s', '2h', '2d', 'Ac'),    # duas trincas
+            cards('Ac', '2d', '3h', '4s', '5c', '9d', 'Jh'),    # sequência A-5
+            cards('Kc', 'Kd', '5h', '5s', '3c', '3d', '2h'),    # três pares
+        ])
+
+
+class TestHandIndex(unittest.TestCase):
+    def test_index_is_exact_and_order_free(self):
+        rng = np.random.default_rng(3)
+        dealt = np.argsort(rng.random((2000, 52)), axis=1)[:, :5]
+        keys = hand_index(dealt[:, :2], dealt[:, 2:])
+        swapped = hand_index(dealt[:, [1, 0]], dealt[:, [4, 2, 3]])
+        self.assertTrue(np.array_equal(keys, swapped))
+        unique = {tuple(sorted(row[:2])) + tuple(sorted(row[2:])) for row in dealt.tolist()}
+        self.assertEqual(len(np.unique(keys)), len(unique))
+        self.assertLess(keys.max(), 1326 * 22100)
+        self.assertEqual(hand_index([1, 0], []).tolist(), [0])
+
+
+class TestClustering(unittest.TestCase):
+    def test_kmeans_finds_separate_groups(self):
+        rng = np.random.default_rng(0)
+        points = np.concatenate([rng.normal(center, 0.05, (50, 2)) for center in (0.0, 1.0, 3.0)])
+        centroids, labels = kmeans(points, 3, rng=rng)
+        self.assertEqual(len(set(labels[:50])), 1)
+        self.assertEqual(len(set(labels)), 3)
+        self.assertTrue(np.allclose(np.sort(centroids[:, 0]), [0.0, 1.0, 3.0], atol=0.05))
+
+    def test_histograms(self):
+        hole = np.array([card_ids(cards('Ah', 'As')), card_ids(cards('7c', '2d'))])
+        board = np.array([card_ids(cards('Ad', 'Ac', 'Kh')), card_ids(cards('Ad', 'Ac', 'Kh'))])
+        hist = equity_histograms(hole, board, bins=5, runouts=8, opponents=16, rng=np.random.default_rng(1))
+        self.assertTrue(np.allclose(hist.sum(axis=1), 1.0))
+        self.assertEqual(hist[0, -1], 1.0)  # quadra de ases sempre ganha
+        self.assertGreater(hist[1, :2].sum(), 0.5)
+
+
+class TestHandBuckets(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, 'hand_buckets.bin')
+        cls.tables, centroids = build_tables(buckets=4, hands=200, bins=5, runouts=4, opponents=8, seed=2)
+        export_tables(cls.path, cls.tables, centroids, runouts=4, opponents=8)
+        cls.buckets = HandBuckets(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.buckets
+        cls.tmpdir.cleanup()
+
+    def test_tables_round_trip(self):
+        self.assertEqual(self.buckets.size, 4)
+        self.assertEqual(len(self.buckets._keys[0]), 169)
+        for street, (keys, ids) in enumerate(self.tables):
+            self.assertTrue(np.array_equal(self.buckets._keys[street], keys))
+            self.assertTrue(np.array_equal(self.buckets._ids[street], ids))
+
+    def test_buckets_follow_strength(self):
+        self.assertEqual(self.buckets.bucket(cards('Ah', 'As'), []), 3)
+        self.assertEqual(self.buckets.bucket(cards('7c', '2d'), []), 0)
+        self.assertEqual(self.buckets.bucket(cards('Ah', 'Kh'), []), self.buckets.bucket(cards('Ad', 'Kd'), []))
+
+    def test_unknown_hands_use_the_nearest_centroid(self):
+        board = cards('Ad', 'Ac', 'Kh', 'Ks', '2c')
+        misses = self.buckets.misses
+        self.assertEqual(self.buckets.bucket(cards('Ah', 'As'), board, random.Random(1)), 3)
+        self.assertEqual(self.buckets.misses, misses + 1)
+
+    def test_solver_policy_with_hand_buckets(self):
+        solver = CFRSolver(bucketer=pickle.loads(pickle.dumps(self.buckets)))
+        solver.train(10, batch=10, seed=1)
+        path = os.path.join(self.tmpdir.name, 'cfr_policy.npz')
+        solver.policy().save(path)
+        loaded = SolverPolicy.load(path, rng=random.Random(2))
+        self.assertIsInstance(loaded.bucketer, HandBuckets)
+        self.assertEqual(loaded.probs.shape[3], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import instrumentation
+from card import Card
+from player import Player
+
+ORIGINAL_MAKE_DECISION = Player.__dict__['make_decision']
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def play(self):
+        player = Player("Teste", is_machine=True)
+        player.save_q_table = lambda: None
+        player.q_table = {}
+        player.hand = [Card('A', 'Hearts'), Card('K', 'Hearts')]
+        player.make_decision([], 20, 20, 30)
+
+    def test_disabled_leaves_methods_untouched(self):
+        self.assertIs(Player.__dict__['make_decision'], ORIGINAL_MAKE_DECISION)
+        with instrumentation.span("nada"):
+            self.play()
+        instrumentation.count("nada")
+        self.assertEqual(instrumentation.spans, {})
+        self.assertEqual(instrumentation.counters, {})
+
+    def test_enable_records_and_disable_restores(self):
+        instrumentation.enable()
+        self.assertIsNot(Player.__dict__['make_decision'], ORIGINAL_MAKE_DECISION)
+        with instrumentation.span("bloco"):
+            self.play()
+        instrumentation.disable()
+        self.assertIs(Player.__dict__['make_decision'], ORIGINAL_MAKE_DECISION)
+
+        names = {row['name'] for row in instrumentation.report(top=50)}
+        self.assertIn('bloco', names)
+        self.assertIn('player.make_decision', names)
+        self.assertIn('player.evaluate_hand_strength', names)
+        self.assertEqual(sum(v for k, v in instrumentation.counters.items()
+                             if k.startswith('decision.')), 1)
+
+    def test_enable_twice_does_not_double_wrap(self):
+        instrumentation.enable()
+        instrumentation.enable()
+        self.play()
+        self.assertEqual(instrumentation.spans['player.make_decision'].count, 1)
+
+    def test_percentiles_are_bounded(self):
+        stats = instrumentation.SpanStats()
+        for ns in [1000] * 99 + [1000000]:
+            stats.add(ns)
+        self.assertGreaterEqual(stats.percentile(50), 1000)
+        self.assertLess(stats.percentile(50), 1000 * 1.19)
+        self.assertEqual(stats.percentile(100), 1000000)
+
+    def test_report_sorting(self):
+        instrumentation.record('rapido', 10)
+        instrumentation.record('rapido', 10)
+        instrumentation.record('lento', 15)
+        self.assertEqual(instrumentation.report(sort='total')[0]['name'], 'rapido')
+        self.assertEqual(instrumentation.report(sort='p99')[0]['name'], 'lento')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from load_test import check_thresholds, percentile, prepare_snapshot, run_load
+from policy_snapshot import PolicySnapshot
+from state_space import DEFAULT_STATE_SPACE
+
+
+class FakeTransport:
+    """Stand-in da API: cada mão termina após três ações do jogador"""
+
+    def __init__(self, fail_every=0):
+        self.tables = {}
+        self.calls = 0
+        self.fail_every = fail_every
+
+    async def request(self, method, path, body=None):
+        self.calls += 1
+        if self.fail_every and self.calls % self.fail_every == 0:
+            return 500, {'error': 'boom'}
+        if path == "/api/game/new":
+            self.tables[body['table_id']] = 0
+            return 200, {'status': 'success', 'state': {}}
+        if path == "/api/game/action":
+            self.tables[body['table_id']] += 1
+            over = body['action'] == 'fold' or self.tables[body['table_id']] >= 3
+            state = {'game_over': over, 'machine_thinking': False,
+                     'player': {'chips': 1000}, 'machine': {'chips': 1000}}
+            return 200, {'status': 'success', 'state': state}
+        return 200, {'machine_thinking': False}
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_run_collects_per_endpoint_stats(self):
+        stats = asyncio.run(run_load(FakeTransport(), players=20, duration=0.3,
+                                     ramp_up=0.05, think_time=0.01, seed=1))
+        summary = stats.summary()
+        self.assertGreater(summary['hands'], 20)
+        self.assertIn("POST /api/game/new", summary['endpoints'])
+        self.assertIn("POST /api/game/action", summary['endpoints'])
+        self.assertEqual(summary['error_rate'], 0.0)
+        self.assertEqual(check_thresholds(summary, max_p99_ms=1000, max_error_rate=0.0), [])
+
+    def test_errors_trip_threshold(self):
+        stats = asyncio.run(run_load(FakeTransport(fail_every=5), players=5, duration=0.2,
+                                     ramp_up=0, think_time=0.01, seed=2))
+        summary = stats.summary()
+        self.assertGreater(summary['error_rate'], 0.0)
+        self.assertTrue(check_thresholds(summary, max_p99_ms=None, max_error_rate=0.01))
+
+    def test_machines_share_a_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ):
+            q_path = os.path.join(tmp, "q_table.json")
+            _, state = DEFAULT_STATE_SPACE.encode('flop', 'dry', 'late', 0.55, 1.0, 0.1, 0.5)
+            with open(q_path, "w") as f:
+                json.dump({"Máquina": {state: {'fold': 0.0, 'call': 0.5, 'raise': 0.1}}}, f)
+            path = prepare_snapshot(q_path)
+            self.assertEqual(os.environ['POKER_POLICY_SNAPSHOT'], path)
+            self.assertEqual(PolicySnapshot(path).get(state)['call'], 0.5)
+            self.assertEqual(len(PolicySnapshot(prepare_snapshot(os.path.join(tmp, "missing.json")))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
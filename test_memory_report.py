@@ -0,0 +1,62 @@
+import sys
+import threading
+import unittest
+
+from memory_report import MemoryMonitor, deep_sizeof, memory_report, player_memory
+from player import Player
+
+
+class TestDeepSizeof(unittest.TestCase):
+    def test_shared_objects_count_once(self):
+        value = "x" * 1000
+        self.assertLess(deep_sizeof([value, value]), 2 * sys.getsizeof(value))
+        self.assertGreater(deep_sizeof([value]), sys.getsizeof(value))
+
+    def test_nested_dicts(self):
+        table = {f"s{i}": {'fold': float(i), 'call': 0.5, 'raise': -0.5} for i in range(100)}
+        self.assertGreater(deep_sizeof(table), 100 * sys.getsizeof(table['s0']))
+
+
+class TestPlayerMemory(unittest.TestCase):
+    def make_player(self, states):
+        player = Player("Teste")
+        for i in range(states):
+            state = f"flop_dry_late_{i}"
+            player.q_table[state] = {'fold': 0.1 * i, 'call': 0.0, 'raise': 0.0}
+            player.q_usage.touch(state)
+        return player
+
+    def test_components_and_per_state(self):
+        small = player_memory(self.make_player(10))
+        large = player_memory(self.make_player(1000))
+        self.assertEqual(large['states'], 1000)
+        self.assertGreater(large['components']['q_table'], small['components']['q_table'])
+        self.assertGreater(large['components']['q_usage'], 0)
+        self.assertGreater(large['bytes_per_state'], 100)
+        self.assertEqual(large['total_bytes'], sum(large['components'].values()))
+
+    def test_monitor_warns_past_thresholds(self):
+        lines = []
+        monitor = MemoryMonitor(warn_player_mb=0.01, warn_bytes_per_state=10 ** 6, log=lines.append)
+        report = monitor.report([self.make_player(1000)])
+        self.assertEqual(monitor.warnings, 1)
+        self.assertTrue(lines[0].startswith("🧠"))
+        self.assertTrue(lines[-1].startswith("⚠️"))
+        self.assertGreater(report['rss_bytes'], 0)
+
+    def test_players_sized_under_caller_lock(self):
+        lock = threading.Lock()
+        held = []
+
+        def locked(players):
+            for player in players:
+                with lock:
+                    yield player
+                    held.append(lock.locked())
+
+        self.assertEqual(len(memory_report(locked([self.make_player(3), self.make_player(4)]))['players']), 2)
+        self.assertEqual(held, [True, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from card import Card
+from opponent_model import OpponentModel, load_models
+from player import Player
+
+FLOP = [Card('2', 'Hearts'), Card('7', 'Clubs'), Card('K', 'Spades')]
+
+
+def play_hand(model, actions, showdown=False):
+    model.start_hand()
+    for street, action, amount, own in actions:
+        model.observe(street, action, amount, own)
+    model.end_hand(showdown)
+
+
+class TestOpponentModel(unittest.TestCase):
+    def test_starts_at_the_priors(self):
+        model = OpponentModel()
+        self.assertEqual(model.aggression_frequency, 0.5)
+        self.assertEqual(model.vpip, 0.5)
+        self.assertAlmostEqual(model.fold_to_bet(1), 0.4)
+
+    def test_preflop_stats(self):
+        model = OpponentModel()
+        for _ in range(100):
+            play_hand(model, [(0, 'raise', 60, False)])
+        self.assertGreater(model.vpip, 0.95)
+        self.assertGreater(model.pfr, 0.95)
+        # Com decaimento, mudar de estilo aparece em poucas dezenas de mãos
+        for _ in range(50):
+            play_hand(model, [(0, 'call', 0, False)])
+        self.assertLess(model.vpip, 0.45)
+        self.assertLess(model.pfr, 0.45)
+
+    def test_aggression_ignores_checks(self):
+        model = OpponentModel()
+        for _ in range(30):
+            play_hand(model, [(1, 'call', 0, False), (1, 'raise', 50, False), (2, 'call', 0, False)])
+        self.assertGreater(model.aggression_frequency, 0.9)
+        self.assertGreater(model.aggression_factor, 10)
+
+    def test_fold_to_bet_needs_a_bet(self):
+        model = OpponentModel()
+        for _ in range(30):
+            play_hand(model, [(1, 'raise', 40, True), (1, 'fold', 0, False)])
+        self.assertGreater(model.fold_to_bet(1), 0.9)
+        self.assertAlmostEqual(model.fold_to_bet(2), 0.4)
+
+        checked = OpponentModel()
+        play_hand(checked, [(1, 'call', 0, True), (1, 'fold', 0, False)])
+        self.assertAlmostEqual(checked.fold_to_bet(1), 0.4)
+
+    def test_showdown_frequency(self):
+        model = OpponentModel()
+        for _ in range(40):
+            play_hand(model, [(1, 'call', 20, False)], showdown=True)
+            play_hand(model, [(0, 'raise', 40, False)])  # não viu o flop: não conta
+        self.assertGreater(model.showdown_frequency, 0.9)
+
+    def test_unfinished_hand_is_closed_by_the_next(self):
+        model = OpponentModel()
+        model.observe(0, 'raise', 40)
+        model.start_hand()
+        self.assertAlmostEqual(model.hands, 1.0)
+
+    def test_persistence(self):
+        model = OpponentModel(decay=0.9)
+        play_hand(model, [(0, 'raise', 60, False), (1, 'raise', 40, True), (1, 'fold', 0, False)])
+        restored = OpponentModel.from_dict(model.to_dict())
+        self.assertEqual(restored.decay, 0.9)
+        self.assertEqual(restored.features(), model.features())
+        self.assertEqual(OpponentModel.from_dict({'counts': [1.0, 2.0]}).counts, OpponentModel().counts)
+
+
+class TestPlayerOpponentModel(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+        self.machine = Player("Máquina", is_machine=True)
+        self.machine.position = 'late'
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def test_observed_actions_reach_get_state(self):
+        self.machine.hand = [Card('A', 'Hearts'), Card('K', 'Hearts')]
+        self.assertTrue(self.machine.get_state(FLOP, 20).endswith('_0.50'))
+        for _ in range(30):
+            self.machine.start_hand()
+            self.machine.observe_action(FLOP, 'raise', 50, actor="Você")
+            self.machine.end_hand()
+        self.assertGreater(self.machine.opponent_stats['aggression_frequency'], 0.9)
+        self.assertTrue(self.machine.get_state(FLOP, 20).endswith('_0.80'))
+
+    def test_raise_size_follows_fold_to_bet(self):
+        self.machine.hand = [Card('2', 'Clubs'), Card('8', 'Diamonds')]
+        random.seed(5)
+        neutral = self.machine.calculate_raise_size(FLOP, 0, 20, 200)
+        for _ in range(30):
+            self.machine.start_hand()
+            self.machine.observe_action(FLOP, 'raise', 40, own=True)
+            self.machine.observe_action(FLOP, 'fold', 0, actor="Você")
+        self.machine.hand = [Card('2', 'Clubs'), Card('8', 'Diamonds')]  # start_hand limpa as cartas
+        random.seed(5)
+        self.assertLess(self.machine.calculate_raise_size(FLOP, 0, 20, 200), neutral)
+
+    def test_first_bet_of_a_session_counts_for_fold_to_bet(self):
+        for _ in range(30):
+            self.machine.start_hand(opponent="Você")
+            self.machine.observe_action(FLOP, 'raise', 40, own=True)
+            self.machine.observe_action(FLOP, 'fold', 0, actor="Você")
+            self.machine.end_hand()
+        self.assertEqual(list(self.machine.opponent_models), ["Você"])
+        self.assertGreater(self.machine.opponent_models["Você"].fold_to_bet(1), 0.9)
+
+    def raise_amount(self):
+        # A chave do estado muda com a agressão do oponente: a linha que prefere raise vem logo antes
+        self.machine.q_table[self.machine.get_state(FLOP, 0)] = {'fold': -1.0, 'call': 0.0, 'raise': 1.0}
+        self.machine.consecutive_raises = 0
+        random.seed(5)
+        with mock.patch('player.random.random', return_value=0.99):
+            action, amount = self.machine.make_decision(FLOP, 0, 20, 200)
+        self.assertEqual(action, 'raise')
+        return amount
+
+    def test_make_decision_raise_follows_fold_to_bet(self):
+        self.machine.hand = [Card('2', 'Clubs'), Card('8', 'Diamonds')]
+        neutral = self.raise_amount()
+        for _ in range(30):
+            self.machine.start_hand()
+            self.machine.observe_action(FLOP, 'raise', 40, own=True)
+            self.machine.observe_action(FLOP, 'fold', 0, actor="Você")
+        self.machine.hand = [Card('2', 'Clubs'), Card('8', 'Diamonds')]  # start_hand limpa as cartas
+        self.assertLess(self.raise_amount(), neutral)
+
+    def test_models_are_saved_with_the_q_table(self):
+        self.machine.observe_action([], 'raise', 60, actor="Você")
+        self.machine.end_hand()
+        self.machine.save_q_table()
+        models = load_models("Máquina")
+        self.assertEqual(list(models), ["Você"])  # o modelo sem nome (oponente ainda desconhecido) não é salvo
+        self.assertEqual(models["Você"].features(), self.machine.opponent_models["Você"].features())
+        self.assertEqual(Player("Máquina", is_machine=True).opponent_model.counts, OpponentModel().counts)
+        self.assertEqual(Player("Máquina", is_machine=True).opponent_models["Você"].pfr, models["Você"].pfr)
+
+
+if __name__ == '__main__':
+    unittest.main()
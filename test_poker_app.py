@@ -1,5 +1,7 @@
 import unittest
-from poker_app import Card, Player, PokerGame
+from card import Card
+from player import Player
+from poker_game import PokerGame
 
 class TestPokerApp(unittest.TestCase):
     def test_get_hand_value(self):
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import poker_web
+from build_assets import build
+from policy_snapshot import PolicyOverlay, SharedPolicy, export_snapshot
+
+
+class TestTableEviction(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+        self.saved_tables = dict(poker_web.tables)
+        poker_web.tables.clear()
+        poker_web.tables['default'] = self.saved_tables['default']
+
+    def tearDown(self):
+        poker_web.tables.clear()
+        poker_web.tables.update(self.saved_tables)
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def test_idle_tables_make_room_at_the_limit(self):
+        with mock.patch.object(poker_web, 'MAX_TABLES', 3), \
+                mock.patch.object(poker_web, 'TABLE_IDLE_SECONDS', 60):
+            old = poker_web.get_table('old')
+            busy = poker_web.get_table('busy')
+            with self.assertRaises(LookupError):
+                poker_web.get_table('new')
+
+            # Uma hora depois as duas mesas estão paradas, mas uma ainda está ocupada
+            old.last_access -= 3600
+            busy.last_access -= 3600
+            busy.machine_thinking = True
+            self.assertIsNot(poker_web.get_table('new'), old)
+            self.assertEqual(set(poker_web.tables), {'default', 'busy', 'new'})
+            with self.assertRaises(LookupError):
+                poker_web.get_table('another')
+
+    def test_access_keeps_a_table_alive(self):
+        with mock.patch.object(poker_web, 'MAX_TABLES', 2), \
+                mock.patch.object(poker_web, 'TABLE_IDLE_SECONDS', 60):
+            table = poker_web.get_table('player')
+            table.last_access -= 3600
+            self.assertIs(poker_web.get_table('player'), table)
+            self.assertGreater(table.last_access, time.monotonic() - 60)
+            with self.assertRaises(LookupError):
+                poker_web.get_table('new')
+
+
+class TestAssetRoute(unittest.TestCase):
+    def setUp(self):
+        self.static = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.static, "js"))
+        with open(os.path.join(self.static, "js", "game.js"), "w") as f:
+            f.write("console.log('poker');\n" * 50)
+        with open(os.path.join(self.static, "index.html"), "w") as f:
+            f.write('<script src="/static/js/game.js"></script>')
+        dist = os.path.join(self.static, "dist")
+        self.manifest = build(self.static, dist)
+        # Sem o módulo brotli o build só gera .gz; a rota só olha se o .br existe
+        hashed = os.path.join(dist, self.manifest["js/game.js"])
+        if not os.path.exists(hashed + ".br"):
+            shutil.copy(hashed + ".gz", hashed + ".br")
+        patcher = mock.patch.object(poker_web, 'ASSET_DIR', dist)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = poker_web.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.static)
+
+    def test_hashed_js_by_accept_encoding(self):
+        url = "/assets/" + self.manifest["js/game.js"]
+        cases = [("br", "br"), ("gzip", "gzip"), ("gzip, br", "br"), (None, None)]
+        for accept, encoding in cases:
+            with self.subTest(accept=accept):
+                headers = {"Accept-Encoding": accept} if accept else {}
+                response = self.client.get(url, headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.headers.get("Content-Encoding"), encoding)
+                self.assertIn("Accept-Encoding", response.headers.get("Vary", ""))
+                self.assertEqual(response.headers["Cache-Control"], poker_web.IMMUTABLE_CACHE)
+                self.assertTrue(response.mimetype.endswith("javascript"))
+                response.close()
+
+    def test_unhashed_files_are_revalidated(self):
+        for url in ("/", "/assets/index.html", "/assets/manifest.json"):
+            with self.subTest(url=url):
+                response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("immutable", response.headers["Cache-Control"])
+                response.close()
+
+
+
+class TestQTableStatesGauge(unittest.TestCase):
+    def test_snapshot_counted_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "q_policy.bin")
+            export_snapshot({f"s{i}": {'fold': 0.0, 'call': 1.0, 'raise': 0.0} for i in range(10)}, path)
+            policy = SharedPolicy(path)
+            overlays = [PolicyOverlay(policy) for _ in range(3)]
+            overlays[0]['new'] = {'fold': 0.0, 'call': 0.0, 'raise': 1.0}
+            overlays[1]['s1'] = {'fold': 1.0, 'call': 0.0, 'raise': 0.0}  # sobrescreve, não soma
+            tables = {str(i): mock.Mock(machine=mock.Mock(q_table=q_table))
+                      for i, q_table in enumerate(overlays + [{'own': {}}])}
+            with mock.patch.object(poker_web, 'shared_policy', policy), \
+                    mock.patch.object(poker_web, 'tables', tables):
+                self.assertEqual(poker_web.visible_q_table_states(), 10 + 1 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from player import Player
+from policy_snapshot import (PolicyOverlay, PolicySnapshot, SharedPolicy, export_from_json, export_snapshot,
+                             table_sizes)
+from q_table_pruning import QTableUsage
+from state_space import DEFAULT_STATE_SPACE, rebucket_q_table
+
+
+class TestPolicySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "q_policy.bin")
+        self.q_table = {
+            "preflop_none_late_0.85_1.00_0.02_0.02_0.50": {'fold': -0.3, 'call': 0.2, 'raise': 0.6},
+            "river_paired_early_0.30_0.80_0.10_0.09_0.50": {'fold': 0.1, 'call': -0.2, 'raise': -0.4},
+            "flop_wet_late_0.50_1.20_0.00_0.00_0.50": {'fold': 0.0, 'call': 0.3, 'raise': 0.1},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        export_snapshot(self.q_table, self.path)
+        snapshot = PolicySnapshot(self.path)
+        self.assertEqual(len(snapshot), 3)
+        for state, q_values in self.q_table.items():
+            self.assertIn(state, snapshot)
+            self.assertEqual(snapshot.get(state), q_values)
+        self.assertIsNone(snapshot.get("turn_dry_late_0.10_1.00_0.00_0.00_0.50"))
+        self.assertEqual(sorted(snapshot.states()), sorted(self.q_table))
+
+    def test_export_from_json_rebuckets_legacy_keys(self):
+        json_path = os.path.join(self.tmpdir, "q_table.json")
+        with open(json_path, "w") as f:
+            json.dump({"Máquina": self.q_table}, f)
+        expected, _ = rebucket_q_table(self.q_table, DEFAULT_STATE_SPACE)
+        self.assertEqual(export_from_json(json_path, "Máquina", self.path), len(expected))
+        snapshot = PolicySnapshot(self.path)
+        self.assertEqual(sorted(snapshot.states()), sorted(expected))
+        self.assertTrue(all(map(DEFAULT_STATE_SPACE.is_key, snapshot.states())))
+
+    def test_empty_table(self):
+        export_snapshot({}, self.path)
+        snapshot = PolicySnapshot(self.path)
+        self.assertEqual(len(snapshot), 0)
+        self.assertIsNone(snapshot.get("anything"))
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"{}" + b"\0" * 64)
+        with self.assertRaises(ValueError):
+            PolicySnapshot(self.path)
+
+    def test_hot_reload(self):
+        export_snapshot(self.q_table, self.path)
+        policy = SharedPolicy(self.path, check_interval=0)
+        state = "flop_wet_late_0.50_1.20_0.00_0.00_0.50"
+        self.assertEqual(policy.get(state)['call'], 0.3)
+
+        self.q_table[state] = {'fold': 0.0, 'call': 0.9, 'raise': 0.1}
+        export_snapshot(self.q_table, self.path)
+        self.assertEqual(policy.get(state)['call'], 0.9)
+        self.assertEqual(policy.reloads, 1)
+
+    def test_overlay_keeps_writes_private(self):
+        export_snapshot(self.q_table, self.path)
+        overlay = PolicyOverlay(SharedPolicy(self.path))
+        state = "river_paired_early_0.30_0.80_0.10_0.09_0.50"
+        self.assertIn(state, overlay)
+        self.assertEqual(overlay[state]['fold'], 0.1)
+
+        overlay["new_state"] = {'fold': 0, 'call': 1, 'raise': 0}
+        self.assertEqual(overlay["new_state"]['call'], 1)
+        self.assertEqual(len(overlay), 1)
+        with self.assertRaises(KeyError):
+            overlay["missing"]
+
+    def test_overlay_sizes(self):
+        export_snapshot(self.q_table, self.path)
+        overlay = PolicyOverlay(SharedPolicy(self.path))
+        overlay["new_state"] = {'fold': 0, 'call': 1, 'raise': 0}
+        overlay["flop_wet_late_0.50_1.20_0.00_0.00_0.50"] = {'fold': 0, 'call': 0, 'raise': 1}
+        self.assertEqual(overlay.overlay_size, 2)
+        self.assertEqual(overlay.total_size, 4)
+        self.assertEqual(table_sizes(overlay), (4, 2))
+        self.assertEqual(table_sizes({'a': {}}), (1, 1))
+
+    def test_overlay_is_capped(self):
+        export_snapshot(self.q_table, self.path)
+        os.environ['POKER_OVERLAY_MAX_STATES'] = '10'
+        try:
+            machine = Player("Máquina", is_machine=True, policy=SharedPolicy(self.path))
+        finally:
+            del os.environ['POKER_OVERLAY_MAX_STATES']
+        machine.q_usage = QTableUsage()
+        for i in range(30):
+            machine.q_table[f"state_{i}"] = {'fold': 0, 'call': 0, 'raise': 0}
+            machine.q_usage.touch(f"state_{i}")
+            machine._enforce_q_limit(f"state_{i}")
+        self.assertLessEqual(machine.q_table.overlay_size, 10)
+        self.assertIn("state_29", machine.q_table)
+        self.assertEqual(len(machine.q_table.policy), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
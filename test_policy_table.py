@@ -0,0 +1,82 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from card import Card
+from player import Player
+from policy_table import (CompiledPolicy, NUM_CELLS, bet_bucket, cell_distribution,
+                          compile_policy, hs_bucket, _state_cell)
+
+
+class TestPolicyTable(unittest.TestCase):
+    def test_buckets_follow_rule_thresholds(self):
+        self.assertEqual(bet_bucket(0), 0)
+        self.assertEqual(bet_bucket(0.15), 1)
+        self.assertEqual(bet_bucket(0.16), 2)
+        self.assertEqual(bet_bucket(5.0), 8)
+        self.assertEqual(hs_bucket(0.0), 0)
+        self.assertEqual(hs_bucket(1.0), 19)
+
+    def test_state_cell_parses_get_state(self):
+        player = Player("Máquina")
+        player.hand = [Card('A', 'Hearts'), Card('K', 'Hearts')]
+        player.position = "late"
+        state = player.get_state([Card('2', 'Hearts'), Card('3', 'Hearts'), Card('4', 'Hearts')], 100)
+        phase, texture, position, hs, bet, short = _state_cell(state)
+        self.assertEqual((phase, position, short), (1, 1, 0))
+        self.assertEqual(texture, 3)  # very_wet
+        self.assertIsNone(_state_cell("lixo"))
+
+    def test_rows_are_distributions(self):
+        probs = compile_policy({})
+        self.assertEqual(probs.shape, (NUM_CELLS, 3))
+        self.assertTrue(np.allclose(probs.sum(axis=1), 1.0, atol=1e-5))
+        self.assertGreaterEqual(probs.min(), 0.0)
+
+    def test_overrides(self):
+        # Aposta gigante sem mão feita: sempre fold
+        self.assertEqual(cell_distribution([0, 1, 0], 0.3, 0.8, 1, False, 0.1), [1.0, 0.0, 0.0])
+        # Lixo pré-flop diante de aposta: fold
+        self.assertEqual(cell_distribution([0, 0, 1], 0.2, 0.05, 0, False, 0.1), [1.0, 0.0, 0.0])
+        # Mão premium pré-flop sem aposta: maioria raise
+        fold, call, raise_ = cell_distribution([0, 1, 0], 0.9, 0.0, 0, False, 0.1)
+        self.assertGreater(raise_, 0.5)
+        self.assertEqual(fold, 0.0)
+
+    def test_q_values_drive_the_cell(self):
+        state = "flop_dry_late_0.62_1.00_0.00_0.00_0.50"
+        call_heavy = compile_policy({state: {'fold': 0.0, 'call': 5.0, 'raise': 0.0}})
+        raise_heavy = compile_policy({state: {'fold': 0.0, 'call': 0.0, 'raise': 5.0}})
+        from policy_table import cell_index
+        index = cell_index(*_state_cell(state))
+        self.assertGreater(call_heavy[index][1], raise_heavy[index][1])
+        self.assertGreater(raise_heavy[index][2], call_heavy[index][2])
+
+    def test_save_load_and_player_fast_path(self):
+        policy = CompiledPolicy.from_q_table({}, rng=random.Random(1))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "policy.npz")
+            policy.save(path)
+            loaded = CompiledPolicy.load(path, rng=random.Random(1))
+        self.assertTrue(np.array_equal(policy.probs, loaded.probs))
+
+        machine = Player("Máquina", is_machine=True, compiled_policy=loaded)
+        machine.hand = [Card('A', 'Hearts'), Card('A', 'Spades')]
+        seen = set()
+        for _ in range(50):
+            machine.folded = False
+            action, amount = machine.make_decision([], 50, 20)
+            seen.add(action)
+            if action == "raise":
+                self.assertGreaterEqual(amount, 50 + 20)  # calculate_raise_size: pagar e aumentar
+            elif action == "call":
+                self.assertEqual(amount, 50)
+        self.assertIn("raise", seen)
+        self.assertEqual(machine.chips, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+from player import Player
+from q_table_pruning import QTableLimit, QTableUsage, compact, maintain_file, prune
+
+
+def row(value):
+    return {'fold': 0.0, 'call': value, 'raise': 0.0}
+
+
+class TestPrune(unittest.TestCase):
+    def test_singletons_go_before_recurring_states(self):
+        q_table = {s: row(1.0) for s in 'abcd'}
+        usage = QTableUsage()
+        for state in 'abcdab':
+            usage.touch(state)
+        evicted = prune(q_table, usage, 2)
+        self.assertEqual(evicted, ['c', 'd'])
+        self.assertEqual(sorted(q_table), ['a', 'b'])
+        self.assertNotIn('c', usage.visits)
+
+    def test_recurring_states_evicted_least_recent_first(self):
+        q_table = {s: row(1.0) for s in 'abc'}
+        usage = QTableUsage()
+        for state in 'abcabcba':
+            usage.touch(state)
+        self.assertEqual(prune(q_table, usage, 2), ['c'])
+
+    def test_keep_protects_current_state(self):
+        q_table = {s: row(1.0) for s in 'ab'}
+        usage = QTableUsage()
+        usage.touch('b')
+        self.assertEqual(prune(q_table, usage, 1, keep=['a']), ['b'])
+
+    def test_limit_prunes_to_low_water(self):
+        limit = QTableLimit(max_states=10, low_water=0.5)
+        q_table = {str(i): row(i) for i in range(11)}
+        limit.enforce(q_table, QTableUsage())
+        self.assertEqual(len(q_table), 5)
+        self.assertEqual(limit.evictions, 6)
+
+    def test_memory_cap(self):
+        q_table = {f"state_{i}": row(float(i)) for i in range(100)}
+        limit = QTableLimit(max_states=None, max_bytes=20 * 1024)
+        capacity = limit.capacity(q_table)
+        self.assertLess(capacity, 100)
+        self.assertEqual(capacity, 20 * 1024 // limit.entry_bytes)
+
+    def test_compact_rounds_and_drops_zero_rows(self):
+        self.assertEqual(compact({'a': row(0.123456), 'b': row(0.00001)}),
+                         {'a': row(0.1235)})
+
+
+class TestOnlineLimit(unittest.TestCase):
+    def test_table_stays_bounded(self):
+        player = Player("Teste", is_machine=False)
+        player.q_limit = QTableLimit(max_states=20)
+        for i in range(200):
+            player.update_q_value(f"s{i}", 'call', 1.0, f"s{i + 1}")
+            self.assertLessEqual(len(player.q_table), 20)
+        self.assertIn('s200', player.q_table)
+        self.assertLessEqual(len(player.eligibility_traces), 20)
+
+
+class TestMaintainFile(unittest.TestCase):
+    def test_offline_pass(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "q_table.json")
+            with open(path, "w") as f:
+                json.dump({"Máquina": {str(i): row(i / 3) for i in range(10)}}, f, indent=4)
+            usage = QTableUsage()
+            for state in ['9', '9', '8', '8']:
+                usage.touch(state)
+            with open(os.path.join(tmp, "q_table_usage.json"), "w") as f:
+                json.dump({"Máquina": usage.to_dict()}, f)
+
+            summary = maintain_file(path, QTableLimit(max_states=3, low_water=1.0))
+            self.assertEqual(summary["Máquina"], {'before': 10, 'after': 3})
+            self.assertLess(summary['_bytes']['after'], summary['_bytes']['before'])
+
+            with open(path) as f:
+                table = json.load(f)["Máquina"]
+            self.assertEqual(sorted(table), ['7', '8', '9'])
+            self.assertEqual(table['7']['call'], 2.3333)
+
+
+if __name__ == '__main__':
+    unittest.main()
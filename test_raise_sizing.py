@@ -4,6 +4,12 @@ Teste da estratégia de raise variável
 Demonstra como o sizing muda baseado em contexto
 """
 
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
 from player import Player
 from card import Card
 
@@ -210,5 +216,41 @@ def test_raise_sizing():
     print("💡 Muito mais imprevisível e estratégica que o min-raise fixo anterior.\n")
 
 
+
+class TestMakeDecisionRaiseSize(unittest.TestCase):
+    """O raise de make_decision vem de calculate_raise_size"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+        self.machine = Player("IA", is_machine=True)
+        self.machine.position = "late"
+        self.machine.hand = [Card('A', 'Hearts'), Card('K', 'Hearts')]
+        self.flop = [Card('2', 'Hearts'), Card('7', 'Clubs'), Card('K', 'Spades')]
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def raise_amount(self, pot_size):
+        # Q-table prefere raise e random.random alto desliga exploração e ajustes aleatórios
+        self.machine.q_table[self.machine.get_state(self.flop, 0)] = {'fold': -1.0, 'call': 0.0, 'raise': 1.0}
+        self.machine.consecutive_raises = 0
+        random.seed(3)
+        with mock.patch('player.random.random', return_value=0.99):
+            action, amount = self.machine.make_decision(self.flop, 0, 20, pot_size)
+        self.assertEqual(action, "raise")
+        return amount
+
+    def test_raise_follows_pot_size(self):
+        small, large = self.raise_amount(100), self.raise_amount(600)
+        self.assertGreater(large, 5 * small // 2)
+        self.assertGreater(large, 20 * 2.5)  # acima do antigo teto de 2.5x o raise mínimo
+        random.seed(3)
+        with mock.patch('player.random.random', return_value=0.99):
+            self.assertEqual(large, self.machine.calculate_raise_size(self.flop, 0, 20, 600))
+
+
 if __name__ == "__main__":
     test_raise_sizing()
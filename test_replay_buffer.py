@@ -0,0 +1,163 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from card import Card
+from game import Game
+from player import Player
+from replay_buffer import TERMINAL, BatchQLearner, HandRecorder, ReplayBuffer
+from state_space import DEFAULT_STATE_SPACE
+
+FLOP = [Card('2', 'Hearts'), Card('7', 'Clubs'), Card('K', 'Spades')]
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def test_ring_overwrites_oldest(self):
+        buffer = ReplayBuffer(capacity=4)
+        for i in range(6):
+            buffer.add(i, 1, float(i), i + 1)
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(sorted(buffer.states.tolist()), [2, 3, 4, 5])
+        self.assertEqual(buffer.added, 6)
+
+    def test_extend_wraps_and_keeps_newest(self):
+        buffer = ReplayBuffer(capacity=4)
+        buffer.add(9, 0, 0.0)
+        buffer.extend(np.arange(6), np.ones(6), np.zeros(6), np.full(6, TERMINAL))
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(sorted(buffer.states.tolist()), [2, 3, 4, 5])
+
+    def test_sample_shapes(self):
+        buffer = ReplayBuffer(capacity=8)
+        buffer.add(3, 2, 1.0)
+        states, actions, rewards, next_states = buffer.sample(5, np.random.default_rng(0))
+        self.assertEqual(states.tolist(), [3] * 5)
+        self.assertEqual(next_states.tolist(), [TERMINAL] * 5)
+
+
+class TestBatchQLearner(unittest.TestCase):
+    def test_single_transitions_match_td_rule(self):
+        learner = BatchQLearner(learning_rate=0.5, discount=0.9, max_update=10)
+        learner.q[7] = [0.0, 0.0, 2.0]
+        learner.update([1, 2], [1, 0], [1.0, -1.0], [7, TERMINAL])
+        self.assertAlmostEqual(learner.q[1, 1], 0.5 * (1.0 + 0.9 * 2.0))
+        self.assertAlmostEqual(learner.q[2, 0], -0.5)
+
+    def test_duplicates_are_averaged(self):
+        learner = BatchQLearner(learning_rate=1.0, max_update=10)
+        learner.update([4] * 1000, [2] * 1000, [1.0] * 500 + [3.0] * 500, [TERMINAL] * 1000)
+        self.assertAlmostEqual(learner.q[4, 2], 2.0)
+
+    def test_update_is_clamped(self):
+        learner = BatchQLearner(learning_rate=1.0, max_update=0.3)
+        learner.update([0], [0], [100.0], [TERMINAL])
+        self.assertAlmostEqual(learner.q[0, 0], 0.3)
+
+    def test_q_table_round_trip(self):
+        index, key = DEFAULT_STATE_SPACE.encode('flop', 'dry', 'late', 0.55, 1.0, 0.1, 0.5)
+        learner = BatchQLearner()
+        self.assertEqual(learner.load_q_table({key: {'fold': -1.0, 'call': 0.5, 'raise': 0.25}}), 1)
+        self.assertEqual(learner.q[index].tolist(), [-1.0, 0.5, 0.25])
+        learner.update([index], [1], [1.0], [TERMINAL])
+        self.assertEqual(list(learner.to_q_table()), [key])
+
+    def test_pop_changes_returns_only_new_updates(self):
+        loaded, key = DEFAULT_STATE_SPACE.encode('flop', 'dry', 'late', 0.55, 1.0, 0.1, 0.5)
+        updated, updated_key = DEFAULT_STATE_SPACE.encode('turn', 'wet', 'early', 0.3, 1.0, 0.5, 0.5)
+        learner = BatchQLearner()
+        learner.load_q_table({key: {'fold': -1.0, 'call': 0.5, 'raise': 0.25}})
+        self.assertEqual(learner.pop_changes(), {})
+        learner.update([updated], [1], [1.0], [TERMINAL])
+        self.assertEqual(list(learner.pop_changes()), [updated_key])
+        self.assertEqual(learner.pop_changes(), {})
+
+
+class TestSeedRows(unittest.TestCase):
+    def test_new_state_keeps_priors_of_untouched_actions(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                machine = Player("Máquina", is_machine=True)
+            finally:
+                os.chdir(cwd)
+        learner = BatchQLearner(machine.state_space, learning_rate=0.5, max_update=10)
+        learner.load_q_table(machine.q_table)  # início da partida: tabela vazia
+        machine.position = 'late'
+        machine.hand = [Card('A', 'Hearts'), Card('K', 'Hearts')]
+        # make_decision cria o estado com os valores iniciais heurísticos
+        machine.make_decision(FLOP, 20, 20, 100)
+        index = machine.last_state_index
+        state = DEFAULT_STATE_SPACE.state_key(index)
+        priors = dict(machine.q_table[state])
+
+        buffer = ReplayBuffer(capacity=10)
+        recorder = HandRecorder(buffer)
+        recorder.record(index, 'call')
+        learner.seed_rows([i for i, _ in recorder.steps], machine.q_table)
+        recorder.finish(1.0)
+        learner.train(buffer, batch_size=4)
+
+        row = learner.pop_changes()[state]
+        self.assertEqual(row['fold'], priors['fold'])
+        self.assertEqual(row['raise'], priors['raise'])
+        self.assertNotEqual(row['call'], priors['call'])
+
+
+class TestHandRecorder(unittest.TestCase):
+    def test_chains_decisions_and_rewards_last(self):
+        buffer = ReplayBuffer(capacity=10)
+        recorder = HandRecorder(buffer)
+        recorder.record(5, 'call')
+        recorder.record(None, 'call')
+        recorder.record(8, 'raise')
+        recorder.finish(0.25)
+        self.assertEqual(buffer.states[:2].tolist(), [5, 8])
+        self.assertEqual(buffer.actions[:2].tolist(), [1, 2])
+        self.assertEqual(buffer.rewards[:2].tolist(), [0.0, 0.25])
+        self.assertEqual(buffer.next_states[:2].tolist(), [8, TERMINAL])
+        self.assertEqual(recorder.steps, [])
+
+
+class TestSelfPlayReplay(unittest.TestCase):
+    def test_games_fill_buffer_and_update_tables(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                game = Game()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    game.play_machine_vs_machine(3, replay=True, batch_size=64)
+            finally:
+                os.chdir(cwd)
+        recorded = sum(len(r.buffer) for r in game.recorders.values())
+        self.assertGreater(recorded, 0)
+        self.assertTrue(game.player1.q_table or game.player2.q_table)
+
+    def test_write_back_respects_q_table_limit(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {"POKER_Q_TABLE_MAX_STATES": "5"}):
+            os.chdir(tmp)
+            try:
+                # Tabela salva maior que o teto: as linhas podadas não podem voltar pelo replay
+                saved = {DEFAULT_STATE_SPACE.state_key(i): {'fold': 0.0, 'call': 1.0, 'raise': 0.0}
+                         for i in range(50)}
+                with open("q_table.json", "w") as f:
+                    json.dump({"Máquina 1": saved, "Máquina 2": saved}, f)
+                game = Game()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    game.play_machine_vs_machine(5, replay=True, batch_size=64)
+            finally:
+                os.chdir(cwd)
+        for player in (game.player1, game.player2):
+            self.assertLessEqual(len(player.q_table), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+import numpy as np
+
+from card import Card
+from cfr_solver import CARD_INDEX, FOLD
+from player import Player
+from river_solver import RiverBoard, RiverSolver
+
+BOARD = [Card('2', 'Hearts'), Card('7', 'Clubs'), Card('K', 'Spades'), Card('9', 'Diamonds'),
+         Card('J', 'Hearts')]
+
+
+class TestRiverBoard(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.river = RiverBoard([CARD_INDEX[(c.rank, c.suit)] for c in BOARD])
+
+    def test_values_match_brute_force_with_card_removal(self):
+        river = self.river
+        reach = np.random.default_rng(0).random((3, len(river))).astype(np.float32)
+        showdown = river.showdown(reach, np.ones(3, np.float32), -np.ones(3, np.float32))
+        fold = river.fold(reach, np.ones(3, np.float32))
+        for combo in range(0, len(river), 53):
+            valid = np.array([not set(river.cards[combo]) & set(other) for other in river.cards])
+            beats = reach[:, valid & (river.ranks < river.ranks[combo])].sum(axis=1)
+            loses = reach[:, valid & (river.ranks > river.ranks[combo])].sum(axis=1)
+            self.assertTrue(np.allclose(showdown[:, combo], beats - loses, atol=1e-3))
+            self.assertTrue(np.allclose(fold[:, combo], reach[:, valid].sum(axis=1), atol=1e-3))
+
+    def test_raises_narrow_the_range(self):
+        neutral = self.river.range_weights([])
+        aggressive = self.river.range_weights([(1, 'raise', 40), (3, 'raise', 100)])
+        passive = self.river.range_weights([(3, 'call', 0)])
+        self.assertAlmostEqual(aggressive.sum(), 1.0)
+        strength = self.river.strength
+        self.assertGreater(aggressive @ strength, neutral @ strength)
+        self.assertLess(passive @ strength, neutral @ strength)
+
+
+class TestRiverSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = RiverSolver(budget_ms=300, rng=random.Random(1))
+        self.raises = [(1, 'raise', 40), (3, 'raise', 100)]
+
+    def test_strong_hand_calls_and_air_folds_to_aggression(self):
+        top_set, _ = self.solver.solve([Card('K', 'Hearts'), Card('K', 'Clubs')], BOARD, 300, 100, 800, 20,
+                                    opponent_actions=self.raises)
+        self.assertLess(top_set[FOLD], 0.01)
+        air, iterations = self.solver.solve([Card('3', 'Clubs'), Card('4', 'Clubs')], BOARD, 300, 100, 800,
+                                            20, opponent_actions=self.raises)
+        self.assertGreater(air[FOLD], 0.5)
+        self.assertGreaterEqual(iterations, self.solver.min_iterations)
+
+    def test_player_uses_solver_and_falls_back(self):
+        machine = Player("Máquina", river_solver=self.solver)
+        machine.is_machine = True
+        machine.hand = [Card('K', 'Hearts'), Card('K', 'Clubs')]
+        machine.observe_action([], 'call', 20)
+        machine.observe_action(BOARD, 'raise', 100)
+        self.assertEqual(machine.opponent_actions, [(0, 'call', 20), (3, 'raise', 100)])
+        action, amount = machine.make_decision(BOARD, 100, 20, 300)
+        self.assertIn(action, ('call', 'raise'))
+        self.assertEqual(self.solver.solved, 1)
+
+        # Sem tempo para resolver: a decisão vem da política normal
+        machine.river_solver = RiverSolver(budget_ms=0)
+        machine.folded = False
+        action, _ = machine.make_decision(BOARD, 100, 20, 300)
+        self.assertIn(action, ('fold', 'call', 'raise'))
+        self.assertEqual(machine.river_solver.fallbacks, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
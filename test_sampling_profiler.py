@@ -0,0 +1,61 @@
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+
+from sampling_profiler import SamplingProfiler, bucket_of
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestBuckets(unittest.TestCase):
+    def test_innermost_known_frame_wins(self):
+        stack = (('/x/game.py', 1, 'play_machine_vs_machine'),
+                 ('/x/player.py', 1, 'make_decision'),
+                 ('/x/player.py', 1, 'save_q_table'),
+                 ('/usr/lib/python3/json/encoder.py', 1, 'iterencode'))
+        self.assertEqual(bucket_of(stack), 'io')
+        self.assertEqual(bucket_of(stack[:2]), 'strategy')
+        self.assertEqual(bucket_of(stack[:1]), 'other')
+        self.assertEqual(bucket_of(stack[:2] + (('/x/player.py', 1, 'get_hand_value'),)), 'evaluator')
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_signal_sampler_outputs(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            busy(0.2)
+        self.assertGreater(profiler.samples, 20)
+        self.assertTrue(any('test_sampling_profiler:busy' in line for line in profiler.collapsed()))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            collapsed, prof = profiler.write(os.path.join(tmp, "perfil"))
+            with open(collapsed) as f:
+                self.assertTrue(f.readline().rstrip().split(' ')[-1].isdigit())
+            stats = pstats.Stats(prof)
+            names = {name for _, _, name in stats.stats}
+            self.assertIn('busy', names)
+            self.assertAlmostEqual(stats.total_tt, profiler.elapsed, delta=0.05)
+
+    def test_thread_sampler_outside_main_thread(self):
+        result = {}
+
+        def work():
+            with SamplingProfiler(interval=0.001) as profiler:
+                busy(0.1)
+            result['profiler'] = profiler
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+        self.assertGreater(result['profiler'].samples, 5)
+        self.assertGreater(sum(result['profiler'].bucket_times().values()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import unittest
+
+from startup_profile import CORE_MODULES, heavy_imports, parse_importtime, profile_import
+
+# Generoso para máquinas de CI lentas; ajuste com POKER_STARTUP_BUDGET_MS
+STARTUP_BUDGET_MS = float(os.environ.get("POKER_STARTUP_BUDGET_MS", "500"))
+
+
+class TestStartup(unittest.TestCase):
+    def test_parse_importtime(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   card\n"
+                  "import time:       300 |        420 | player\n")
+        entries = parse_importtime(stderr)
+        self.assertEqual([e['name'] for e in entries], ['card', 'player'])
+        self.assertEqual(entries[0]['depth'], 1)
+        self.assertEqual(entries[1]['cumulative_us'], 420)
+
+    def test_core_does_not_import_heavy_modules(self):
+        self.assertEqual(heavy_imports(CORE_MODULES), [])
+
+    def test_core_import_within_budget(self):
+        for module in ('player', 'poker_app'):
+            result = profile_import(module)
+            self.assertTrue(result['ok'], result['error'])
+            self.assertLess(result['import_ms'], STARTUP_BUDGET_MS, module)
+
+
+if __name__ == '__main__':
+    unittest.main()
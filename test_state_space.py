@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from card import Card
+from player import Player
+from policy_table import _state_cell
+from state_space import (Buckets, DEFAULT_STATE_SPACE, make_state_space, parse_state,
+                         rebucket_q_table, visit_report)
+
+
+class TestBuckets(unittest.TestCase):
+    def test_value_on_edge_stays_below(self):
+        buckets = Buckets((0.2, 0.5), 0.0, 1.0)
+        self.assertEqual(buckets.bucket(0.2), 0)
+        self.assertEqual(buckets.bucket(0.21), 1)
+        self.assertEqual(buckets.bucket(5.0), 2)
+        self.assertEqual(buckets.values, (0.1, 0.35, 0.75))
+
+    def test_quantiles_follow_samples(self):
+        buckets = Buckets.quantiles([0.1] * 50 + [0.9] * 50, 4)
+        self.assertEqual(buckets.edges, (0.1, 0.9))
+        self.assertEqual(len(buckets), 3)
+
+
+class TestStateSpace(unittest.TestCase):
+    def test_index_round_trip(self):
+        space = DEFAULT_STATE_SPACE
+        index, key = space.encode('turn', 'wet', 'late', 0.73, 1.4, 0.3, 0.5)
+        self.assertLess(index, space.size)
+        self.assertEqual(space.state_key(index), key)
+        self.assertTrue(key.startswith('turn_wet_late_0.73_1.60_0.28_'))
+
+    def test_size_is_bounded(self):
+        space = make_state_space('equity')
+        keys = set()
+        for chips in (0, 10, 300, 1000, 5000, 10 ** 6):
+            index, key = space.encode('river', 'paired', None, 0.99, chips / 1000, 0.0, 0.5)
+            keys.add(key)
+        self.assertEqual(len(keys), 4)
+        self.assertEqual(space.size, 4 * 5 * 3 * 12 * 6 * 9 * 3)
+
+    def test_keys_parse_like_legacy_keys(self):
+        _, key = DEFAULT_STATE_SPACE.encode('flop', 'very_wet', 'early', 0.42, 0.9, 0.45, 0.5)
+        fields = parse_state(key)
+        self.assertEqual(fields['texture'], 'very_wet')
+        self.assertEqual(_state_cell(key)[:4], (1, 3, 0, 8))
+
+    def test_rebucket_averages_collisions(self):
+        q_table = {
+            'preflop_none_late_0.61_1.01_0.00_0.00_0.50': {'fold': 0.0, 'call': 1.0, 'raise': 2.0},
+            'preflop_none_late_0.64_1.07_0.00_0.00_0.50': {'fold': 0.0, 'call': 3.0, 'raise': 0.0},
+            'river_none_late_bad': {'fold': 1.0},
+        }
+        table, counts = rebucket_q_table(q_table, DEFAULT_STATE_SPACE)
+        self.assertEqual(list(counts.values()), [2])
+        self.assertEqual(list(table.values()), [{'fold': 0.0, 'call': 2.0, 'raise': 1.0}])
+
+    def test_is_key_tells_bucketed_from_legacy(self):
+        _, key = DEFAULT_STATE_SPACE.encode('turn', 'wet', 'late', 0.73, 1.4, 0.3, 0.5)
+        self.assertTrue(DEFAULT_STATE_SPACE.is_key(key))
+        self.assertFalse(DEFAULT_STATE_SPACE.is_key('turn_wet_late_0.73_1.40_0.30_0.23_0.50'))
+        self.assertFalse(DEFAULT_STATE_SPACE.is_key('river_none_late_bad'))
+
+
+class TestPlayerStates(unittest.TestCase):
+    def test_get_state_records_visits(self):
+        player = Player("Teste", is_machine=False)
+        player.hand = [Card('A', 'Spades'), Card('K', 'Spades')]
+        player.chips = 50000
+        board = [Card('2', 'Hearts'), Card('7', 'Diamonds'), Card('9', 'Clubs')]
+        first = player.get_state(board, 100)
+        player.chips = 90000
+        self.assertEqual(player.get_state(board, 100), first)
+
+        report = visit_report(player.state_space, player.state_visits)
+        self.assertEqual(report['visited'], 1)
+        self.assertEqual(report['visits'], 2)
+        self.assertEqual(report['histograms']['chips_ratio'][-1], 2)
+
+    def test_legacy_q_table_is_rebucketed_on_load(self):
+        legacy = {
+            'preflop_none_late_0.61_1.01_0.00_0.00_0.50': {'fold': 0.0, 'call': 1.0, 'raise': 2.0},
+            'preflop_none_late_0.64_1.07_0.00_0.00_0.50': {'fold': 0.0, 'call': 3.0, 'raise': 0.0},
+        }
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with open("q_table.json", "w") as f:
+                    json.dump({"Teste": legacy}, f)
+                with open("q_table_usage.json", "w") as f:
+                    json.dump({"Teste": {'step': 2, 'states': {s: [1, i + 1] for i, s in enumerate(legacy)}}}, f)
+                player = Player("Teste", is_machine=True)
+            finally:
+                os.chdir(cwd)
+        expected, _ = rebucket_q_table(legacy, DEFAULT_STATE_SPACE)
+        self.assertEqual(player.q_table, expected)
+        self.assertTrue(all(map(DEFAULT_STATE_SPACE.is_key, player.q_table)))
+        self.assertEqual(player.q_usage.visits, {})
+
+    def test_legacy_format_without_space(self):
+        player = Player("Teste", is_machine=False, state_space=None)
+        player.hand = [Card('A', 'Spades'), Card('K', 'Spades')]
+        player.chips = 50000
+        self.assertIn('_50.00_', player.get_state([], 0))
+        self.assertEqual(player.state_visits, Counter())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import itertools
+import random
+import unittest
+
+import numpy as np
+
+from card import Card
+from hand_buckets import hand_index
+from river_solver import RiverSolver
+from suit_isomorphism import canonical_index, canonicalize, canonicalize_batch
+
+
+def swap_suits(cards, permutation):
+    return [permutation[card // 13] * 13 + card % 13 for card in cards]
+
+
+class TestSuitIsomorphism(unittest.TestCase):
+    def test_starting_hands_collapse_to_169(self):
+        holes = [(a, b) for b in range(52) for a in range(b)]
+        self.assertEqual(len({canonical_index(hole) for hole in holes}), 169)
+
+    def test_every_relabelling_has_the_same_index(self):
+        rng = random.Random(4)
+        for _ in range(50):
+            cards = rng.sample(range(52), rng.choice((2, 5, 6, 7)))
+            index = canonical_index(cards[:2], cards[2:])
+            for permutation in itertools.permutations(range(4)):
+                swapped = swap_suits(cards, permutation)
+                self.assertEqual(canonical_index(swapped[:2], swapped[2:]), index)
+                self.assertEqual(canonical_index(swapped[1::-1], swapped[:1:-1]), index)
+
+    def test_different_hands_stay_apart(self):
+        ace, king = 12, 11
+        suited = canonical_index([ace, king])
+        offsuit = canonical_index([ace, 13 + king])
+        self.assertNotEqual(suited, offsuit)
+        # Mesmas mãos e board, mas só uma acerta o naipe do flush
+        board = [0, 5, 9]
+        self.assertNotEqual(canonical_index([ace, king], board), canonical_index([13 + ace, 13 + king], board))
+
+    def test_canonical_form_is_a_relabelling(self):
+        hole, board = canonicalize([40, 27], [1, 14, 50])
+        self.assertEqual(sorted(card % 13 for card in hole + board), sorted(card % 13 for card in [40, 27, 1, 14, 50]))
+        self.assertEqual(canonicalize(hole, board), (hole, board))
+
+    def test_batch_matches_single_hands(self):
+        dealt = np.argsort(np.random.default_rng(2).random((500, 52)), axis=1)[:, :6]
+        hole, board = canonicalize_batch(dealt[:, :2], dealt[:, 2:])
+        expected = [canonical_index(row[:2], row[2:]) for row in dealt.tolist()]
+        self.assertEqual(hand_index(hole, board).tolist(), expected)
+
+    def test_river_solver_reuses_isomorphic_boards(self):
+        def hand(cards):
+            return [Card(rank, suit) for rank, suit in cards]
+
+        solver = RiverSolver(budget_ms=0, min_iterations=0)
+        board = hand([('2', 'Hearts'), ('7', 'Clubs'), ('K', 'Spades'), ('9', 'Diamonds'), ('J', 'Hearts')])
+        swapped = hand([('2', 'Spades'), ('7', 'Diamonds'), ('K', 'Hearts'), ('9', 'Clubs'), ('J', 'Spades')])
+        solver.solve(hand([('A', 'Hearts'), ('A', 'Clubs')]), board, 100, 0, 900, 20)
+        solver.solve(hand([('A', 'Spades'), ('A', 'Diamonds')]), swapped, 100, 0, 900, 20)
+        self.assertEqual(len(solver._boards), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from web_metrics import Counter, Gauge, Histogram, Registry, resident_memory_bytes
+
+
+class TestRender(unittest.TestCase):
+    def test_counter_and_gauge(self):
+        registry = Registry()
+        requests = registry.register(Counter('reqs_total', 'Requests', ('route',)))
+        registry.register(Gauge('tables', 'Tables', lambda: 3))
+        requests.inc('/a')
+        requests.inc('/a')
+        requests.inc('/b"x')
+        text = registry.render()
+        self.assertIn('# TYPE reqs_total counter', text)
+        self.assertIn('reqs_total{route="/a"} 2', text)
+        self.assertIn('reqs_total{route="/b\\"x"} 1', text)
+        self.assertIn('tables 3', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('lat', 'Latency', ('route',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, '/x')
+        lines = histogram.samples()
+        self.assertEqual(lines[:3], ['lat_bucket{route="/x",le="0.1"} 1',
+                                     'lat_bucket{route="/x",le="1.0"} 3',
+                                     'lat_bucket{route="/x",le="+Inf"} 4'])
+        self.assertEqual(lines[-1], 'lat_count{route="/x"} 4')
+        self.assertAlmostEqual(float(lines[-2].split()[-1]), 4.25)
+
+    def test_rss_is_reported(self):
+        self.assertGreater(resident_memory_bytes(), 0)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_scrape(self):
+        import poker_web
+        client = poker_web.app.test_client()
+        client.get('/api/game/state?table_id=metrics-test')
+        client.get('/api/game/state?table_id=metrics-test')
+        response = client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        for name in ('poker_http_request_duration_seconds_count{route="/api/game/state"}',
+                     'poker_active_tables', 'poker_decision_queue_depth',
+                     'poker_q_table_states', 'process_resident_memory_bytes'):
+            self.assertIn(name, text)
+        self.assertIn('poker_http_requests_total{route="/api/game/state",method="GET",status="200"}', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
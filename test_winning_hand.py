@@ -1,5 +1,6 @@
 import unittest
-from poker_app import Card, Player
+from card import Card
+from player import Player
 
 class TestWinningHand(unittest.TestCase):
     def setUp(self):
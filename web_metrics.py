@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Métricas do servidor web no formato texto do Prometheus.
+
+Implementação mínima (contador, gauge e histograma com labels), sem
+depender do prometheus_client. ``Registry.render()`` produz o corpo de
+``GET /metrics``; gauges calculados na hora da coleta (mesas ativas,
+fila do pool, tamanho da Q-table, RSS) usam ``Gauge(fn=...)``.
+"""
+
+import os
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Latências de requisições e decisões (segundos)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.label_names, key)} {_number(value)}"
+                    for key, value in sorted(self.values.items())]
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, fn: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation)
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def samples(self) -> List[str]:
+        value = self.fn() if self.fn else self.value
+        return [f"{self.name} {_number(value)}"]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [contagem por bucket..., soma, total]
+        self.series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in sorted(self.series.items()):
+                cumulative = 0
+                for bound, hits in zip(self.buckets, series):
+                    cumulative += hits
+                    le = f'le="{_number(float(bound))}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+                inf = _labels(self.label_names, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(series[-2])}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+def resident_memory_bytes() -> int:
+    """RSS atual (Linux: /proc/self/statm); fora do Linux, o pico do processo"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024